@@ -1,7 +1,7 @@
 import vertexai
 from vertexai.preview import reasoning_engines
 from vertexai.generative_models import GenerativeModel, Tool
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 import json
 from config import settings
 from datetime import datetime
@@ -10,7 +10,7 @@ from datetime import datetime
 class TextOrderAgent:
     """An agent that helps customers order fruit."""
     
-    def __init__(self, project_id: str = None, location: str = None, model_name: str = None, guide_path: str = None):
+    def __init__(self, project_id: str = None, location: str = None, model_name: str = None, guide_path: str = None, session_id: str = None, seller_id: str = None, guide_registry=None, clock: Callable[[], datetime] = None, use_journal: bool = False):
         self.project_id = project_id or settings.GCP_PROJECT_ID
         self.location = location or settings.GCP_LOCATION
         self.model_name = model_name or settings.MODEL_NAME
@@ -98,10 +98,42 @@ class TextOrderAgent:
         # "ORDERING", "AWAITING_PAYMENT_PROOF", "AWAITING_SELLER_APPROVAL"
         self.interaction_state = "ORDERING"
         
+        # Chat Session Identity (ties uploaded receipts to this customer)
+        # None = single-customer mode: use the most recent receipt in the folder.
+        self.session_id = session_id
+
+        # Journal key and order-id prefix: a session id is only unique within its seller (api.py keys agents by both)
+        self.session_key = ":".join(part for part in (seller_id, session_id) if part) or "default"
+
+        # Clock for order/delivery dates and the per-message CURRENT DATE/TIME line (injectable for tests/replays)
+        self.clock = clock or datetime.now
+
+        # Pending Order ID (registered with the payment matcher on finalize_order)
+        self._order_id: Optional[str] = None
+
+        # Session Journal (rebuilds in-flight conversations after a restart without the model)
+        # Only the API server opts in (use_journal=True); the CLI and offline tools never replay or write sessions.
+        self.journal = None
+        if use_journal and settings.SESSION_JOURNAL_DIR:
+            from session_journal import get_journal
+            self.journal = get_journal(
+                settings.SESSION_JOURNAL_DIR,
+                fsync_interval=settings.SESSION_FSYNC_INTERVAL,
+                snapshot_every=settings.SESSION_SNAPSHOT_EVERY,
+                idle_ttl=settings.SESSION_IDLE_TTL_HOURS * 3600
+            )
+            self._restore_session()
+
         # Initialize OCR
         from ocr_manager import OCRManager
         self.ocr_manager = OCRManager(model_name=settings.OCR_MODEL_NAME)
         
+        # Initialize Order Store (finalized orders survive restarts and resets)
+        self.order_store = None
+        if settings.ORDER_DB_PATH:
+            from order_store import get_order_store
+            self.order_store = get_order_store(settings.ORDER_DB_PATH)
+
         # Initialize Price Verifier
         from price_verifier import PriceVerifier
         self.price_verifier = PriceVerifier()
@@ -109,11 +141,32 @@ class TextOrderAgent:
         # Determine Guide Path
         self.guide_path = guide_path if guide_path else f"{settings.GUIDES_DIR}/order_guide.txt"
         
+        # Seller Routing (multi-tenant): guide and compiled model are shared by all sessions of a seller
+        self.seller_id = seller_id
+        self.guide_registry = guide_registry
+        if self.seller_id:
+            if self.guide_registry is None:
+                from guide_registry import get_registry
+                self.guide_registry = get_registry()
+            guide = self.guide_registry.get(self.seller_id)
+            if guide is None:
+                raise ValueError(f"Unknown seller: {self.seller_id}")
+            self.guide_path = guide.source
+        
         # Load Store Guide for System Prompt context
         self._initialize_model()
         
     def _initialize_model(self):
         """Loads guides and creates/recreates the GenerativeModel with system instructions."""
+        if self.seller_id:
+            # Shared per seller and guide version; the date travels with each message, not the prompt.
+            self.model = self.guide_registry.get_model(
+                self.seller_id,
+                (self.model_name,),
+                lambda guide: self._create_model(guide.text, self.guide_registry.address_guide_text)
+            )
+            return
+
         store_guide_text = "Store information unavailable."
         address_guide_text = "Address validation guide unavailable."
         try:
@@ -124,12 +177,13 @@ class TextOrderAgent:
         except Exception:
             pass
 
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
+        self.model = self._create_model(store_guide_text, address_guide_text)
 
-        self.model = GenerativeModel(
+    def _create_model(self, store_guide_text: str, address_guide_text: str) -> GenerativeModel:
+        """Builds the GenerativeModel with the store/address guides in its system instructions."""
+        return GenerativeModel(
             self.model_name,
             system_instruction=[
-                f"CURRENT DATE/TIME: {current_time}",
                 "You are an expert Order Processing Agent for the store defined in the STORE GUIDE.",
                 f"STORE GUIDE:\n{store_guide_text}",
                 f"ADDRESS GUIDE:\n{address_guide_text}",
@@ -165,7 +219,9 @@ class TextOrderAgent:
                 "7. **COMPLETENESS CHECK**: Do NOT ask 'Is this order correct?' or show the summary until you have all required fields: Items, Name, Contact, Address. (Delivery Date determines completeness only if NOT fixed by guide).",
                 "8. **CONFIRM**: Once you have ALL info, naturally summarize the order. CRITICAL: You MUST explicitly mention the 'Delivery Date' or 'Delivery Schedule' in your summary. Then ask if the order is correct.",
                 "9. **FINALIZE**: ONLY after the user confirms, call `finalize_order`.",
-                "- **ORDER DATE**: Record the 'order_date' as the 'CURRENT DATE/TIME' date (YYYY-MM-DD) when the order is initiated.",
+                "- **CURRENT DATE/TIME**: Each user message starts with a '[CURRENT DATE/TIME: ...]' line added by the system (not typed by the user). Use it for 'today', and use its RESOLVED DATES as the exact dates of relative expressions like '내일' or '다음주 화요일'. Never mention this line to the user.",
+                "- **ORDER DATE**: The system records 'order_date' automatically from the CURRENT DATE/TIME.",
+                "- **PRE-EXTRACTED ORDER**: A '[PRE-EXTRACTED ORDER: ...]' line after the date line comes from the rule-based parser (not typed by the user). Its customer fields are already recorded; check its ITEMS against the message and the guide, record the correct items with `update_order_state`, and resolve every listed ISSUE. Never mention this line to the user.",
                 "8. **DELIVERY LOGIC**: 'desired_delivery_date' MUST be the date the USER explicitly requests (e.g. 'I need it by Dec 25th'). If the user does NOT explicitly ask for a specific date, set 'desired_delivery_date' to null. DO NOT infer the delivery date from the guide's 'shipping schedule' (e.g. 'orders before 2pm ship today'). That is the *estimated* delivery, not the *desired* one. If the user asks 'When will it arrive?', answer them based on the guide, but keep 'desired_delivery_date' as null. NEVER use the order recording date as the 'desired_delivery_date'.",                "- **UNIT PRICE**: When adding items, try to identify the 'unit_price' from the guide if possible. The system will verify it later.",
                 "- **SEQUENTIAL PROCESSING**: NEVER call `finalize_order` and `verify_payment` in the same turn. The user CANNOT deposit without the account info.",
 
@@ -209,6 +265,12 @@ class TextOrderAgent:
         self._current_order = self._get_default_order_state()
         self.interaction_state = "ORDERING"
         self._chat_session = None
+        self._journal("reset")
+        if getattr(self, "_order_id", None):
+            # An abandoned or seller-handled order must not be matched by later receipts.
+            from payment_matcher import get_matcher
+            get_matcher(settings.PAYMENT_MATCH_WINDOW_HOURS).remove_order(self._order_id)
+            self._order_id = None
         if hasattr(self, "price_verifier"):
             self.price_verifier.reset()
         if hasattr(self, "ocr_manager"):
@@ -216,6 +278,28 @@ class TextOrderAgent:
         if settings.DEBUG:
             print("[Agent] Memory and state have been reset.")
 
+    def _journal(self, event_type: str, data: Dict[str, Any] = None):
+        """Appends a mutation/transition of this session to the journal."""
+        if getattr(self, "journal", None):
+            self.journal.append(self.session_key, event_type, data)
+
+    def _restore_session(self):
+        """Restores order, interaction state and pending payment match from the journal."""
+        state = self.journal.get_state(self.session_key)
+        if not state:
+            return
+        self._current_order = {**self._get_default_order_state(), **state["order"]}
+        self.interaction_state = state.get("interaction_state") or "ORDERING"
+        self._order_id = state.get("order_id")
+        if self._order_id and self.interaction_state == "AWAITING_PAYMENT_PROOF":
+            # Keep the original registration time so the payment window does not restart with the process
+            pending_since = state.get("pending_since")
+            created_at = datetime.fromisoformat(pending_since) if pending_since else None
+            from payment_matcher import get_matcher
+            get_matcher(settings.PAYMENT_MATCH_WINDOW_HOURS).add_order(self._order_id, self._current_order, created_at)
+        if settings.DEBUG:
+            print(f"[Agent] Session restored from journal: state={self.interaction_state}, order_id={self._order_id}")
+
     def update_guide(self, guide_path: str):
         """Updates the guide path and re-initializes the model with new instructions."""
         self.guide_path = guide_path
@@ -226,24 +310,31 @@ class TextOrderAgent:
     def verify_payment(self, image_name: str = None) -> str:
         """
         Verifies payment by analyzing a receipt image from the transfer_image folder.
-        If image_name is not provided, it looks for the most recent file in the folder.
+        If image_name is not provided, it uses the most recent receipt indexed for this session
+        (or in the whole folder when the agent has no session_id or no receipt was filed under it).
         """
         import os
-        transfer_dir = "transfer_image"
+        from receipt_inbox import get_inbox
+        transfer_dir = settings.TRANSFER_IMAGE_DIR
         
         target_image = None
         if image_name:
-            if os.path.exists(f"{transfer_dir}/{image_name}"):
-                target_image = f"{transfer_dir}/{image_name}"
+            if os.path.exists(os.path.join(transfer_dir, image_name)):
+                target_image = os.path.join(transfer_dir, image_name)
         else:
-            # Find most recent file
-            files = [f for f in os.listdir(transfer_dir) if os.path.isfile(os.path.join(transfer_dir, f))]
-            if files:
-                latest_file = max(files, key=lambda x: os.path.getmtime(os.path.join(transfer_dir, x)))
-                target_image = f"{transfer_dir}/{latest_file}"
+            # Most recent receipt for this session, from the indexed inbox (no directory scan).
+            # Receipts are only filed per session when saved as "<session_id>__name" (or via inbox.expect);
+            # plain uploads fall back to the folder-wide latest, and the payment matcher still only
+            # confirms this session's own order.
+            inbox = get_inbox(transfer_dir)
+            record = inbox.latest(self.session_id)
+            if record is None and self.session_id is not None:
+                record = inbox.latest()
+            if record:
+                target_image = record.path
         
         if not target_image:
-            return "No receipt image found in 'transfer_image' folder. Please upload the receipt."
+            return f"No receipt image found in '{transfer_dir}' folder. Please upload the receipt."
             
         # Call OCR
         result = self.ocr_manager.analyze_payment_receipt(target_image)
@@ -253,7 +344,19 @@ class TextOrderAgent:
             
         # Update State
         self._current_order["payment_info"] = result
+        self._journal("update", {"payment_info": result})
         
+        # --- Automatic Matching ---
+        # Resolve the receipt against every pending order (amount -> depositor name -> time window).
+        from payment_matcher import get_matcher, CONFIRMED
+        match = get_matcher(settings.PAYMENT_MATCH_WINDOW_HOURS).match(result, self._order_id)
+        if settings.DEBUG:
+            print(f"[PaymentMatcher] {match.status}: {match.reason} (order={match.order_id}, candidates={match.candidates})")
+        self._save_order(self.interaction_state)
+        if settings.PAYMENT_AUTO_CONFIRM and match.status == CONFIRMED and match.order_id == self._order_id:
+            from messages import get_system_message
+            return get_system_message('PAYMENT_AUTO_CONFIRMED')
+
         # --- Comparison Logic ---
         # Retrieve Stored Expected Total (or recalculate if missing)
         expected_total = self._current_order.get("expected_amount")
@@ -278,6 +381,7 @@ class TextOrderAgent:
                 f"  - Items: {order_summary}\n"
                 f"  - Expected Amount: {expected_total:,}원\n"
                 f"  - Expected Store Account: {settings.BANK_ACCOUNT_INFO}\n"
+                f"  - Auto Match: {match.status} ({match.reason})\n"
                 f"\n"
                 f"{get_system_message('SYSTEM_QUERY')} \n"
                 f"{get_system_message('SELLER_INSTRUCTION')}")
@@ -322,6 +426,8 @@ class TextOrderAgent:
 
     def get_store_info(self) -> str:
         """Returns the list of available fruits, prices, and ordering guide."""
+        if self.seller_id:
+            return self.guide_registry.get(self.seller_id).text
         try:
             with open(self.guide_path, "r", encoding="utf-8") as f:
                 return f.read()
@@ -353,6 +459,9 @@ class TextOrderAgent:
             # Append new items to existing list (Additive)
             self._current_order["items"].extend(items)
             updates.append(f"Added items: {items}")
+            # Tell the model which option groups are still unselected so it asks instead of guessing
+            from rule_engine import missing_options
+            updates.extend(missing_options(self.get_store_info(), items))
 
         # For other fields, overwrite only if provided (Non-empty)
         # This prevents clearing fields if the LLM accidentally passes None/Empty
@@ -365,7 +474,15 @@ class TextOrderAgent:
         if delivery_address:
             self._current_order["delivery_address"] = delivery_address
             updates.append(f"Set address to: {delivery_address}")
+            # Local completeness check (region trie); an incomplete address is re-asked without guide reasoning
+            from rule_engine import address_issue
+            issue = address_issue(delivery_address)
+            if issue:
+                updates.append(issue)
         if desired_delivery_date:
+            # '이번 주 토요일' → YYYY-MM-DD from the clock, not from the model's arithmetic
+            from rule_engine import resolve_delivery_date
+            desired_delivery_date = resolve_delivery_date(desired_delivery_date, self.clock())
             self._current_order["desired_delivery_date"] = desired_delivery_date
             updates.append(f"Set date to: {desired_delivery_date}")
         if special_requests:
@@ -374,12 +491,25 @@ class TextOrderAgent:
             
         # Always set Order Date if not present
         if "order_date" not in self._current_order:
-            self._current_order["order_date"] = datetime.now().strftime("%Y-%m-%d")
+            self._current_order["order_date"] = self.clock().strftime("%Y-%m-%d")
             
         # Real-time Price Update
         total = self._calculate_expected_total()
         self._current_order["expected_amount"] = total
         
+        # Journal the mutation (items as rewritten by the price verifier, not the raw arguments)
+        changed = {field: value for field, value in (
+            ("customer_name", customer_name), ("contact_number", contact_number),
+            ("delivery_address", delivery_address), ("desired_delivery_date", desired_delivery_date),
+            ("special_requests", special_requests)
+        ) if value}
+        changed.update({
+            "items": self._current_order["items"],
+            "order_date": self._current_order["order_date"],
+            "expected_amount": total
+        })
+        self._journal("update", changed)
+        
         if settings.DEBUG:
             return f"Order updated. Current State: {json.dumps(self._current_order, ensure_ascii=False, indent=2)}"
         return "Order updated."
@@ -402,15 +532,45 @@ class TextOrderAgent:
                 f"금액은 총 {total_amount:,}원 입니다.\n"
                 f"입금 후 이체 확인증이나 캡처 이미지를 보내주세요.")
                 
+        # Register as pending so incoming receipts can be matched to it
+        import uuid
+        from payment_matcher import get_matcher
+        self._order_id = self._order_id or f"{self.session_key}-{uuid.uuid4().hex[:12]}"
+        pending_since = datetime.now()
+        get_matcher(settings.PAYMENT_MATCH_WINDOW_HOURS).add_order(self._order_id, self._current_order, pending_since)
+
         # Transition State
         self.interaction_state = "AWAITING_PAYMENT_PROOF"
+        self._save_order(self.interaction_state)
+        self._journal("update", {"items": self._current_order["items"], "expected_amount": total_amount})
+        self._journal("state", {"interaction_state": self.interaction_state, "order_id": self._order_id,
+                                "pending_since": pending_since.isoformat()})
         
         return msg
 
-    def query(self, message: str, history: List[str] = None):
+    def _save_order(self, status: str):
+        """Persists the finalized order (header, items, payment info) under the given status."""
+        if not self.order_store or not self._order_id:
+            return
+        import os
+        self.order_store.save_order({
+            **self._current_order,
+            "order_id": self._order_id,
+            "status": status,
+            "session_id": self.session_id,
+            "seller_id": self.seller_id,
+            "guide_name": self.seller_id or os.path.basename(self.guide_path)
+        })
+
+    def _set_order_status(self, status: str, note: str = None):
+        if self.order_store and self._order_id:
+            self.order_store.update_status(self._order_id, status, note)
+
+    def query(self, message: str, history: List[str] = None, context: Optional[str] = None):
         """
         Processes a user message using the Reasoning Engine pattern locally.
         Runs a chat session with tool use.
+        'context' is an extra system line sent after the date line (e.g. the order cascade's pre-extracted order).
         """
         # --- Deterministic State Check ---
         if self.interaction_state == "AWAITING_PAYMENT_PROOF":
@@ -428,9 +588,16 @@ class TextOrderAgent:
             # Use Extensible Message System for check
             from messages import get_system_message
             
+            # Unique automatic match: no seller approval needed
+            if verification_result == get_system_message('PAYMENT_AUTO_CONFIRMED'):
+                self._set_order_status("PAYMENT_CONFIRMED", "auto-matched")
+                self._order_id = None
+                self.reset_state()
             # If successful (headers match), transition to Approval
-            if get_system_message('VERIFICATION_HEADLINE') in verification_result:
+            elif get_system_message('VERIFICATION_HEADLINE') in verification_result:
                 self.interaction_state = "AWAITING_SELLER_APPROVAL"
+                self._set_order_status(self.interaction_state)
+                self._journal("state", {"interaction_state": self.interaction_state})
                 
             return verification_result
 
@@ -441,9 +608,11 @@ class TextOrderAgent:
             from messages import get_system_message
             
             if msg_lower in ["yes", "y", "예", "네"]:
+                self._set_order_status("PAYMENT_CONFIRMED", "seller approved")
                 self.reset_state()
                 return get_system_message("PAYMENT_CONFIRMED")
             elif msg_lower in ["no", "n", "아니오", "아니요"]:
+                 self._set_order_status("PAYMENT_REJECTED", "seller rejected")
                  self.reset_state()
                  return get_system_message("PAYMENT_REJECTED")
             else:
@@ -451,15 +620,23 @@ class TextOrderAgent:
 
         # If we want to persist the chat session across 'query' calls (multi-turn):
         if not hasattr(self, "_chat_session") or self._chat_session is None:
+             # New conversations pick up guide edits reloaded by the registry.
+             if getattr(self, "seller_id", None):
+                 self._initialize_model()
              self._chat_session = self.model.start_chat(response_validation=False)
         
-        # Send message
+        # Send message (prefixed with the current date/time and locally resolved dates)
+        from rule_engine import clock_line
+        header = clock_line(message, self.clock())
+        if context:
+            header = f"{header}\n{context}"
+        dated_message = f"{header}\n{message}"
         try:
-             response = self._chat_session.send_message(message)
+             response = self._chat_session.send_message(dated_message)
         except Exception as e:
              # Reset session if confirmed broken or just retry
              self._chat_session = self.model.start_chat(response_validation=False)
-             response = self._chat_session.send_message(message)
+             response = self._chat_session.send_message(dated_message)
         
         # Manual Tool Execution Loop
         max_turns = settings.MAX_TOOL_TURNS
@@ -1,25 +1,53 @@
+import threading
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from agent_engine import TextOrderAgent
+from guide_registry import get_registry
 from schemas import AgentResponse
 
 app = FastAPI(title="Agent 01 - Order Processor")
 
-# Initialize Agent (Global State for Demo)
-# In production, use session management.
-agent = TextOrderAgent()
+# Seller Guides (loaded once, hot reloaded, shared by all sessions of a seller)
+registry = get_registry()
+
+# One agent per (seller, session); each seller's compiled guide/model is shared between them.
+agents: Dict[Tuple[str, str], TextOrderAgent] = {}
+agents_lock = threading.Lock()
 
 class ChatRequest(BaseModel):
     message: str # Simple message for query-based agent
     # Legacy fields optional
     messages: Optional[List[Dict[str, str]]] = None 
-    guide_name: str = "order_guide"
+    guide_name: str = "order_guide"  # Seller id (guide file name or '[상점명]' in a guide bundle)
+    seller_id: Optional[str] = None  # Takes precedence over guide_name
+    session_id: str = "default"
+
+def get_agent(seller_id: str, session_id: str) -> TextOrderAgent:
+    if registry.get(seller_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown seller: {seller_id}")
+    with agents_lock:
+        agent = agents.get((seller_id, session_id))
+        if agent is None:
+            agent = TextOrderAgent(seller_id=seller_id, session_id=session_id, guide_registry=registry, use_journal=True)
+            agents[(seller_id, session_id)] = agent
+        return agent
 
 @app.get("/")
 def health_check():
     return {"status": "ok", "service": "Agent 01"}
 
+@app.get("/sellers")
+def list_sellers():
+    return {"sellers": registry.seller_ids()}
+
+@app.get("/payments/review")
+def payment_reviews():
+    """Receipts the payment matcher could not confirm on its own (ambiguous/unmatched), oldest first."""
+    from config import settings
+    from payment_matcher import get_matcher
+    return {"reviews": get_matcher(settings.PAYMENT_MATCH_WINDOW_HOURS).reviews()}
+
 @app.post("/chat")
 def chat_endpoint(request: ChatRequest):
     try:
@@ -28,8 +56,11 @@ def chat_endpoint(request: ChatRequest):
         if not user_msg and request.messages:
             user_msg = request.messages[-1].get("content", "")
             
+        agent = get_agent(request.seller_id or request.guide_name, request.session_id)
         response = agent.query(message=user_msg)
         return {"response": str(response)}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
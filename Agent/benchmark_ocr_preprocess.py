@@ -0,0 +1,136 @@
+"""
+Benchmark of receipt image preprocessing settings for OCR.
+
+For each setting, reports the average payload size sent to the model, preprocessing latency,
+OCR latency and field accuracy against the labelled receipts in test_data.
+Use --no-ocr to only measure payload size and preprocessing cost (no model calls).
+
+Usage:
+    python benchmark_ocr_preprocess.py --limit 20
+    python benchmark_ocr_preprocess.py --no-ocr
+"""
+import argparse
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+from image_preprocessor import ImagePreprocessor, guess_mime_type
+
+LABELS_PATH = "test_data/transfer_images_labels_accurate.json"
+IMAGE_DIR = "test_data/test_image"
+OUTPUT_DIR = "test_result"
+
+# name -> preprocessing options (None = original file, unchanged)
+SETTINGS = {
+    "raw": None,
+    "jpeg-2048": {"max_side": 2048},
+    "jpeg-1600": {"max_side": 1600},
+    "jpeg-1200": {"max_side": 1200},
+    "jpeg-1024": {"max_side": 1024},
+    "jpeg-1200-gray": {"max_side": 1200, "grayscale": True},
+    "jpeg-1200-crop": {"max_side": 1200, "crop": True},
+    "webp-1200": {"max_side": 1200, "format": "WEBP"},
+    "webp-1024-gray-crop": {"max_side": 1024, "format": "WEBP", "grayscale": True, "crop": True},
+}
+
+SCORED_FIELDS = ["sender_name", "receiver_bank", "receiver_account", "receiver_owner", "amount", "date", "time"]
+
+
+def normalize_field(field: str, value) -> str:
+    if value is None:
+        return ""
+    value = str(value)
+    if field in ("amount", "receiver_account", "date", "time"):
+        return re.sub(r"\D", "", value)
+    return re.sub(r"[^0-9a-zA-Z가-힣]", "", value)
+
+
+def field_accuracy(predict: dict, label: dict) -> float:
+    """Fraction of labelled fields the prediction got right (after normalization)."""
+    if "error" in predict:
+        return 0.0
+    fields = [f for f in SCORED_FIELDS if label.get(f) is not None]
+    if not fields:
+        return 1.0
+    correct = sum(1 for f in fields if normalize_field(f, predict.get(f)) == normalize_field(f, label.get(f)))
+    return correct / len(fields)
+
+
+def run_benchmark(limit=None, settings_names=None, run_ocr=True):
+    with open(LABELS_PATH, "r", encoding="utf-8") as f:
+        labels_data = json.load(f)
+    if limit:
+        labels_data = labels_data[:limit]
+
+    cases = []
+    for entry in labels_data:
+        path = os.path.join(IMAGE_DIR, entry["image_filename"])
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                cases.append((path, f.read(), entry.get("payment_info") or {}))
+    print(f"Loaded {len(cases)} images from {IMAGE_DIR}")
+
+    manager = None
+    if run_ocr:
+        from ocr_manager import OCRManager
+        manager = OCRManager(use_cache=False)
+
+    report = []
+    for name in settings_names or SETTINGS:
+        options = SETTINGS[name]
+        preprocessor = ImagePreprocessor(**options) if options is not None else None
+
+        total_bytes = 0
+        prep_seconds = 0.0
+        ocr_seconds = 0.0
+        accuracy_sum = 0.0
+
+        for path, raw_bytes, label in cases:
+            start = time.perf_counter()
+            if preprocessor:
+                payload, mime_type = preprocessor.process(raw_bytes)
+            else:
+                payload, mime_type = raw_bytes, guess_mime_type(path)
+            prep_seconds += time.perf_counter() - start
+            total_bytes += len(payload)
+
+            if manager:
+                start = time.perf_counter()
+                if manager.use_endpoint:
+                    predict = manager._analyze_via_endpoint(payload, mime_type)
+                else:
+                    predict = manager._analyze_via_gemini(payload, mime_type)
+                ocr_seconds += time.perf_counter() - start
+                accuracy_sum += field_accuracy(predict, label)
+
+        n = len(cases) or 1
+        row = {
+            "setting": name,
+            "avg_payload_kb": round(total_bytes / n / 1024, 1),
+            "avg_preprocess_ms": round(prep_seconds / n * 1000, 1),
+            "avg_ocr_ms": round(ocr_seconds / n * 1000, 1) if manager else None,
+            "field_accuracy": round(accuracy_sum / n, 4) if manager else None,
+        }
+        report.append(row)
+        print(f"{name:<22} payload={row['avg_payload_kb']:>8} KB  preprocess={row['avg_preprocess_ms']:>7} ms"
+              + (f"  ocr={row['avg_ocr_ms']:>8} ms  accuracy={row['field_accuracy']:.2%}" if manager else ""))
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    out_path = os.path.join(OUTPUT_DIR, f"ocr_preprocess_benchmark_{timestamp}.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"images": len(cases), "results": report}, f, ensure_ascii=False, indent=2)
+    print(f"Benchmark saved to: {out_path}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OCR preprocessing benchmark")
+    parser.add_argument("--limit", type=int, default=None, help="Number of images to use (default: all)")
+    parser.add_argument("--settings", nargs="*", choices=list(SETTINGS), help="Subset of settings to run")
+    parser.add_argument("--no-ocr", action="store_true", help="Only measure payload size and preprocessing latency")
+    args = parser.parse_args()
+
+    run_benchmark(limit=args.limit, settings_names=args.settings, run_ocr=not args.no_ocr)
@@ -17,12 +17,54 @@ class Settings(BaseSettings):
     OCR_MODEL_NAME: str
     OCR_ENDPOINT_ID: str
 
+    # OCR Result Cache (empty path disables the cache)
+    OCR_CACHE_PATH: str = "ocr_cache.sqlite3"
+    OCR_CACHE_MAX_ENTRIES: int = 10000
+    OCR_CACHE_MAX_BYTES: int = 50 * 1024 * 1024
+
+    # OCR Image Preprocessing
+    OCR_PREPROCESS: bool = True
+    OCR_MAX_SIDE: int = 1600
+    OCR_GRAYSCALE: bool = False
+    OCR_CROP: bool = False
+    OCR_IMAGE_FORMAT: str = "JPEG"  # JPEG / WEBP / PNG
+    OCR_IMAGE_QUALITY: int = 85
+
+    # Local Receipt Parser (Tesseract fast path ahead of the OCR model)
+    OCR_LOCAL_PARSER: bool = True
+    OCR_LOCAL_MIN_CONFIDENCE: float = 0.9
+    OCR_LOCAL_LANG: str = "kor+eng"
+
+    # Payment Matching (receipt -> pending order)
+    PAYMENT_AUTO_CONFIRM: bool = True  # Confirm unique amount+name matches without seller approval
+    PAYMENT_MATCH_WINDOW_HOURS: int = 72
+
+    # Order Store (SQLite, WAL mode; empty path disables persistence)
+    ORDER_DB_PATH: str = "orders.sqlite3"
+
+    # Session Journal (event log + snapshots; empty dir disables crash recovery)
+    SESSION_JOURNAL_DIR: str = "session_journal"
+    SESSION_FSYNC_INTERVAL: float = 0.05  # Seconds between batched fsyncs
+    SESSION_SNAPSHOT_EVERY: int = 5000    # Events between snapshots
+    SESSION_IDLE_TTL_HOURS: float = 72    # Sessions idle this long are dropped at the next snapshot (0 keeps all)
+
+    # Product Index (rule-based catalog lookup from Agent_10000; empty dir disables it)
+    RULE_ENGINE_DIR: str = "../Agent_10000"
+    PRODUCT_INDEX_FAST_PATH: bool = True  # Price orders locally when every item resolves unambiguously
+
+    # Order Cascade (rule-based SMSOrderAgent first, TextOrderAgent only for low-confidence orders)
+    CASCADE_MIN_CONFIDENCE: float = 1.0  # Rule-tier confidence needed to skip the model (0.25 steps: 4 required fields)
+    CASCADE_REQUIRE_VALID: bool = True   # Also require validate_order to pass (complete address, options chosen)
+
     # API Server Configuration
     API_HOST: str
     API_PORT: int
     
     # Application Paths
     GUIDES_DIR: str
+    TRANSFER_IMAGE_DIR: str = "transfer_image"  # Receipt inbox (watched and indexed)
+    SELLER_GUIDE_BUNDLES: str = ""  # Comma-separated markdown files with one fenced guide per seller
+    GUIDE_RELOAD_INTERVAL: float = 2.0  # Seconds between guide edit checks
 
     # Message Language
     LANGUAGE: str
@@ -0,0 +1,252 @@
+import glob
+import hashlib
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Shared by every seller; not a store guide.
+ADDRESS_GUIDE_NAME = "address_guide.txt"
+
+_SELLER_NAME = re.compile(r"\[([^\]]+)\]")
+_FENCED_BLOCK = re.compile(r"```\s*\n(.*?)```", re.S)
+
+
+class SellerGuide:
+    """
+    One seller guide: raw text, content fingerprint and the rule engine's compiled guide
+    (Agent_10000 compile_guide: parsed products, fuzzy index, shipping rules), or None
+    when the rule engine is not deployed.
+    """
+    def __init__(self, seller_id: str, source: str, text: str, compiled: Any, version: int):
+        self.seller_id = seller_id
+        self.source = source
+        self.text = text
+        self.fingerprint = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self.compiled = compiled
+        self.version = version
+
+    @property
+    def prices(self) -> Dict[str, int]:
+        """Product name -> price from the compiled guide (empty without the rule engine)."""
+        if self.compiled is None:
+            return {}
+        return {product.name: product.price for product in self.compiled.products.values()}
+
+
+class GuideRegistry:
+    """
+    Loads every seller guide once and shares it across all sessions of that seller.
+    Sources are the *.txt guides in GUIDES_DIR (seller id = file name) and optional
+    markdown bundles holding one fenced guide per seller (seller id = the '[상점명]'
+    in the guide header). A polling watcher reloads edited files; only sellers whose
+    text changed are recompiled (through the rule engine's compile_guide cache) and the
+    others keep their compiled guide and cached model. Sellers that disappear from a
+    bundle, or whose file is deleted, are dropped with their models.
+
+    A changed guide is recompiled whole rather than per product line: a full compile of
+    one seller guide takes about 2ms, and the per-product diff (added/removed/changed
+    prices) is still reported for each reload.
+    """
+    def __init__(self, guides_dir: str, bundle_paths: Iterable[str] = (), poll_interval: float = 2.0):
+        self.guides_dir = guides_dir
+        self.bundle_paths = [p for p in bundle_paths if p]
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._guides: Dict[str, SellerGuide] = {}
+        self._models: Dict[Tuple, Any] = {}
+        self._mtimes: Dict[str, float] = {}
+        self._source_sellers: Dict[str, List[str]] = {}  # source path -> seller ids it defines
+        self._address_guide_text = "Address validation guide unavailable."
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # ----- Lookups -----
+
+    def get(self, seller_id: str) -> Optional[SellerGuide]:
+        with self._lock:
+            return self._guides.get(seller_id)
+
+    def seller_ids(self) -> List[str]:
+        with self._lock:
+            return sorted(self._guides)
+
+    @property
+    def address_guide_text(self) -> str:
+        return self._address_guide_text
+
+    def get_model(self, seller_id: str, key: Tuple, factory: Callable[[SellerGuide], Any]):
+        """
+        Returns the model compiled from the seller's current guide, building it with
+        'factory' once per (seller, guide fingerprint, key) and sharing it afterwards.
+        """
+        guide = self.get(seller_id)
+        if guide is None:
+            raise KeyError(f"Unknown seller: {seller_id}")
+        cache_key = (seller_id, guide.fingerprint) + tuple(key)
+        with self._lock:
+            model = self._models.get(cache_key)
+        if model is None:
+            model = factory(guide)
+            with self._lock:
+                model = self._models.setdefault(cache_key, model)
+        return model
+
+    # ----- Loading -----
+
+    def load_all(self) -> Dict[str, Dict[str, List[str]]]:
+        """(Re)loads every source. Returns the product diff per seller that changed or was removed."""
+        sources = self._sources()
+        diffs = self._drop_vanished(sources)
+        for path in sources:
+            diffs.update(self.reload_file(path))
+        return diffs
+
+    def reload_file(self, path: str) -> Dict[str, Dict[str, List[str]]]:
+        try:
+            mtime = os.path.getmtime(path)
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except OSError:
+            return {}
+        self._mtimes[path] = mtime
+
+        if os.path.basename(path) == ADDRESS_GUIDE_NAME:
+            self._address_guide_text = content
+            return {}
+
+        if path.endswith(".md"):
+            sellers = split_guide_bundle(content)
+        else:
+            sellers = {os.path.splitext(os.path.basename(path))[0]: content}
+
+        diffs = {}
+        for seller_id, text in sellers.items():
+            diff = self._update_seller(seller_id, path, text)
+            if diff is not None:
+                diffs[seller_id] = diff
+        # Sellers this file used to define but no longer does
+        for seller_id in self._source_sellers.get(path, []):
+            if seller_id not in sellers:
+                diff = self._remove_seller(seller_id, path)
+                if diff is not None:
+                    diffs[seller_id] = diff
+        self._source_sellers[path] = list(sellers)
+        return diffs
+
+    def _drop_vanished(self, sources: List[str]) -> Dict[str, Dict[str, List[str]]]:
+        """Forgets sources that no longer exist, removing the sellers they defined."""
+        diffs = {}
+        for path in [p for p in self._mtimes if p not in sources]:
+            del self._mtimes[path]
+            if os.path.basename(path) == ADDRESS_GUIDE_NAME:
+                self._address_guide_text = "Address validation guide unavailable."
+            for seller_id in self._source_sellers.pop(path, []):
+                diff = self._remove_seller(seller_id, path)
+                if diff is not None:
+                    diffs[seller_id] = diff
+        return diffs
+
+    def _remove_seller(self, seller_id: str, source: str) -> Optional[Dict[str, List[str]]]:
+        """Drops a seller and its models, unless another source has defined it since."""
+        with self._lock:
+            guide = self._guides.get(seller_id)
+            if guide is None or guide.source != source:
+                return None
+            del self._guides[seller_id]
+            for cache_key in [k for k in self._models if k[0] == seller_id]:
+                del self._models[cache_key]
+        return {"added": [], "removed": sorted(guide.prices), "changed": []}
+
+    def _update_seller(self, seller_id: str, source: str, text: str) -> Optional[Dict[str, List[str]]]:
+        fingerprint = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            previous = self._guides.get(seller_id)
+            if previous is not None and previous.fingerprint == fingerprint and previous.source == source:
+                return None
+
+        # Same parser and cache as the SMS agent and the price fast path (one compile per guide text).
+        from rule_engine import get_compiled_guide
+        compiled = get_compiled_guide(text)
+        guide = SellerGuide(seller_id, source, text, compiled, (previous.version + 1) if previous else 1)
+
+        prices, old_prices = guide.prices, previous.prices if previous else {}
+        diff = {
+            "added": sorted(set(prices) - set(old_prices)),
+            "removed": sorted(set(old_prices) - set(prices)),
+            "changed": sorted(name for name in set(prices) & set(old_prices) if prices[name] != old_prices[name])
+        }
+
+        with self._lock:
+            self._guides[seller_id] = guide
+            # Models compiled from older versions of this guide are no longer reachable.
+            for cache_key in [k for k in self._models if k[0] == seller_id and k[1] != guide.fingerprint]:
+                del self._models[cache_key]
+        return diff
+
+    def _sources(self) -> List[str]:
+        paths = sorted(glob.glob(os.path.join(self.guides_dir, "*.txt")))
+        return paths + [p for p in self.bundle_paths if os.path.exists(p)]
+
+    # ----- Watching -----
+
+    def start(self):
+        """Loads all guides, then polls the sources for edits in a daemon thread."""
+        self.load_all()
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="guide-registry", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval * 2)
+
+    def _watch(self):
+        from config import settings
+        while not self._stop.wait(self.poll_interval):
+            sources = self._sources()
+            diffs = self._drop_vanished(sources)
+            if settings.DEBUG:
+                for seller_id, diff in diffs.items():
+                    print(f"[GuideRegistry] Removed '{seller_id}': {diff}")
+            for path in sources:
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                if self._mtimes.get(path) == mtime:
+                    continue
+                diffs = self.reload_file(path)
+                if settings.DEBUG:
+                    for seller_id, diff in diffs.items():
+                        print(f"[GuideRegistry] Reloaded '{seller_id}': {diff}")
+
+
+def split_guide_bundle(content: str) -> Dict[str, str]:
+    """Splits a markdown bundle into {seller_id: guide text}, one fenced block per seller."""
+    guides = {}
+    for block in _FENCED_BLOCK.findall(content):
+        header = next((line for line in block.splitlines() if line.strip()), "")
+        m = _SELLER_NAME.search(header)
+        if m:
+            guides[m.group(1).strip()] = block.strip()
+    return guides
+
+
+_registry: Optional[GuideRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> GuideRegistry:
+    """Process-wide registry built from settings. Started on first use."""
+    global _registry
+    from config import settings
+    with _registry_lock:
+        if _registry is None:
+            bundles = [p.strip() for p in settings.SELLER_GUIDE_BUNDLES.split(",")]
+            _registry = GuideRegistry(settings.GUIDES_DIR, bundles, poll_interval=settings.GUIDE_RELOAD_INTERVAL)
+            _registry.start()
+        return _registry
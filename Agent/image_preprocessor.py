@@ -0,0 +1,95 @@
+import io
+import mimetypes
+from typing import Dict, Any, Tuple
+
+from PIL import Image, ImageOps, ImageChops
+
+# Output format -> MIME type sent to the OCR model
+FORMAT_MIME_TYPES = {
+    "JPEG": "image/jpeg",
+    "WEBP": "image/webp",
+    "PNG": "image/png",
+}
+
+DEFAULT_OPTIONS = {
+    "max_side": 1600,   # Longest side in pixels after downscaling (0 = keep original size)
+    "grayscale": False,
+    "crop": False,      # Crop to the receipt region (trims the uniform screenshot background)
+    "format": "JPEG",   # JPEG / WEBP / PNG
+    "quality": 85,
+}
+
+
+class ImagePreprocessor:
+    """
+    Shrinks receipt images before they are sent to the OCR model.
+    EXIF-orients the image, optionally crops the receipt region and converts to grayscale,
+    downscales to a maximum side and re-encodes it with the matching MIME type.
+    """
+    def __init__(self, **options):
+        unknown = set(options) - set(DEFAULT_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown preprocessing options: {sorted(unknown)}")
+        self.options: Dict[str, Any] = {**DEFAULT_OPTIONS, **options}
+        self.options["format"] = self.options["format"].upper()
+        if self.options["format"] not in FORMAT_MIME_TYPES:
+            raise ValueError(f"Unsupported image format: {self.options['format']}")
+
+    def signature(self) -> str:
+        """Stable description of the settings (used in cache keys and benchmark reports)."""
+        o = self.options
+        return f"{o['format'].lower()}-{o['max_side']}-q{o['quality']}{'-gray' if o['grayscale'] else ''}{'-crop' if o['crop'] else ''}"
+
+    def process(self, image_bytes: bytes) -> Tuple[bytes, str]:
+        """Returns (encoded image bytes, MIME type)."""
+        o = self.options
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            img = ImageOps.exif_transpose(img)
+
+            if o["crop"]:
+                img = self._crop_receipt_region(img)
+
+            if o["grayscale"]:
+                img = img.convert("L")
+            elif img.mode not in ("RGB", "L"):
+                # Flatten transparency onto white; JPEG has no alpha channel.
+                background = Image.new("RGB", img.size, (255, 255, 255))
+                rgba = img.convert("RGBA")
+                background.paste(rgba, mask=rgba.split()[-1])
+                img = background
+
+            if o["max_side"] and max(img.size) > o["max_side"]:
+                img.thumbnail((o["max_side"], o["max_side"]), Image.LANCZOS)
+
+            buffer = io.BytesIO()
+            save_kwargs = {"optimize": True}
+            if o["format"] in ("JPEG", "WEBP"):
+                save_kwargs["quality"] = o["quality"]
+            img.save(buffer, format=o["format"], **save_kwargs)
+
+        return buffer.getvalue(), FORMAT_MIME_TYPES[o["format"]]
+
+    @staticmethod
+    def _crop_receipt_region(img: Image.Image, padding: int = 8) -> Image.Image:
+        """
+        Crops away the uniform background around the receipt.
+        The background colour is sampled from the top-left corner; anything that differs
+        from it (beyond a small tolerance for compression noise) is treated as content.
+        """
+        rgb = img.convert("RGB")
+        background = Image.new("RGB", rgb.size, rgb.getpixel((0, 0)))
+        diff = ImageChops.difference(rgb, background).convert("L").point(lambda v: 255 if v > 16 else 0)
+        bbox = diff.getbbox()
+        if not bbox:
+            return img
+
+        left, top, right, bottom = bbox
+        left, top = max(left - padding, 0), max(top - padding, 0)
+        right, bottom = min(right + padding, img.width), min(bottom + padding, img.height)
+        return img.crop((left, top, right, bottom))
+
+
+def guess_mime_type(image_path: str) -> str:
+    """MIME type for sending the original file unchanged."""
+    mime_type, _ = mimetypes.guess_type(image_path)
+    return mime_type or "image/jpeg"
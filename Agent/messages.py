@@ -5,6 +5,7 @@ from config import settings
 SYSTEM_MESSAGES = {
     "korean": {
         "PAYMENT_CONFIRMED": "결제가 확인되었습니다. 배송을 준비하겠습니다.",
+        "PAYMENT_AUTO_CONFIRMED": "입금 내역이 주문과 일치하여 결제가 자동 확인되었습니다. 배송을 준비하겠습니다.",
         "PAYMENT_REJECTED": "결제가 거절되었습니다. 금액을 확인하고 이체 확인증을 다시 보내주세요.",
         "INVALID_INPUT": "잘못된 입력입니다. 결제를 승인하려면 '예', 거절하려면 '아니오'를 입력해주세요.",
         "VERIFICATION_HEADLINE": "--- 결제 검증 요청 ---",
@@ -13,6 +14,7 @@ SYSTEM_MESSAGES = {
     },
     "english": {
         "PAYMENT_CONFIRMED": "Payment confirmed. Processing delivery.",
+        "PAYMENT_AUTO_CONFIRMED": "Payment matched your order and was confirmed automatically. Processing delivery.",
         "PAYMENT_REJECTED": "Payment rejected. Please check the amount and send receipt again.",
         "INVALID_INPUT": "Invalid input. Please type 'Yes' to confirm payment or 'No' to reject.",
         "VERIFICATION_HEADLINE": "--- Payment Verification Required ---",
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class OCRCache:
+    """
+    Persistent OCR result cache backed by SQLite.
+    Entries are keyed by sha256(image bytes) + model/endpoint id + prompt version,
+    so the same screenshot is only sent to the OCR model once per configuration.
+    The cache is capped by entry count and total payload size; the least recently
+    used entries are evicted first.
+    """
+    def __init__(self, db_path: str, max_entries: int = 10000, max_bytes: int = 50 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_cache ("
+            " cache_key TEXT PRIMARY KEY,"
+            " result TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ocr_cache_last_access ON ocr_cache(last_access)")
+        self._conn.commit()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._hit_seconds = 0.0
+
+    @staticmethod
+    def make_key(image_bytes: bytes, model_id: str, prompt_version: str) -> str:
+        """Builds the cache key from image content and the OCR configuration that produced the result."""
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        return f"{digest}:{model_id}:{prompt_version}"
+
+    def get(self, key: str) -> Optional[dict]:
+        start = time.perf_counter()
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM ocr_cache WHERE cache_key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE ocr_cache SET last_access = ? WHERE cache_key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            self._hit_seconds += time.perf_counter() - start
+        return json.loads(row[0])
+
+    def put(self, key: str, result: dict):
+        payload = json.dumps(result, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_cache (cache_key, result, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload.encode("utf-8")), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Removes least recently used entries until both caps are satisfied. Caller holds the lock."""
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        victims = []
+        for key, size in self._conn.execute("SELECT cache_key, size FROM ocr_cache ORDER BY last_access ASC"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+
+        self._conn.executemany("DELETE FROM ocr_cache WHERE cache_key = ?", victims)
+        self.evictions += len(victims)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM ocr_cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Returns cache metrics (hit/miss counts, hit rate, average hit latency, current size)."""
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "avg_hit_ms": round(self._hit_seconds / self.hits * 1000, 3) if self.hits else 0.0,
+            "evictions": self.evictions,
+            "entries": count,
+            "bytes": total
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,16 +1,57 @@
-from vertexai.generative_models import GenerativeModel, Part, Image
+from vertexai.generative_models import GenerativeModel, Part
 import json
 import os
 import base64
 from config import settings
 from google.cloud import aiplatform
+from ocr_cache import OCRCache
+from image_preprocessor import ImagePreprocessor, guess_mime_type
+from receipt_parser import LocalReceiptParser
+
+# Bump whenever the extraction prompts below change, so cached results are not reused.
+OCR_PROMPT_VERSION = "1"
+
+GEMINI_PROMPT = """
+            Analyze this bank transfer receipt/screenshot.
+            Extract the following information in strict JSON format:
+            {
+                "sender_name": "Name of sender (입금자명/보내는 분)",
+                "sender_bank": "Sender's Bank (보내는 분 은행/출금 계좌)",
+                "receiver_bank": "Receiver's Bank (받는 분 은행/입금은행)",
+                "receiver_account": "Receiver's Account No (입금 계좌번호)",
+                "receiver_owner": "Receiver's Name (입금 예금주)",
+                "amount": "Transfer amount (입금 금액)", 
+                "date": "Transfer date (YYYY-MM-DD)",
+                "time": "Transfer time (HH:MM:SS)"
+            }
+            If a field is missing, use null.
+            Return ONLY the JSON.
+            """
+
+# DeepSeek OCR is optimized for Markdown. We explicitly request JSON.
+ENDPOINT_PROMPT = """
+            You are an advanced OCR engine.
+            Analyze this bank transfer receipt image.
+            Extract payment details into the following JSON structure:
+            {
+                "sender_name": "Name of sender",
+                "sender_bank": "Sender's Bank",
+                "receiver_bank": "Receiver's Bank",
+                "receiver_account": "Receiver's Account Number",
+                "receiver_owner": "Receiver's Name",
+                "amount": "Amount", 
+                "date": "YYYY-MM-DD",
+                "time": "HH:MM:SS"
+            }
+            Return ONLY valid JSON.
+            """
 
 class OCRManager:
     """
     Manages OCR tasks using Vertex AI (Gemini or DeepSeek Endpoint).
     Extracts payment information from receipt images.
     """
-    def __init__(self, model_name: str = None):
+    def __init__(self, model_name: str = None, preprocess_options: dict = None, use_cache: bool = True):
         self.model_name = model_name or settings.OCR_MODEL_NAME
         self.endpoint_id = settings.OCR_ENDPOINT_ID
         
@@ -30,6 +71,35 @@ class OCRManager:
             self.model = GenerativeModel(self.model_name)
             print(f"OCRManager initialized via GenerativeModel (Gemini): {self.model_name}")
 
+        # Image Preprocessing (shrinks the payload before upload)
+        self.preprocessor = None
+        if preprocess_options is not None:
+            self.preprocessor = ImagePreprocessor(**preprocess_options)
+        elif settings.OCR_PREPROCESS:
+            self.preprocessor = ImagePreprocessor(
+                max_side=settings.OCR_MAX_SIDE,
+                grayscale=settings.OCR_GRAYSCALE,
+                crop=settings.OCR_CROP,
+                format=settings.OCR_IMAGE_FORMAT,
+                quality=settings.OCR_IMAGE_QUALITY
+            )
+
+        # Local Fast Path (Tesseract + bank layout templates, no model cost)
+        self.local_parser = None
+        if settings.OCR_LOCAL_PARSER and LocalReceiptParser.is_available():
+            self.local_parser = LocalReceiptParser(lang=settings.OCR_LOCAL_LANG)
+        self.local_hits = 0
+        self.model_calls = 0
+
+        # Result Cache (shared across sessions and evaluation reruns)
+        self.cache = None
+        if use_cache and settings.OCR_CACHE_PATH:
+            self.cache = OCRCache(
+                settings.OCR_CACHE_PATH,
+                max_entries=settings.OCR_CACHE_MAX_ENTRIES,
+                max_bytes=settings.OCR_CACHE_MAX_BYTES
+            )
+
     def reset(self):
         """Resets the OCR manager (stateless for now)."""
         if settings.DEBUG:
@@ -44,31 +114,67 @@ class OCRManager:
         if not os.path.exists(image_path):
             return {"error": "Image file not found."}
 
+        with open(image_path, "rb") as f:
+            raw_bytes = f.read()
+
+        cache_key = None
+        if self.cache:
+            cache_key = OCRCache.make_key(raw_bytes, self._cache_model_id(), OCR_PROMPT_VERSION)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if settings.DEBUG:
+                    print(f"[OCRManager] Cache hit: {image_path}")
+                return cached
+
+        # Try the local parser first; only fall back to the model when it is unsure.
+        if self.local_parser:
+            local_result = self.local_parser.parse_image(raw_bytes)
+            if local_result and local_result["confidence"] >= settings.OCR_LOCAL_MIN_CONFIDENCE:
+                self.local_hits += 1
+                if settings.DEBUG:
+                    print(f"[OCRManager] Local parse ({local_result['source']}, confidence {local_result['confidence']}): {image_path}")
+                return local_result
+
+        self.model_calls += 1
+        try:
+            image_bytes, mime_type = self.prepare_image(raw_bytes, image_path)
+        except Exception as e:
+            return {"error": f"Image preprocessing failed: {str(e)}"}
+
         if self.use_endpoint:
-            return self._analyze_via_endpoint(image_path)
+            result = self._analyze_via_endpoint(image_bytes, mime_type)
         else:
-            return self._analyze_via_gemini(image_path)
+            result = self._analyze_via_gemini(image_bytes, mime_type)
+
+        # Never cache failures; a retry should reach the model again.
+        if self.cache and "error" not in result:
+            self.cache.put(cache_key, result)
+        return result
 
-    def _analyze_via_gemini(self, image_path: str) -> dict:
+    def prepare_image(self, raw_bytes: bytes, image_path: str = ""):
+        """Returns (payload bytes, MIME type) for the OCR request."""
+        if self.preprocessor:
+            return self.preprocessor.process(raw_bytes)
+        return raw_bytes, guess_mime_type(image_path)
+
+    def _cache_model_id(self) -> str:
+        model_id = f"endpoint:{self.endpoint_id}" if self.use_endpoint else f"gemini:{self.model_name}"
+        # Different preprocessing can change what the model reads, so it is part of the key.
+        preprocess_id = self.preprocessor.signature() if self.preprocessor else "raw"
+        return f"{model_id}:{preprocess_id}"
+
+    def get_metrics(self) -> dict:
+        """Returns local fast-path / model call counts and OCR cache metrics."""
+        metrics = {"local_hits": self.local_hits, "model_calls": self.model_calls}
+        if self.cache:
+            metrics["cache"] = self.cache.stats()
+        return metrics
+
+    def _analyze_via_gemini(self, image_bytes: bytes, mime_type: str) -> dict:
         try:
-            image = Image.load_from_file(image_path)
+            image = Part.from_data(data=image_bytes, mime_type=mime_type)
             
-            prompt = """
-            Analyze this bank transfer receipt/screenshot.
-            Extract the following information in strict JSON format:
-            {
-                "sender_name": "Name of sender (입금자명/보내는 분)",
-                "sender_bank": "Sender's Bank (보내는 분 은행/출금 계좌)",
-                "receiver_bank": "Receiver's Bank (받는 분 은행/입금은행)",
-                "receiver_account": "Receiver's Account No (입금 계좌번호)",
-                "receiver_owner": "Receiver's Name (입금 예금주)",
-                "amount": "Transfer amount (입금 금액)", 
-                "date": "Transfer date (YYYY-MM-DD)",
-                "time": "Transfer time (HH:MM:SS)"
-            }
-            If a field is missing, use null.
-            Return ONLY the JSON.
-            """
+            prompt = GEMINI_PROMPT
             
             response = self.model.generate_content([image, prompt])
             return self._parse_json_response(response.text)
@@ -76,34 +182,16 @@ class OCRManager:
         except Exception as e:
             return {"error": f"Gemini OCR Analysis failed: {str(e)}"}
 
-    def _analyze_via_endpoint(self, image_path: str) -> dict:
+    def _analyze_via_endpoint(self, image_bytes: bytes, mime_type: str) -> dict:
         try:
-            with open(image_path, "rb") as f:
-                image_bytes = f.read()
-                # Ensure properly padded base64 if needed, though standard b64encode is usually fine
-                encoded_image = base64.b64encode(image_bytes).decode("utf-8")
+            # Ensure properly padded base64 if needed, though standard b64encode is usually fine
+            encoded_image = base64.b64encode(image_bytes).decode("utf-8")
 
             # DeepSeek-VL / OpenAI-Compatible Payload for Vertex AI Endpoint
             # Note: Vertex AI Model Garden 'DeepSeek OCR' MaaS typically uses standard VLM containers.
             # We use the OpenAI Chat Completion format which is the standard for 3rd party models on Vertex.
             
-            # DeepSeek OCR is optimized for Markdown. We explicitly request JSON.
-            prompt_text = """
-            You are an advanced OCR engine.
-            Analyze this bank transfer receipt image.
-            Extract payment details into the following JSON structure:
-            {
-                "sender_name": "Name of sender",
-                "sender_bank": "Sender's Bank",
-                "receiver_bank": "Receiver's Bank",
-                "receiver_account": "Receiver's Account Number",
-                "receiver_owner": "Receiver's Name",
-                "amount": "Amount", 
-                "date": "YYYY-MM-DD",
-                "time": "HH:MM:SS"
-            }
-            Return ONLY valid JSON.
-            """
+            prompt_text = ENDPOINT_PROMPT
 
             # Construct OpenAI-style Chat Completion payload
             instance = {
@@ -115,7 +203,7 @@ class OCRManager:
                             {
                                 "type": "image_url", 
                                 "image_url": {
-                                    "url": f"data:image/jpeg;base64,{encoded_image}"
+                                    "url": f"data:{mime_type};base64,{encoded_image}"
                                 }
                             }
                         ]
@@ -0,0 +1,302 @@
+"""
+Two-tier order parsing: the rule-based SMSOrderAgent first, the Gemini TextOrderAgent only when needed.
+
+Every SMS goes through SMSOrderAgent.parse_order (Agent_10000, well under a millisecond). If its
+confidence reaches CASCADE_MIN_CONFIDENCE, validate_order passes (CASCADE_REQUIRE_VALID) and every
+item's product is named in the message (by name/alias, "N번", or as the confident fuzzy match of one
+of its lines), the order is accepted without a model call. Otherwise the message escalates to
+TextOrderAgent, seeded with the fields the rule tier already extracted: customer fields are recorded
+up front and the items and validation issues travel as a '[PRE-EXTRACTED ORDER: ...]' line, so the
+model only fixes what is missing or ambiguous. Per-tier counts, latency and (with labels) accuracy are kept for
+tuning the threshold.
+
+With a deduper (order_dedupe.OrderDeduper) and a sender, re-sent or forwarded copies of an order
+from the same sender within the dedupe window are caught before either tier runs and reuse the
+original message's result.
+
+Usage (validation CSV):
+    python order_cascade.py --thresholds 0.5 0.75 1.0          # rule tier only: escalation rate/accuracy per threshold
+    python order_cascade.py --threshold 0.75 --llm --limit 10  # full cascade with model calls
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional
+
+from config import settings
+import rule_engine  # puts RULE_ENGINE_DIR (Agent_10000) on sys.path
+from order_dedupe import OrderDeduper
+from sms_order_agent import SMSOrderAgent
+
+RULE_TIER = "rule"
+LLM_TIER = "llm"
+DUPLICATE_TIER = "duplicate"
+
+# Rule-tier fields recorded in the model's order state before it sees the message
+SEED_FIELDS = ["customer_name", "contact_number", "delivery_address", "desired_delivery_date", "special_requests"]
+# Fields compared against the label (plus items)
+SCORED_FIELDS = ["customer_name", "contact_number", "delivery_address", "expected_amount"]
+
+VALIDATION_PATH = "../Agent_10000/validation_synthetic_100.csv"
+
+# Lines and "a, b / c + d" pieces checked by ungrounded_items
+_ITEM_PIECE = re.compile(r"[\n,/+]")
+
+
+@dataclass
+class CascadeResult:
+    tier: str                       # RULE_TIER (accepted), LLM_TIER (escalated) or DUPLICATE_TIER (re-sent copy)
+    order: Dict[str, Any]           # label-shaped order (items, customer fields, expected_amount)
+    confidence: float               # rule-tier confidence
+    issues: List[str]               # rule-tier validation issues (why the message escalated)
+    latency: float                  # seconds for this message, both tiers included
+    response: Optional[str] = None  # model reply when escalated
+    score: Optional[float] = None   # accuracy against the label, when one was given
+
+
+class TierStats:
+    """Latency and accuracy of the messages routed to one tier."""
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.scores: List[float] = []
+
+    def add(self, latency: float, score: Optional[float] = None):
+        self.latencies.append(latency)
+        if score is not None:
+            self.scores.append(score)
+
+    def summary(self, total: int) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        pick = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000 if latencies else None
+        return {
+            "count": len(latencies),
+            "share": len(latencies) / total if total else 0.0,
+            "mean_ms": statistics.mean(latencies) * 1000 if latencies else None,
+            "p50_ms": pick(0.50),
+            "p95_ms": pick(0.95),
+            "accuracy": statistics.mean(self.scores) if self.scores else None
+        }
+
+
+def accepts(confidence: float, is_valid: bool, min_confidence: float, require_valid: bool) -> bool:
+    """Whether a rule-tier result is trusted without a model call."""
+    return confidence >= min_confidence and (is_valid or not require_valid)
+
+
+def ungrounded_items(index, message: str, items) -> List[str]:
+    """
+    Rule-tier items whose product the message does not name: not found by the name automaton and
+    not the confident (name-only score and margin) fuzzy match of any line or comma/slash piece.
+    A non-empty result means the rule tier may have resolved the wrong product, so it escalates.
+    """
+    def unnamed(names):
+        return [item.product_name for item in items
+                if not any(item.product_name == name or item.product_name.startswith(name + " (") for name in names)]
+
+    named = {product.display_name for product in index.code_mentions(message)}
+    named.update(m.candidate.product.display_name for m in index.mentions(message))
+    if not unnamed(named):
+        return []
+    # Fuzzy pass only when a literal mention does not cover every item
+    for piece in _ITEM_PIECE.split(message):
+        candidate = index.best(piece) if piece.strip() else None
+        if candidate is not None:
+            named.add(candidate.product.display_name)
+    return unnamed(named)
+
+
+def seed_line(order: Dict[str, Any], issues: List[str]) -> str:
+    """System line handing the rule-tier result to the model (items to check, issues to resolve)."""
+    items = ", ".join(f"{item['product_name']} x{item['quantity']}" for item in order.get("items", []))
+    parts = [f"ITEMS: {items or 'none found'}"]
+    parts += [f"{field.upper()}: {order[field]}" for field in SEED_FIELDS if order.get(field)]
+    if issues:
+        parts.append("ISSUES: " + " / ".join(issues))
+    return "[PRE-EXTRACTED ORDER: " + "; ".join(parts) + "]"
+
+
+def _normalize(value: Any) -> str:
+    return re.sub(r"[^a-z0-9가-힣]", "", str(value).lower()) if value is not None else ""
+
+
+def score_order(pred: Dict[str, Any], label: Dict[str, Any]) -> float:
+    """
+    Share of SCORED_FIELDS matching the label (normalized text, digits for amounts) plus an items
+    score: label items matched by quantity and a product name contained either way.
+    """
+    matches = 0.0
+    for field in SCORED_FIELDS:
+        p, l = _normalize(pred.get(field)), _normalize(label.get(field))
+        matches += p == l
+    label_items = label.get("items") or []
+    pred_items = list(pred.get("items") or [])
+    if not label_items:
+        matches += not pred_items
+    else:
+        found = 0
+        for l_item in label_items:
+            l_name, l_qty = _normalize(l_item.get("product_name")), str(l_item.get("quantity"))
+            for i, p_item in enumerate(pred_items):
+                p_name = _normalize(p_item.get("product_name"))
+                if str(p_item.get("quantity")) == l_qty and p_name and l_name and (p_name in l_name or l_name in p_name):
+                    found += 1
+                    del pred_items[i]
+                    break
+        matches += found / len(label_items)
+    return round(matches / (len(SCORED_FIELDS) + 1), 4)
+
+
+class OrderCascade:
+    """
+    Routes each message to the rule tier or the model tier.
+    'rule_agent' is an SMSOrderAgent with the seller guide(s) loaded; 'llm_factory(seller_id)'
+    returns a TextOrderAgent with a fresh order state for that seller. Without a factory the
+    cascade only routes (escalated messages keep the rule-tier order), which is enough to
+    measure the escalation rate for a threshold. 'deduper' short-circuits near-duplicate
+    messages from the same sender (process(..., sender=...)).
+    """
+    def __init__(self, rule_agent: SMSOrderAgent, llm_factory: Optional[Callable[[Optional[str]], Any]] = None,
+                 min_confidence: Optional[float] = None, require_valid: Optional[bool] = None,
+                 scorer: Callable[[Dict[str, Any], Dict[str, Any]], float] = score_order,
+                 deduper: Optional[OrderDeduper] = None):
+        self.rule_agent = rule_agent
+        self.llm_factory = llm_factory
+        self.min_confidence = settings.CASCADE_MIN_CONFIDENCE if min_confidence is None else min_confidence
+        self.require_valid = settings.CASCADE_REQUIRE_VALID if require_valid is None else require_valid
+        self.scorer = scorer
+        self.deduper = deduper
+        self.stats = {RULE_TIER: TierStats(), LLM_TIER: TierStats()}
+        if deduper is not None:
+            self.stats[DUPLICATE_TIER] = TierStats()
+
+    def process(self, message: str, seller_id: Optional[str] = None, label: Optional[Dict[str, Any]] = None,
+                sender: Optional[str] = None, received_at: Optional[datetime] = None) -> CascadeResult:
+        started = time.perf_counter()
+        seen = None
+        if self.deduper is not None and sender is not None:
+            seen = self.deduper.check(sender, message, received_at)
+            if seen.is_duplicate and seen.duplicate_of.value is not None:
+                original = seen.duplicate_of.value
+                latency = time.perf_counter() - started
+                score = self.scorer(original.order, label) if label is not None else None
+                self.stats[DUPLICATE_TIER].add(latency, score)
+                return replace(original, tier=DUPLICATE_TIER, latency=latency, response=None, score=score)
+
+        parsed = self.rule_agent.parse_order(message, seller_id)
+        validation = self.rule_agent.validate_order(parsed)
+        order = self.rule_agent.to_label(parsed)
+        issues = validation["issues"]
+        ungrounded = ungrounded_items(self.rule_agent.index, message, parsed.items)
+        if ungrounded:
+            issues = issues + [f"Product not named in the message: {', '.join(ungrounded)}"]
+
+        if not ungrounded and accepts(parsed.confidence, validation["is_valid"], self.min_confidence, self.require_valid):
+            tier, response = RULE_TIER, None
+        else:
+            tier, response = LLM_TIER, None
+            if self.llm_factory is not None:
+                order, response = self._escalate(message, seller_id, order, issues)
+
+        latency = time.perf_counter() - started
+        score = self.scorer(order, label) if label is not None else None
+        self.stats[tier].add(latency, score)
+        result = CascadeResult(tier, order, parsed.confidence, issues, latency, response, score)
+        if seen is not None and seen.entry is not None:
+            seen.entry.value = result
+        return result
+
+    def _escalate(self, message: str, seller_id: Optional[str], order: Dict[str, Any], issues: List[str]):
+        """Model tier: record the rule-tier customer fields, then let the model read the message with the seed line."""
+        llm = self.llm_factory(seller_id)
+        seed = {field: order[field] for field in SEED_FIELDS if order.get(field)}
+        if seed:
+            llm.update_order_state(**seed)
+        response = llm.query(message, context=seed_line(order, issues))
+        return json.loads(llm.get_current_order()), response
+
+    def report(self) -> Dict[str, Any]:
+        total = sum(len(s.latencies) for s in self.stats.values())
+        return {
+            "messages": total,
+            "min_confidence": self.min_confidence,
+            "require_valid": self.require_valid,
+            "escalation_rate": len(self.stats[LLM_TIER].latencies) / total if total else 0.0,
+            "tiers": {tier: stats.summary(total) for tier, stats in self.stats.items()}
+        }
+
+
+def _print_report(report: Dict[str, Any], escalated_label: str):
+    print(f"threshold {report['min_confidence']:.2f} (require_valid={report['require_valid']}): "
+          f"{report['messages']} messages, escalation rate {report['escalation_rate']:.1%}")
+    for tier, s in report["tiers"].items():
+        name = {RULE_TIER: "rule (accepted)", DUPLICATE_TIER: "duplicate (reused)"}.get(tier, escalated_label)
+        if not s["count"]:
+            print(f"  {name:<28} 0")
+            continue
+        accuracy = f"{s['accuracy']:.1%}" if s["accuracy"] is not None else "-"
+        print(f"  {name:<28} {s['count']:>5} ({s['share']:.0%})  mean {s['mean_ms']:,.2f}ms  "
+              f"p95 {s['p95_ms']:,.2f}ms  accuracy {accuracy}")
+
+
+class _LLMFactory:
+    """
+    One TextOrderAgent reused across messages: guide swapped and state reset per message (as in test_agent).
+    No session journal, so replayed messages never write over a live session. The guide is written to
+    one temp file outside GUIDES_DIR (the guide registry would load it as a seller); close() deletes it.
+    """
+    def __init__(self, guides: Dict[str, str]):
+        from agent_engine import TextOrderAgent
+        self.guides = guides
+        self.agent = TextOrderAgent(use_journal=False)
+        fd, self.path = tempfile.mkstemp(prefix="cascade_guide_", suffix=".txt")
+        os.close(fd)
+
+    def __call__(self, seller_id: Optional[str]):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(self.guides[seller_id])
+        self.agent.update_guide(guide_path=self.path)
+        self.agent.reset_state()
+        return self.agent
+
+    def close(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rule-tier → model-tier order cascade on the validation CSV")
+    parser.add_argument("--dataset", default=VALIDATION_PATH, help="validation CSV (no, guide, order, label)")
+    parser.add_argument("--limit", type=int, default=None, help="number of cases")
+    parser.add_argument("--threshold", type=float, default=settings.CASCADE_MIN_CONFIDENCE, help="rule-tier confidence to accept")
+    parser.add_argument("--thresholds", type=float, nargs="*", help="sweep several thresholds (rule tier only, no model calls)")
+    parser.add_argument("--allow-invalid", action="store_true", help="accept rule-tier results that fail validate_order")
+    parser.add_argument("--llm", action="store_true", help="escalate to TextOrderAgent (model calls)")
+    args = parser.parse_args()
+
+    from order_dataset import iter_validation_cases
+    cases = list(islice(iter_validation_cases(args.dataset), args.limit))
+    rule_agent = SMSOrderAgent()
+    for case in cases:
+        rule_agent.load_seller_guide(case.guide, seller_id=str(case.no))
+
+    factory = _LLMFactory({str(case.no): case.guide for case in cases}) if args.llm else None
+
+    # Without --llm the routing is replayed per threshold; escalated messages keep the rule-tier order
+    thresholds = args.thresholds or [args.threshold]
+    try:
+        for threshold in thresholds:
+            cascade = OrderCascade(rule_agent, factory if len(thresholds) == 1 else None,
+                                   min_confidence=threshold, require_valid=not args.allow_invalid)
+            for case in cases:
+                cascade.process(case.order, str(case.no), case.label_data)
+            _print_report(cascade.report(), "llm (escalated)" if cascade.llm_factory else "escalated (rule output)")
+    finally:
+        if factory is not None:
+            factory.close()
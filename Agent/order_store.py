@@ -0,0 +1,310 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Order lifecycle (the first two mirror TextOrderAgent.interaction_state)
+STATUS_AWAITING_PAYMENT = "AWAITING_PAYMENT_PROOF"
+STATUS_AWAITING_APPROVAL = "AWAITING_SELLER_APPROVAL"
+STATUS_PAID = "PAYMENT_CONFIRMED"
+STATUS_REJECTED = "PAYMENT_REJECTED"
+STATUS_CANCELLED = "CANCELLED"
+
+# Header columns stored as-is from the agent's order dict
+HEADER_FIELDS = [
+    "customer_name", "contact_number", "delivery_address", "desired_delivery_date",
+    "special_requests", "order_date"
+]
+ITEM_FIELDS = ["product_name", "quantity", "unit", "unit_price", "subtotal"]
+
+# SQLite limits the number of bound parameters per statement
+_IN_CHUNK = 500
+
+
+class OrderStore:
+    """
+    Persistent order repository backed by SQLite (WAL mode).
+    Stores the order header, item lines, payment info and every status transition,
+    indexed by status, contact number, seller/guide and creation time so a seller's
+    order list is an index range scan. Listing uses keyset pagination on
+    (created_at, order_id), which stays fast at any page depth.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS orders ("
+            " order_id TEXT PRIMARY KEY,"
+            " seller_id TEXT,"
+            " guide_name TEXT,"
+            " session_id TEXT,"
+            " status TEXT NOT NULL,"
+            " customer_name TEXT,"
+            " contact_number TEXT,"
+            " delivery_address TEXT,"
+            " desired_delivery_date TEXT,"
+            " special_requests TEXT,"
+            " order_date TEXT,"
+            " expected_amount INTEGER,"
+            " payment_info TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS order_items ("
+            " order_id TEXT NOT NULL REFERENCES orders(order_id) ON DELETE CASCADE,"
+            " line_no INTEGER NOT NULL,"
+            " product_name TEXT,"
+            " quantity INTEGER,"
+            " unit TEXT,"
+            " unit_price INTEGER,"
+            " subtotal INTEGER,"
+            " PRIMARY KEY (order_id, line_no));"
+            "CREATE TABLE IF NOT EXISTS order_transitions ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " order_id TEXT NOT NULL REFERENCES orders(order_id) ON DELETE CASCADE,"
+            " from_status TEXT,"
+            " to_status TEXT NOT NULL,"
+            " note TEXT,"
+            " at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status, created_at);"
+            "CREATE INDEX IF NOT EXISTS idx_orders_contact ON orders(contact_number, created_at);"
+            "CREATE INDEX IF NOT EXISTS idx_orders_seller ON orders(seller_id, created_at);"
+            "CREATE INDEX IF NOT EXISTS idx_orders_guide ON orders(guide_name, created_at);"
+            "CREATE INDEX IF NOT EXISTS idx_orders_created ON orders(created_at);"
+            "CREATE INDEX IF NOT EXISTS idx_transitions_order ON order_transitions(order_id, at);"
+        )
+        self._conn.commit()
+
+    # ----- Writes -----
+
+    def save_order(self, order: Dict[str, Any]):
+        """Inserts or updates one order. See save_orders for the expected keys."""
+        self.save_orders([order])
+
+    def save_orders(self, orders: Iterable[Dict[str, Any]], note: str = None) -> int:
+        """
+        Bulk upsert in a single transaction.
+        Each order is the agent's order dict plus 'order_id' and 'status' (and optionally
+        'seller_id', 'guide_name', 'session_id', 'created_at'). Item lines are replaced;
+        a status change is recorded as a transition. Returns the number of orders written.
+        """
+        orders = list(orders)
+        if not orders:
+            return 0
+        now = time.time()
+        with self._lock, self._conn:
+            previous = self._current_statuses([o["order_id"] for o in orders])
+
+            header_rows, item_rows, transition_rows = [], [], []
+            for o in orders:
+                order_id, status = o["order_id"], o["status"]
+                payment_info = o.get("payment_info")
+                header_rows.append((
+                    order_id, o.get("seller_id"), o.get("guide_name"), o.get("session_id"), status,
+                    *[_text(o.get(field)) for field in HEADER_FIELDS],
+                    _int(o.get("expected_amount")),
+                    json.dumps(payment_info, ensure_ascii=False) if payment_info is not None else None,
+                    o.get("created_at") or now, now
+                ))
+                for line_no, item in enumerate(o.get("items") or []):
+                    item_rows.append((
+                        order_id, line_no, item.get("product_name"), _int(item.get("quantity")),
+                        item.get("unit"), _int(item.get("unit_price")), _int(item.get("subtotal"))
+                    ))
+                if previous.get(order_id) != status:
+                    transition_rows.append((order_id, previous.get(order_id), status, note, now))
+
+            # created_at is kept from the first insert; everything else is overwritten.
+            self._conn.executemany(
+                "INSERT INTO orders (order_id, seller_id, guide_name, session_id, status, "
+                + ", ".join(HEADER_FIELDS) + ", expected_amount, payment_info, created_at, updated_at) "
+                "VALUES (" + ", ".join("?" * (len(HEADER_FIELDS) + 9)) + ") "
+                "ON CONFLICT(order_id) DO UPDATE SET "
+                "seller_id = excluded.seller_id, guide_name = excluded.guide_name, session_id = excluded.session_id, "
+                "status = excluded.status, "
+                + ", ".join(f"{field} = excluded.{field}" for field in HEADER_FIELDS) + ", "
+                "expected_amount = excluded.expected_amount, payment_info = excluded.payment_info, "
+                "updated_at = excluded.updated_at",
+                header_rows
+            )
+            self._conn.executemany("DELETE FROM order_items WHERE order_id = ?", [(o["order_id"],) for o in orders])
+            self._conn.executemany("INSERT INTO order_items VALUES (?, ?, ?, ?, ?, ?, ?)", item_rows)
+            self._conn.executemany(
+                "INSERT INTO order_transitions (order_id, from_status, to_status, note, at) VALUES (?, ?, ?, ?, ?)",
+                transition_rows
+            )
+        return len(orders)
+
+    def update_status(self, order_id: str, status: str, note: str = None) -> bool:
+        return self.update_statuses([order_id], status, note) == 1
+
+    def update_statuses(self, order_ids: Iterable[str], status: str, note: str = None) -> int:
+        """Moves many orders to one status (e.g. bulk shipping) and records the transitions."""
+        order_ids = list(order_ids)
+        now = time.time()
+        with self._lock, self._conn:
+            previous = self._current_statuses(order_ids)
+            changed = [order_id for order_id, old in previous.items() if old != status]
+            self._conn.executemany(
+                "UPDATE orders SET status = ?, updated_at = ? WHERE order_id = ?",
+                [(status, now, order_id) for order_id in changed]
+            )
+            self._conn.executemany(
+                "INSERT INTO order_transitions (order_id, from_status, to_status, note, at) VALUES (?, ?, ?, ?, ?)",
+                [(order_id, previous[order_id], status, note, now) for order_id in changed]
+            )
+        return len(changed)
+
+    def _current_statuses(self, order_ids: List[str]) -> Dict[str, str]:
+        statuses = {}
+        for i in range(0, len(order_ids), _IN_CHUNK):
+            chunk = order_ids[i:i + _IN_CHUNK]
+            rows = self._conn.execute(
+                f"SELECT order_id, status FROM orders WHERE order_id IN ({', '.join('?' * len(chunk))})", chunk
+            )
+            statuses.update((row["order_id"], row["status"]) for row in rows)
+        return statuses
+
+    # ----- Reads -----
+
+    def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Full order: header, items, payment info and transition history."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM orders WHERE order_id = ?", (order_id,)).fetchone()
+            if row is None:
+                return None
+            order = _row_to_order(row)
+            order["items"] = self._items_for([order_id]).get(order_id, [])
+            order["transitions"] = [
+                dict(t) for t in self._conn.execute(
+                    "SELECT from_status, to_status, note, at FROM order_transitions WHERE order_id = ? ORDER BY id",
+                    (order_id,)
+                )
+            ]
+        return order
+
+    def list_orders(
+        self,
+        status: str = None,
+        contact_number: str = None,
+        seller_id: str = None,
+        guide_name: str = None,
+        created_from: float = None,
+        created_to: float = None,
+        limit: int = 50,
+        cursor: Tuple[float, str] = None,
+        include_items: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Newest-first page of orders matching the filters.
+        Pass the returned 'next_cursor' back as 'cursor' to get the following page
+        ('next_cursor' is None on the last page).
+        """
+        where, params = self._filters(status, contact_number, seller_id, guide_name, created_from, created_to)
+        if cursor:
+            where.append("(created_at, order_id) < (?, ?)")
+            params.extend(cursor)
+        sql = "SELECT * FROM orders"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC, order_id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            has_more = len(rows) > limit
+            orders = [_row_to_order(row) for row in rows[:limit]]
+            if include_items and orders:
+                items = self._items_for([o["order_id"] for o in orders])
+                for o in orders:
+                    o["items"] = items.get(o["order_id"], [])
+
+        next_cursor = (orders[-1]["created_at"], orders[-1]["order_id"]) if has_more else None
+        return {"orders": orders, "next_cursor": next_cursor}
+
+    def count_orders(self, status: str = None, contact_number: str = None, seller_id: str = None,
+                     guide_name: str = None, created_from: float = None, created_to: float = None) -> int:
+        where, params = self._filters(status, contact_number, seller_id, guide_name, created_from, created_to)
+        sql = "SELECT COUNT(*) FROM orders" + (" WHERE " + " AND ".join(where) if where else "")
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    @staticmethod
+    def _filters(status, contact_number, seller_id, guide_name, created_from, created_to):
+        where, params = [], []
+        for column, value in (("status", status), ("contact_number", contact_number),
+                              ("seller_id", seller_id), ("guide_name", guide_name)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if created_from is not None:
+            where.append("created_at >= ?")
+            params.append(created_from)
+        if created_to is not None:
+            where.append("created_at < ?")
+            params.append(created_to)
+        return where, params
+
+    def _items_for(self, order_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        items: Dict[str, List[Dict[str, Any]]] = {}
+        for i in range(0, len(order_ids), _IN_CHUNK):
+            chunk = order_ids[i:i + _IN_CHUNK]
+            rows = self._conn.execute(
+                f"SELECT * FROM order_items WHERE order_id IN ({', '.join('?' * len(chunk))}) ORDER BY order_id, line_no",
+                chunk
+            )
+            for row in rows:
+                items.setdefault(row["order_id"], []).append({field: row[field] for field in ITEM_FIELDS})
+        return items
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _row_to_order(row: sqlite3.Row) -> Dict[str, Any]:
+    order = dict(row)
+    if order.get("payment_info"):
+        order["payment_info"] = json.loads(order["payment_info"])
+    return order
+
+
+def _int(value) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(str(value).replace(",", "").replace("원", ""))
+    except ValueError:
+        return None
+
+
+def _text(value) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+_stores: Dict[str, OrderStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_order_store(db_path: str) -> OrderStore:
+    """Process-wide store per database file, shared by all agent sessions."""
+    key = os.path.abspath(db_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = OrderStore(db_path)
+            _stores[key] = store
+        return store
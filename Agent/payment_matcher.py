@@ -0,0 +1,180 @@
+import re
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+
+# Match statuses
+CONFIRMED = "confirmed"   # Exactly one pending order matches amount, name and time window
+AMBIGUOUS = "ambiguous"   # Several candidates, or amount matches but the name does not
+UNMATCHED = "unmatched"   # No pending order with this amount in the time window
+
+
+class PendingOrder(NamedTuple):
+    order_id: str
+    expected_amount: int
+    name_keys: frozenset
+    created_at: datetime
+    order: Dict[str, Any]
+
+
+class MatchResult(NamedTuple):
+    status: str
+    order_id: Optional[str]
+    candidates: List[str]
+    reason: str
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """'홍길동 님' / '홍 길동(국민)' -> '홍길동'"""
+    if not name:
+        return ""
+    name = re.sub(r"\([^)]*\)", "", str(name))
+    name = re.sub(r"[^0-9a-zA-Z가-힣]", "", name)
+    return re.sub(r"님$", "", name)
+
+
+def parse_amount(value) -> Optional[int]:
+    """'232,769원' -> 232769"""
+    if value is None:
+        return None
+    digits = re.sub(r"\D", "", str(value))
+    return int(digits) if digits else None
+
+
+def parse_transfer_time(ocr_result: Dict[str, Any]) -> Optional[datetime]:
+    date, time = ocr_result.get("date"), ocr_result.get("time")
+    if not date:
+        return None
+    try:
+        return datetime.strptime(f"{date} {time or '00:00:00'}"[:19], "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        try:
+            return datetime.strptime(str(date)[:10], "%Y-%m-%d")
+        except ValueError:
+            return None
+
+
+class PaymentMatcher:
+    """
+    Matches OCR'd payment receipts against all orders awaiting payment.
+    Pending orders are indexed by expected amount and by normalized customer/depositor name,
+    so an incoming receipt resolves to its candidates with dictionary lookups instead of
+    a scan over every order. Exact unique matches are confirmed automatically; everything
+    else is queued for the seller (the most recent 'review_limit' receipts, see reviews()).
+    """
+    def __init__(self, window: timedelta = timedelta(hours=72), review_limit: int = 1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._orders: Dict[str, PendingOrder] = {}
+        self._by_amount: Dict[int, Set[str]] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        self._review_queue = deque(maxlen=review_limit)  # (ocr_result, MatchResult) pairs awaiting the seller
+
+    def add_order(self, order_id: str, order: Dict[str, Any], created_at: datetime = None):
+        """Registers an order in AWAITING_PAYMENT_PROOF. 'order' is the agent's order dict."""
+        amount = parse_amount(order.get("expected_amount")) or 0
+        # The depositor can be the customer or a separately stated payer (입금자명).
+        names = {normalize_name(order.get("customer_name")), normalize_name(order.get("payment_info"))
+                 if isinstance(order.get("payment_info"), str) else ""}
+        names.discard("")
+        pending = PendingOrder(order_id, amount, frozenset(names), created_at or datetime.now(), order)
+
+        with self._lock:
+            self._remove_locked(order_id)
+            self._orders[order_id] = pending
+            self._by_amount.setdefault(amount, set()).add(order_id)
+            for key in pending.name_keys:
+                self._by_name.setdefault(key, set()).add(order_id)
+
+    def remove_order(self, order_id: str):
+        with self._lock:
+            self._remove_locked(order_id)
+
+    def _remove_locked(self, order_id: str):
+        pending = self._orders.pop(order_id, None)
+        if pending is None:
+            return
+        self._discard(self._by_amount, pending.expected_amount, order_id)
+        for key in pending.name_keys:
+            self._discard(self._by_name, key, order_id)
+
+    @staticmethod
+    def _discard(index: Dict, key, order_id: str):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(order_id)
+            if not ids:
+                del index[key]
+
+    def match(self, ocr_result: Dict[str, Any], order_id: Optional[str] = None,
+              received_at: datetime = None) -> MatchResult:
+        """
+        Resolves a receipt to a pending order.
+        A unique match on amount + name within the time window is confirmed and removed
+        from the pending set; any other outcome is appended to the review queue.
+        'order_id' is the order of the session that received the receipt: a unique match on a
+        different order is not confirmed here (AMBIGUOUS, pending set unchanged), so that order
+        stays matchable by its own session and the seller reviews the receipt.
+        """
+        amount = parse_amount(ocr_result.get("amount"))
+        sender = normalize_name(ocr_result.get("sender_name"))
+        paid_at = parse_transfer_time(ocr_result) or received_at or datetime.now()
+
+        with self._lock:
+            candidates = [
+                candidate_id for candidate_id in self._by_amount.get(amount, ())
+                if self._in_window(self._orders[candidate_id], paid_at)
+            ]
+            if not candidates:
+                result = MatchResult(UNMATCHED, None, [], f"No pending order for amount {amount}")
+            else:
+                named = [candidate_id for candidate_id in candidates if candidate_id in self._by_name.get(sender, ())] if sender else []
+                if len(named) == 1 and order_id is not None and named[0] != order_id:
+                    result = MatchResult(AMBIGUOUS, named[0], sorted(candidates),
+                                         f"Amount and name match another pending order than {order_id}")
+                elif len(named) == 1:
+                    result = MatchResult(CONFIRMED, named[0], sorted(candidates), "Unique amount and name match")
+                    self._remove_locked(named[0])
+                elif len(named) > 1:
+                    result = MatchResult(AMBIGUOUS, None, sorted(named), "Several orders match amount and name")
+                else:
+                    result = MatchResult(AMBIGUOUS, candidates[0] if len(candidates) == 1 else None,
+                                         sorted(candidates), "Amount matches but depositor name does not")
+
+            if result.status != CONFIRMED:
+                self._review_queue.append((ocr_result, result))
+        return result
+
+    def reviews(self) -> List[Dict[str, Any]]:
+        """Receipts awaiting the seller, oldest first (receipt + match status/reason/candidates)."""
+        with self._lock:
+            return [{"receipt": ocr_result, **result._asdict()} for ocr_result, result in self._review_queue]
+
+    def take_reviews(self) -> List[Dict[str, Any]]:
+        """Like reviews(), but removes the returned entries from the queue."""
+        with self._lock:
+            entries = [{"receipt": ocr_result, **result._asdict()} for ocr_result, result in self._review_queue]
+            self._review_queue.clear()
+        return entries
+
+    def _in_window(self, pending: PendingOrder, paid_at: datetime) -> bool:
+        # Receipt timestamps only have second precision and clocks drift; allow a small lead.
+        return pending.created_at - timedelta(minutes=10) <= paid_at <= pending.created_at + self.window
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._orders)
+
+
+_matcher: Optional[PaymentMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher(window_hours: int = 72) -> PaymentMatcher:
+    """Process-wide matcher shared by all agent sessions."""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = PaymentMatcher(window=timedelta(hours=window_hours))
+        return _matcher
@@ -4,6 +4,7 @@ import json
 import re
 from config import settings
 from typing import List, Dict, Any
+from rule_engine import price_items
 
 class PriceVerifier:
     """
@@ -34,6 +35,14 @@ class PriceVerifier:
                 "reasoning": "No items provided."
             }
 
+        # Fast path: every item resolves to exactly one product/option in the guide -> no model call
+        if settings.PRODUCT_INDEX_FAST_PATH:
+            local_result = price_items(store_guide, items)
+            if local_result is not None:
+                if settings.DEBUG:
+                    print(f"[PriceVerifier] Priced locally: {local_result['final_total']:,}")
+                return local_result
+
         prompt = (
             "You are a Strict Price Verification Auditor. Your goal is to calculate the EXACT total price for an order based on the provided Store Guide.\n"
             "Do not guess. Match product names and units exactly.\n\n"
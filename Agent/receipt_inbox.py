@@ -0,0 +1,283 @@
+import ctypes
+import ctypes.util
+import hashlib
+import heapq
+import os
+import struct
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+# Uploaded receipts may be saved as "<session_id>__<original name>" to tie them to a chat session.
+SESSION_SEPARATOR = "__"
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".heic")
+
+# inotify constants (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE = 0x00000200
+_IN_MOVED_FROM = 0x00000040
+_IN_NONBLOCK = 0x00000800
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class ReceiptRecord(NamedTuple):
+    mtime: float
+    path: str
+    size: int
+    sha256: str
+    session_id: str
+
+
+class ReceiptInbox:
+    """
+    In-memory index of the receipt image folder.
+    A background watcher (inotify on Linux, polling elsewhere) records each new file once
+    with its mtime, size, content hash and sender session, so "latest receipt for this
+    session" is the top of a per-session max-heap on mtime instead of a directory scan
+    per request. Removed or re-indexed files leave stale heap entries that are dropped
+    lazily when they reach the top (or when a heap grows to twice its live size).
+    """
+    def __init__(self, root_dir: str, poll_interval: float = 1.0):
+        self.root_dir = os.path.abspath(root_dir)
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._by_path: Dict[str, ReceiptRecord] = {}
+        self._by_session: Dict[str, List[tuple]] = {}  # session_id -> heap [(-mtime, path)]
+        self._session_counts: Dict[str, int] = {}      # session_id -> live receipts in its heap
+        self._all: List[tuple] = []                    # every receipt, heap [(-mtime, path)]
+        self._by_hash: Dict[str, List[str]] = {}
+        self._session_hints: Dict[str, str] = {}  # file name -> session_id (registered before the file lands)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.mode = None
+
+    # ----- Indexing -----
+
+    def add(self, path: str, session_id: str = None) -> Optional[ReceiptRecord]:
+        """Indexes (or re-indexes) one file. Returns None if it is not a readable image."""
+        path = os.path.abspath(path)
+        if not path.lower().endswith(IMAGE_EXTENSIONS):
+            return None
+        try:
+            stat = os.stat(path)
+            digest = _file_sha256(path)
+        except OSError:
+            return None
+
+        name = os.path.basename(path)
+        if session_id is None:
+            with self._lock:
+                session_id = self._session_hints.pop(name, None)
+        if session_id is None and SESSION_SEPARATOR in name:
+            session_id = name.split(SESSION_SEPARATOR, 1)[0]
+
+        record = ReceiptRecord(stat.st_mtime, path, stat.st_size, digest, session_id or "")
+        with self._lock:
+            self._remove_locked(path)
+            self._by_path[path] = record
+            heapq.heappush(self._by_session.setdefault(record.session_id, []), (-record.mtime, path))
+            heapq.heappush(self._all, (-record.mtime, path))
+            self._session_counts[record.session_id] = self._session_counts.get(record.session_id, 0) + 1
+            self._by_hash.setdefault(digest, []).append(path)
+        return record
+
+    def remove(self, path: str):
+        with self._lock:
+            self._remove_locked(os.path.abspath(path))
+
+    def _remove_locked(self, path: str):
+        record = self._by_path.pop(path, None)
+        if record is None:
+            return
+        # Heap entries are left in place and skipped by _top_locked.
+        live = self._session_counts[record.session_id] - 1
+        if live:
+            self._session_counts[record.session_id] = live
+            self._compact_locked(self._by_session[record.session_id], live, record.session_id)
+        else:
+            del self._session_counts[record.session_id]
+            del self._by_session[record.session_id]
+        self._compact_locked(self._all, len(self._by_path))
+        paths = self._by_hash.get(record.sha256, [])
+        if path in paths:
+            paths.remove(path)
+            if not paths:
+                del self._by_hash[record.sha256]
+
+    def _is_live(self, entry: tuple, session_id: str = None) -> bool:
+        record = self._by_path.get(entry[1])
+        return (record is not None and record.mtime == -entry[0]
+                and (session_id is None or record.session_id == session_id))
+
+    def _top_locked(self, heap: List[tuple], session_id: str = None) -> Optional[tuple]:
+        """Newest live (-mtime, path) entry of a heap, popping stale ones on the way."""
+        while heap and not self._is_live(heap[0], session_id):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _compact_locked(self, heap: List[tuple], live: int, session_id: str = None):
+        """Rebuilds a heap in place once stale entries outnumber live ones."""
+        if len(heap) > 2 * live + 16:
+            heap[:] = [entry for entry in heap if self._is_live(entry, session_id)]
+            heapq.heapify(heap)
+
+    def expect(self, file_name: str, session_id: str):
+        """Registers the session of a file that is about to be written (e.g. by an upload handler)."""
+        with self._lock:
+            self._session_hints[file_name] = session_id
+
+    # ----- Lookups -----
+
+    def latest(self, session_id: str = None, since: float = None) -> Optional[ReceiptRecord]:
+        """
+        Most recent receipt for the session (or across all sessions if session_id is None).
+        If 'since' is given, only receipts modified at or after that timestamp are considered.
+        """
+        with self._lock:
+            heap = self._all if session_id is None else self._by_session.get(session_id)
+            top = self._top_locked(heap, session_id) if heap else None
+            if top is None:
+                return None
+            mtime, path = -top[0], top[1]
+            if since is not None and mtime < since:
+                return None
+            return self._by_path[path]
+
+    def find_by_hash(self, sha256: str) -> List[ReceiptRecord]:
+        """All indexed receipts with the given content hash (e.g. the same screenshot re-sent)."""
+        with self._lock:
+            return [self._by_path[p] for p in self._by_hash.get(sha256, [])]
+
+    def get(self, path: str) -> Optional[ReceiptRecord]:
+        with self._lock:
+            return self._by_path.get(os.path.abspath(path))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._by_path)
+
+    # ----- Watching -----
+
+    def start(self):
+        """Indexes the existing files once, then watches the folder in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._scan()
+
+        inotify_fd = _inotify_open(self.root_dir)
+        if inotify_fd is not None:
+            self.mode = "inotify"
+            target = self._watch_inotify
+            args = (inotify_fd,)
+        else:
+            self.mode = "polling"
+            target = self._watch_polling
+            args = ()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=target, args=args, name="receipt-inbox", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval * 2)
+
+    def _scan(self):
+        """Indexes new or changed files in the folder (used at startup and by the polling watcher)."""
+        seen = set()
+        try:
+            entries = list(os.scandir(self.root_dir))
+        except OSError:
+            return
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            path = os.path.abspath(entry.path)
+            seen.add(path)
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            record = self.get(path)
+            if record is None or record.mtime != stat.st_mtime or record.size != stat.st_size:
+                self.add(path)
+        with self._lock:
+            removed = [p for p in self._by_path if p not in seen]
+        for path in removed:
+            self.remove(path)
+
+    def _watch_polling(self):
+        while not self._stop.wait(self.poll_interval):
+            self._scan()
+
+    def _watch_inotify(self, fd: int):
+        import select
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd], [], [], self.poll_interval)
+                if not ready:
+                    continue
+                try:
+                    data = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                offset = 0
+                while offset + _EVENT_HEADER.size <= len(data):
+                    _, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                    name = data[offset + _EVENT_HEADER.size: offset + _EVENT_HEADER.size + name_len].rstrip(b"\0").decode("utf-8", "replace")
+                    offset += _EVENT_HEADER.size + name_len
+                    if not name:
+                        continue
+                    path = os.path.join(self.root_dir, name)
+                    if mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+                        self.add(path)
+                    elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                        self.remove(path)
+        finally:
+            os.close(fd)
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _inotify_open(directory: str) -> Optional[int]:
+    """Returns an inotify fd watching the directory, or None if inotify is unavailable."""
+    libc_name = ctypes.util.find_library("c")
+    if not libc_name:
+        return None
+    try:
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK)
+        if fd < 0:
+            return None
+        mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_DELETE | _IN_MOVED_FROM
+        if libc.inotify_add_watch(fd, directory.encode("utf-8"), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (AttributeError, OSError):
+        return None
+
+
+_inboxes: Dict[str, ReceiptInbox] = {}
+_inboxes_lock = threading.Lock()
+
+
+def get_inbox(root_dir: str) -> ReceiptInbox:
+    """Process-wide inbox per folder, shared by all agent sessions. Started on first use."""
+    key = os.path.abspath(root_dir)
+    with _inboxes_lock:
+        inbox = _inboxes.get(key)
+        if inbox is None:
+            inbox = ReceiptInbox(key)
+            inbox.start()
+            _inboxes[key] = inbox
+        return inbox
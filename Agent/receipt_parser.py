@@ -0,0 +1,245 @@
+import io
+import re
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+try:
+    import pytesseract
+    from PIL import Image, ImageOps
+except ImportError:  # Local OCR is optional; OCRManager falls back to the model.
+    pytesseract = None
+
+RECEIPT_FIELDS = [
+    "sender_name", "sender_bank", "receiver_bank", "receiver_account",
+    "receiver_owner", "amount", "date", "time"
+]
+
+KNOWN_BANKS = [
+    "카카오뱅크", "토스뱅크", "케이뱅크", "농협", "국민", "신한", "우리", "하나", "기업",
+    "새마을", "우체국", "SC제일", "씨티", "대구", "부산", "경남", "광주", "전북", "수협", "신협", "산업"
+]
+
+# Weight of each field in the confidence score. Fields not listed do not affect confidence.
+CONFIDENCE_WEIGHTS = {
+    "amount": 0.35,
+    "sender_name": 0.2,
+    "receiver_account": 0.2,
+    "date": 0.15,
+    "time": 0.1,
+}
+
+
+def _label(text: str) -> str:
+    """Regex for a Korean label that tolerates the spaces OCR engines insert between syllables."""
+    return r"\s*".join(re.escape(ch) for ch in text if not ch.isspace())
+
+
+# Transfer amount next to its label. Any other "N원" on the screen (balance, fee, limit) is only
+# a fallback: it is returned but never counts towards confidence, so the model re-reads it.
+_AMOUNT_LABELLED = rf"(?:{'|'.join(_label(label) for label in ('이체금액', '보낸금액', '출금액'))})\s*[:：]?\s*(?P<v>[\d, ]+)\s*원"
+_AMOUNT_FALLBACK = r"(?P<v>[\d, ]{3,})\s*원"
+
+
+# Per-layout templates. Each field lists regexes tried in order against the full OCR text;
+# the value is taken from the named group 'v'. 'markers' identify the layout. Patterns in
+# 'fallbacks' are tried last and their values do not count towards confidence.
+BANK_TEMPLATES: List[Dict[str, Any]] = [
+    {
+        # 송금 완료 화면: 받는분 / 계좌 / 보낸분 / 날짜 / 시간 (Toss, 신한 SOL, etc.)
+        "name": "transfer_complete",
+        "markers": ["송금완료", "보낸분", "받는분"],
+        "fields": {
+            "receiver_owner": [rf"{_label('받는분')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "receiver_account": [rf"{_label('계좌')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "sender_name": [rf"{_label('보낸분')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "date": [rf"{_label('날짜')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "time": [rf"{_label('시간')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "amount": [_AMOUNT_LABELLED],
+        },
+        "fallbacks": {"amount": [_AMOUNT_FALLBACK]},
+    },
+    {
+        # 이체 결과 화면: 입금계좌 / 받는분 / 이체금액 / 출금계좌 / 이체일시 (KB, 우리 WON, etc.)
+        "name": "transfer_result",
+        "markers": ["이체결과", "이체완료", "이체금액", "입금계좌"],
+        "fields": {
+            "receiver_owner": [rf"{_label('받는분')}(?:\s*{_label('통장표시')})?\s*[:：]?\s*(?P<v>[^\n]+)",
+                               rf"{_label('예금주')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "receiver_account": [rf"{_label('입금계좌')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "sender_name": [rf"{_label('보내는분')}\s*[:：]?\s*(?P<v>[^\n]+)",
+                            rf"{_label('입금자명')}\s*[:：]?\s*(?P<v>[^\n]+)",
+                            rf"{_label('내통장표시')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "sender_bank": [rf"{_label('출금계좌')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "date": [rf"{_label('이체일시')}\s*[:：]?\s*(?P<v>[^\n]+)",
+                     rf"{_label('이체일자')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "time": [rf"{_label('이체일시')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "amount": [_AMOUNT_LABELLED],
+        },
+        "fallbacks": {"amount": [_AMOUNT_FALLBACK]},
+    },
+    {
+        # 카카오뱅크 이체 완료: 받는 분 / 보낸 분 / 입금 은행 / 계좌번호 / 이체 일시
+        "name": "kakaobank",
+        "markers": ["카카오뱅크", "이체완료"],
+        "fields": {
+            "receiver_owner": [rf"{_label('받는분')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "receiver_account": [rf"{_label('계좌번호')}\s*[:：]?\s*(?P<v>[^\n]+)",
+                                 rf"{_label('입금은행')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "sender_name": [rf"{_label('보낸분')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "date": [rf"{_label('이체일시')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "time": [rf"{_label('이체일시')}\s*[:：]?\s*(?P<v>[^\n]+)"],
+            "amount": [_AMOUNT_LABELLED],
+        },
+        "fallbacks": {"amount": [_AMOUNT_FALLBACK]},
+    },
+]
+
+for _template in BANK_TEMPLATES:
+    _template["compiled"] = {
+        field: [re.compile(p) for p in patterns] for field, patterns in _template["fields"].items()
+    }
+    _template["compiled_fallbacks"] = {
+        field: [re.compile(p) for p in patterns] for field, patterns in _template.get("fallbacks", {}).items()
+    }
+
+
+class LocalReceiptParser:
+    """
+    Fast local parser for bank-app transfer screenshots.
+    Extracts text with Tesseract (pytesseract) and applies per-layout regex templates.
+    Returns the same JSON schema as OCRManager plus a 'confidence' score (0.0 - 1.0),
+    so callers can fall back to the OCR model when the local result is uncertain.
+    """
+    def __init__(self, lang: str = "kor+eng"):
+        self.lang = lang
+
+    @staticmethod
+    def is_available() -> bool:
+        if pytesseract is None:
+            return False
+        try:
+            pytesseract.get_tesseract_version()
+            return True
+        except Exception:
+            return False
+
+    def extract_text(self, image_bytes: bytes) -> str:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            img = ImageOps.exif_transpose(img).convert("L")
+            # Tesseract reads small UI text much better at ~2x phone resolution.
+            if img.width < 1000:
+                img = img.resize((img.width * 2, img.height * 2), Image.LANCZOS)
+            # Light text on dark app backgrounds is inverted so text is always dark.
+            if sum(img.resize((1, 1)).getdata()) < 128:
+                img = ImageOps.invert(img)
+            return pytesseract.image_to_string(img, lang=self.lang, config="--psm 6")
+
+    def parse_image(self, image_bytes: bytes) -> Optional[Dict[str, Any]]:
+        """Returns the parsed result, or None if local OCR is unavailable or fails."""
+        if pytesseract is None:
+            return None
+        try:
+            text = self.extract_text(image_bytes)
+        except Exception:
+            return None
+        return self.parse_text(text)
+
+    def parse_text(self, text: str) -> Dict[str, Any]:
+        """Applies every template and keeps the one with the highest confidence."""
+        best = None
+        for template in BANK_TEMPLATES:
+            result = self._apply_template(template, text)
+            if best is None or result["confidence"] > best["confidence"]:
+                best = result
+        return best
+
+    def _apply_template(self, template: Dict[str, Any], text: str) -> Dict[str, Any]:
+        raw = {}
+        for field, patterns in template["compiled"].items():
+            for pattern in patterns:
+                m = pattern.search(text)
+                if m:
+                    raw[field] = m.group("v").strip()
+                    break
+        unlabelled = set()
+        for field, patterns in template["compiled_fallbacks"].items():
+            if field in raw:
+                continue
+            for pattern in patterns:
+                m = pattern.search(text)
+                if m:
+                    raw[field] = m.group("v").strip()
+                    unlabelled.add(field)
+                    break
+
+        result = {field: None for field in RECEIPT_FIELDS}
+        result["receiver_owner"] = _clean_name(raw.get("receiver_owner"))
+        result["sender_name"] = _clean_name(raw.get("sender_name"))
+        result["amount"] = _normalize_amount(raw.get("amount"))
+        result["date"] = _normalize_date(raw.get("date"))
+        result["time"] = _normalize_time(raw.get("time"))
+        result["receiver_bank"], result["receiver_account"] = _split_bank_account(raw.get("receiver_account"))
+        if raw.get("sender_bank"):
+            result["sender_bank"], _ = _split_bank_account(raw["sender_bank"])
+
+        compact = re.sub(r"\s+", "", text)
+        marker_hits = sum(1 for marker in template["markers"] if marker in compact)
+        score = sum(weight for field, weight in CONFIDENCE_WEIGHTS.items() if result.get(field) and field not in unlabelled)
+        # Without any layout marker, the match may be a coincidence on an unknown layout.
+        if marker_hits == 0:
+            score *= 0.5
+
+        result["confidence"] = round(score, 2)
+        result["source"] = f"local:{template['name']}"
+        return result
+
+
+def _clean_name(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    name = re.sub(r"[^가-힣A-Za-z()]", "", value)
+    return name or None
+
+
+def _normalize_amount(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    digits = re.sub(r"\D", "", value)
+    if not digits or int(digits) <= 0:
+        return None
+    return f"{int(digits):,}원"
+
+
+def _normalize_date(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    m = re.search(r"(\d{4})\s*[.\-/년]\s*(\d{1,2})\s*[.\-/월]\s*(\d{1,2})", value)
+    if not m:
+        return None
+    try:
+        return datetime(int(m.group(1)), int(m.group(2)), int(m.group(3))).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def _normalize_time(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    m = re.search(r"(\d{1,2})\s*:\s*(\d{2})(?:\s*:\s*(\d{2}))?", value)
+    if not m:
+        return None
+    hour, minute, second = int(m.group(1)), int(m.group(2)), int(m.group(3) or 0)
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    return f"{hour:02d}:{minute:02d}:{second:02d}"
+
+
+def _split_bank_account(value: Optional[str]):
+    """'농협 301-1234-5678-91' -> ('농협', '301-1234-5678-91')"""
+    if not value:
+        return None, None
+    compact = value.replace(" ", "")
+    bank = next((b for b in KNOWN_BANKS if compact.startswith(b) or b in compact), None)
+    m = re.search(r"\d[\d\-·.]{6,}\d", value)
+    account = re.sub(r"[·.]", "-", m.group(0)) if m else None
+    return bank, account
@@ -0,0 +1,281 @@
+"""
+Single-pass report generator for agent test results.
+
+Replaces plot_distribution.py, plot_errors.py, plot_heatmap.py and plot_performance.py.
+Each result CSV is read once, every aggregate (turn/item_count distributions, accuracy
+by turn/item count, the turn x item_count accuracy pivot and the error counts) is computed
+in that single pass, and the figures are rendered in a process pool.
+Files whose content hash has not changed since the last run are skipped.
+
+Usage:
+    python report.py                                   # visualize_data/*.csv
+    python report.py "visualize_data/9*.csv" other.csv --workers 4
+    python report.py visualize_data/*.csv --force      # ignore the manifest
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+DEFAULT_PATTERNS = ["visualize_data/*.csv"]
+MANIFEST_NAME = ".report_manifest.json"
+DEFAULT_DPI = 300
+
+# Figure kind -> output filename suffix (same names the old plot_*.py scripts produced)
+FIGURE_SUFFIXES = {
+    "turn_dist": "_turn_dist.png",
+    "item_dist": "_item_dist.png",
+    "errors": "_plot.png",
+    "heatmap": "_heatmap.png",
+    "turn_plot": "_turn_plot.png",
+    "item_plot": "_item_plot.png",
+}
+
+
+def expand_inputs(patterns):
+    """Expands a list of paths/globs into a de-duplicated, ordered list of CSV files."""
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+
+def file_digest(path: str) -> str:
+    """sha256 of the file content, streamed so large result files are not held in memory."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(out_dir: str) -> dict:
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(out_dir: str, manifest: dict):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def compute_aggregates(df: pd.DataFrame) -> dict:
+    """
+    Computes every aggregate the report needs from one DataFrame.
+    Aggregates whose source columns are missing are simply left out.
+    """
+    aggregates = {}
+
+    if "turn" in df.columns:
+        aggregates["turn_dist"] = df["turn"].value_counts().sort_index()
+    if "item_count" in df.columns:
+        aggregates["item_dist"] = df["item_count"].value_counts().sort_index()
+
+    if "correct_score" in df.columns:
+        if "turn" in df.columns:
+            aggregates["turn_plot"] = df.groupby("turn")["correct_score"].mean()
+        if "item_count" in df.columns:
+            aggregates["item_plot"] = df.groupby("item_count")["correct_score"].mean()
+        if "turn" in df.columns and "item_count" in df.columns:
+            aggregates["heatmap"] = df.pivot_table(
+                index="turn", columns="item_count", values="correct_score", aggfunc="mean"
+            )
+
+    error_col = "error_log" if "error_log" in df.columns else ("error_msg" if "error_msg" in df.columns else None)
+    if error_col:
+        errors = df[error_col].dropna()
+        errors = errors[errors.astype(str).str.strip() != ""]
+        if len(errors) > 0:
+            aggregates["errors"] = errors.value_counts()
+
+    return aggregates
+
+
+def _init_worker():
+    """Pool initializer: headless backend and a portable Korean font (no OS-specific font pin)."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    try:
+        import koreanize_matplotlib  # noqa: F401  (registers a bundled Korean font)
+    except ImportError:
+        pass
+    plt.rcParams["axes.unicode_minus"] = False
+
+
+def render_figure(kind: str, data, title: str, output_path: str, dpi: int = DEFAULT_DPI) -> str:
+    """Renders one figure from pre-computed aggregate data. Runs inside a worker process."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    if kind in ("turn_dist", "item_dist"):
+        plt.figure(figsize=(10, 6))
+        palette = "Blues_d" if kind == "turn_dist" else "Greens_d"
+        label = "Turn" if kind == "turn_dist" else "Item Count"
+        ax = sns.barplot(x=data.index.astype(str), y=data.values, hue=data.index.astype(str), palette=palette, legend=False)
+        for container in ax.containers:
+            ax.bar_label(container)
+        plt.title(f"Data Distribution ({label})", fontsize=14, fontweight="bold")
+        plt.xlabel("Number of Turns" if kind == "turn_dist" else "Number of Items")
+        plt.ylabel("Count")
+        plt.tight_layout()
+
+    elif kind == "errors":
+        plt.figure(figsize=(12, 8))
+        ax = sns.barplot(x=data.index.astype(str), y=data.values)
+        for i, v in enumerate(data.values):
+            ax.text(i, v + 0.1, str(v), color="black", ha="center", va="bottom")
+        plt.title(f"Error Log Distribution - {title}", fontsize=15, fontweight="bold")
+        plt.xlabel("Error Type")
+        plt.ylabel("Count")
+        plt.xticks(rotation=45, ha="right")
+        plt.tight_layout()
+
+    elif kind == "heatmap":
+        plt.figure(figsize=(10, 8))
+        sns.heatmap(data, annot=True, fmt=".2f", cmap="RdYlGn", vmin=0, vmax=1, linewidths=.5)
+        plt.title(f"Complexity Heatmap (Score) - {title}", fontsize=14, fontweight="bold")
+        plt.xlabel("Item Count")
+        plt.ylabel("Turn Count")
+        plt.gca().invert_yaxis()
+        plt.tight_layout()
+
+    elif kind == "turn_plot":
+        plt.figure(figsize=(10, 6))
+        sns.lineplot(x=data.index, y=data.values, marker="o", linewidth=2.5)
+        plt.title(f"Accuracy by Turns - {title}", fontsize=14, fontweight="bold")
+        plt.xlabel("Number of Turns")
+        plt.ylabel("Mean Accuracy (Score)")
+        plt.grid(True, linestyle="--", alpha=0.7)
+        plt.ylim(0, 1.1)
+
+    elif kind == "item_plot":
+        plt.figure(figsize=(10, 6))
+        ax = sns.barplot(x=data.index.astype(str), y=data.values, hue=data.index.astype(str), palette="viridis", legend=False)
+        for container in ax.containers:
+            ax.bar_label(container, fmt="%.2f")
+        plt.title(f"Accuracy by Item Count - {title}", fontsize=14, fontweight="bold")
+        plt.xlabel("Number of Items")
+        plt.ylabel("Mean Accuracy (Score)")
+        plt.ylim(0, 1.1)
+
+    else:
+        raise ValueError(f"Unknown figure kind: {kind}")
+
+    plt.savefig(output_path, dpi=dpi)
+    plt.close()
+    return output_path
+
+
+def _outputs_for(path: str, out_dir: str, kinds) -> dict:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return {kind: os.path.join(out_dir, stem + FIGURE_SUFFIXES[kind]) for kind in kinds}
+
+
+def build_report(patterns=None, out_dir: str = None, workers: int = None, dpi: int = DEFAULT_DPI, force: bool = False) -> dict:
+    """
+    Loads each result file once, computes all aggregates and renders the figures in a process pool.
+    Returns {csv_path: [rendered png paths]} for the files that were (re)rendered.
+    """
+    paths = expand_inputs(patterns or DEFAULT_PATTERNS)
+    if not paths:
+        print("[Warn] No result files matched.")
+        return {}
+
+    manifest_dir = out_dir or os.path.dirname(paths[0]) or "."
+    os.makedirs(manifest_dir, exist_ok=True)
+    manifest = load_manifest(manifest_dir)
+
+    tasks = []  # (csv_path, kind, data, title, output_path)
+    digests = {}
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"[Warn] File not found: {path}")
+            continue
+
+        digest = file_digest(path)
+        target_dir = out_dir or os.path.dirname(path) or "."
+        previous = manifest.get(os.path.abspath(path), {})
+        # Skip only when the same content was rendered to the same directory at the same resolution
+        unchanged = (previous.get("sha256") == digest
+                     and previous.get("out_dir") == os.path.abspath(target_dir)
+                     and previous.get("dpi") == dpi)
+        if not force and unchanged and all(os.path.exists(p) for p in previous.get("outputs", [])):
+            print(f"[Skip] Unchanged: {path}")
+            continue
+
+        try:
+            df = pd.read_csv(path)
+        except Exception as e:
+            print(f"  [Error] Failed to load {path}: {e}")
+            continue
+        print(f"Loaded {path}: {len(df)} rows")
+
+        aggregates = compute_aggregates(df)
+        if not aggregates:
+            print(f"  [Info] No reportable columns in {path}. Skipping.")
+            continue
+
+        os.makedirs(target_dir, exist_ok=True)
+        outputs = _outputs_for(path, target_dir, aggregates.keys())
+        title = os.path.basename(path)
+        for kind, data in aggregates.items():
+            tasks.append((path, kind, data, title, outputs[kind]))
+        digests[path] = (digest, os.path.abspath(target_dir), list(outputs.values()))
+
+    rendered = {}
+    failed = set()
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = {
+                pool.submit(render_figure, kind, data, title, output_path, dpi): (path, output_path)
+                for path, kind, data, title, output_path in tasks
+            }
+            for future in as_completed(futures):
+                path, output_path = futures[future]
+                try:
+                    future.result()
+                    rendered.setdefault(path, []).append(output_path)
+                    print(f"  Saved: {output_path}")
+                except Exception as e:
+                    failed.add(path)
+                    print(f"  [Error] Failed to render {output_path}: {e}")
+
+    # Only record files whose figures were all rendered, so failures are retried next run
+    for path, (digest, target_dir, outputs) in digests.items():
+        if path not in failed:
+            manifest[os.path.abspath(path)] = {"sha256": digest, "out_dir": target_dir, "dpi": dpi, "outputs": outputs}
+    save_manifest(manifest_dir, manifest)
+
+    return rendered
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Single-pass test result report")
+    parser.add_argument("inputs", nargs="*", help="Result CSV files or glob patterns (default: visualize_data/*.csv)")
+    parser.add_argument("--out-dir", default=None, help="Directory for figures (default: next to each CSV)")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count)")
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI, help="Figure resolution (default: 300)")
+    parser.add_argument("--force", action="store_true", help="Re-render even if the file content is unchanged")
+    args = parser.parse_args()
+
+    build_report(args.inputs or None, out_dir=args.out_dir, workers=args.workers, dpi=args.dpi, force=args.force)
@@ -0,0 +1,144 @@
+import os
+import re
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config import settings
+
+# The rule engine (guide parser, fuzzy product index, address parser, date resolver) lives next to the SMS agent.
+if settings.RULE_ENGINE_DIR:
+    _rule_engine_dir = os.path.abspath(settings.RULE_ENGINE_DIR)
+    if os.path.isdir(_rule_engine_dir) and _rule_engine_dir not in sys.path:
+        sys.path.append(_rule_engine_dir)
+
+try:
+    from sms_order_agent import compile_guide
+    from address_parser import parse_address
+    from date_resolver import resolve_date, resolve_dates
+except ImportError:  # Rule engine not deployed; callers fall back to the model.
+    compile_guide = None
+    parse_address = None
+    resolve_date = None
+    resolve_dates = None
+
+_WEEKDAY_NAMES = "월화수목금토일"
+# Leading count of a model-extracted quantity: 2, "2", "2개", " 3 세트"
+_LEADING_COUNT = re.compile(r"\s*(\d+)")
+
+
+def get_index(store_guide: str):
+    """Fuzzy product index of a store guide (from the compiled guide cache), or None if unavailable."""
+    compiled = get_compiled_guide(store_guide)
+    return compiled.index if compiled is not None else None
+
+
+def get_compiled_guide(store_guide: str):
+    """Compiled store guide (products, index, shipping; cached per guide text), or None if unavailable."""
+    if compile_guide is None or not settings.RULE_ENGINE_DIR:
+        return None
+    return compile_guide(store_guide)
+
+
+def price_items(store_guide: str, items: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Prices the order without the model when every item resolves to exactly one product
+    with all options selected and the guide states its shipping fee.
+    Returns the same shape as PriceVerifier.verify_price, or None to fall back to the model.
+    """
+    index = get_index(store_guide)
+    if index is None or not index.guide.shipping_stated:
+        return None
+
+    priced = []
+    for item in items:
+        candidate = index.best(f"{item.get('product_name') or ''} {item.get('option') or ''}")
+        if candidate is None or not candidate.is_complete or candidate.product.price <= 0:
+            return None
+        quantity = _item_quantity(item.get("quantity"))
+        if quantity is None:
+            return None
+        price = candidate.product.price
+        priced.append({
+            **item,
+            "product_name": candidate.canonical_name,
+            "unit": item.get("unit") or candidate.product.unit,
+            "unit_price": price,
+            "quantity": quantity,
+            "subtotal": price * quantity
+        })
+
+    item_total = sum(item["subtotal"] for item in priced)
+    guide = index.guide
+    shipping = 0 if item_total >= guide.free_shipping_threshold else guide.shipping_fee
+    return {
+        "items": priced,
+        "shipping_fee": shipping,
+        "item_total": item_total,
+        "total_price": item_total,
+        "final_total": item_total + shipping,
+        "reasoning": "Resolved locally from the product index."
+    }
+
+
+def _item_quantity(value: Any) -> Optional[int]:
+    """Quantity from the model's item ("2개" → 2, missing → 1), or None when it has no leading count ("두 개")."""
+    if value is None or value == "":
+        return 1
+    m = _LEADING_COUNT.match(str(value))
+    if m is None or int(m.group(1)) <= 0:
+        return None
+    return int(m.group(1))
+
+
+def missing_options(store_guide: str, items: List[Dict[str, Any]]) -> List[str]:
+    """Notes for items that clearly match a product but leave an option group unselected."""
+    index = get_index(store_guide)
+    if index is None:
+        return []
+    notes = []
+    for item in items:
+        candidate = index.best(f"{item.get('product_name') or ''} {item.get('option') or ''}")
+        if candidate is None:
+            continue
+        for group in candidate.missing_groups:
+            notes.append(f"Missing option for '{item.get('product_name')}': choose one of ({'/'.join(group)})")
+    return notes
+
+
+def address_issue(address: str) -> Optional[str]:
+    """Note for the model when the address lacks a region, street/dong or number; None if complete or unknown."""
+    if parse_address is None or not settings.RULE_ENGINE_DIR:
+        return None
+    parsed = parse_address(address)
+    if parsed.is_complete:
+        return None
+    return (f"Address incomplete (missing: {', '.join(parsed.missing)}). "
+            f"Ask the customer for the full address including the building number or detail.")
+
+
+def clock_line(message: str, now: datetime) -> str:
+    """
+    Per-message date context for the model: the current date/time plus every date expression
+    in the message resolved locally ('이번 주 토요일' = 2025-12-27), so relative dates never
+    depend on a date baked into the system prompt.
+    """
+    line = f"[CURRENT DATE/TIME: {now.strftime('%Y-%m-%d %H:%M')} ({_WEEKDAY_NAMES[now.weekday()]})"
+    if resolve_dates is not None and settings.RULE_ENGINE_DIR:
+        hints = [f"'{d.expression}' = {d.isoformat()}" + ("" if d.qualifier == "on" else f" ({d.qualifier})")
+                 for d in resolve_dates(message, now)]
+        if hints:
+            line += "; RESOLVED DATES: " + ", ".join(hints)
+    return line + "]"
+
+
+def resolve_delivery_date(text: str, now: datetime) -> str:
+    """Normalizes a desired delivery date to YYYY-MM-DD against 'now'; unresolvable text is returned as given."""
+    if resolve_date is None or not settings.RULE_ENGINE_DIR:
+        return text
+    try:
+        return datetime.strptime(text.strip(), "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        pass
+    resolved = resolve_date(text, now)
+    return resolved.isoformat() if resolved else text
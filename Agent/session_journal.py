@@ -0,0 +1,219 @@
+import glob
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Event types
+EVENT_UPDATE = "update"  # Order fields changed (update_order_state, finalize, payment info)
+EVENT_STATE = "state"    # interaction_state transition (and the order id it applies to)
+EVENT_RESET = "reset"    # Session finished or cleared; nothing left to recover
+
+
+def apply_event(sessions: Dict[str, Dict[str, Any]], session_id: str, event_type: str, data: Dict[str, Any],
+                ts: Optional[float] = None):
+    """Applies one event to the materialized session states. Used both live and during replay."""
+    if event_type == EVENT_RESET:
+        sessions.pop(session_id, None)
+        return
+    state = sessions.setdefault(session_id, {"order": {}, "interaction_state": "ORDERING", "order_id": None})
+    if ts is not None:
+        state["updated_at"] = ts
+    if event_type == EVENT_UPDATE:
+        state["order"].update(data)
+    elif event_type == EVENT_STATE:
+        state.update(data)
+
+
+class SessionJournal:
+    """
+    Append-only event log of order mutations and interaction state transitions.
+    Events are written as JSON lines and fsync'ed in batches by a background thread
+    (group commit), so a mutation costs one buffered write. Every 'snapshot_every'
+    events the materialized state of all live sessions is written to a snapshot and
+    older log segments are dropped; recovery loads the latest snapshot and replays
+    only the events after it. Sessions with no event for 'idle_ttl' seconds (abandoned
+    chats that were never reset) are dropped when a snapshot is taken.
+    """
+    def __init__(self, journal_dir: str, fsync_interval: float = 0.05, snapshot_every: int = 5000,
+                 idle_ttl: Optional[float] = None):
+        self.journal_dir = journal_dir
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._seq = 0
+        self._snapshot_seq = 0
+        self._dirty = False
+        self._stop = threading.Event()
+
+        os.makedirs(journal_dir, exist_ok=True)
+        self.recovery_stats = self._recover()
+        self._file = self._open_segment(self._seq + 1)
+
+        self._thread = threading.Thread(target=self._sync_loop, name="session-journal", daemon=True)
+        self._thread.start()
+
+    # ----- Writing -----
+
+    def append(self, session_id: str, event_type: str, data: Dict[str, Any] = None):
+        """Records one event. Durable after the next batched fsync (see flush)."""
+        data = data or {}
+        with self._lock:
+            self._seq += 1
+            ts = time.time()
+            line = json.dumps(
+                {"seq": self._seq, "ts": ts, "session": session_id, "type": event_type, "data": data},
+                ensure_ascii=False, default=str
+            )
+            self._file.write(line + "\n")
+            self._dirty = True
+            # Apply a decoded copy so later in-place changes by the caller do not leak into the journal state.
+            apply_event(self._sessions, session_id, event_type, json.loads(line)["data"], ts)
+
+    def flush(self):
+        """Forces buffered events to disk."""
+        with self._lock:
+            self._fsync_locked()
+
+    def _fsync_locked(self):
+        if self._dirty:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._dirty = False
+
+    def _sync_loop(self):
+        while not self._stop.wait(self.fsync_interval):
+            with self._lock:
+                self._fsync_locked()
+                if self._seq - self._snapshot_seq >= self.snapshot_every:
+                    self._snapshot_locked()
+
+    # ----- Snapshots -----
+
+    def snapshot(self):
+        with self._lock:
+            self._fsync_locked()
+            self._snapshot_locked()
+
+    def _snapshot_locked(self):
+        """Drops idle sessions, writes the rest atomically, then starts a new segment and drops the old ones."""
+        self._fsync_locked()
+        if self.idle_ttl:
+            cutoff = time.time() - self.idle_ttl
+            for session_id in [s for s, state in self._sessions.items() if state.get("updated_at", cutoff) < cutoff]:
+                del self._sessions[session_id]
+        seq = self._seq
+        path = os.path.join(self.journal_dir, f"snapshot-{seq:012d}.json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"seq": seq, "sessions": self._sessions}, f, ensure_ascii=False, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        self._file.close()
+        self._file = self._open_segment(seq + 1)
+        self._snapshot_seq = seq
+
+        # Everything up to 'seq' is now covered by the snapshot.
+        for old in self._segments() + self._snapshots():
+            if _file_seq(old) <= seq and old != path and old != self._file.name:
+                os.remove(old)
+
+    # ----- Recovery -----
+
+    def _recover(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        snapshot_seq = 0
+        for path in reversed(self._snapshots()):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue  # Partially written snapshot; try the previous one
+            self._sessions = snapshot["sessions"]
+            snapshot_seq = snapshot["seq"]
+            # Snapshots written before idle tracking: start the idle clock now
+            now = time.time()
+            for state in self._sessions.values():
+                state.setdefault("updated_at", now)
+            break
+
+        self._seq = self._snapshot_seq = snapshot_seq
+        replayed = 0
+        for path in self._segments():
+            if os.path.getsize(path) == 0:
+                os.remove(path)  # Opened by a previous run that recorded nothing
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        break  # Torn write at the end of a segment
+                    if event["seq"] <= snapshot_seq:
+                        continue
+                    apply_event(self._sessions, event["session"], event["type"], event["data"], event.get("ts"))
+                    self._seq = max(self._seq, event["seq"])
+                    replayed += 1
+
+        return {
+            "snapshot_seq": snapshot_seq,
+            "replayed_events": replayed,
+            "sessions": len(self._sessions),
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+
+    def get_state(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Recovered/live state of a session: {'order', 'interaction_state', 'order_id'}."""
+        with self._lock:
+            state = self._sessions.get(session_id)
+            return json.loads(json.dumps(state, default=str)) if state else None
+
+    def session_ids(self):
+        with self._lock:
+            return list(self._sessions)
+
+    # ----- Files -----
+
+    def _open_segment(self, start_seq: int):
+        # A segment with this start holds no valid events (recovery would have advanced past it),
+        # so it is safe to truncate any torn leftovers.
+        return open(os.path.join(self.journal_dir, f"events-{start_seq:012d}.log"), "w", encoding="utf-8")
+
+    def _segments(self):
+        return sorted(glob.glob(os.path.join(self.journal_dir, "events-*.log")), key=_file_seq)
+
+    def _snapshots(self):
+        return sorted(glob.glob(os.path.join(self.journal_dir, "snapshot-*.json")), key=_file_seq)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=self.fsync_interval * 4)
+        with self._lock:
+            self._fsync_locked()
+            self._file.close()
+
+
+def _file_seq(path: str) -> int:
+    name = os.path.basename(path)
+    return int(name.split("-", 1)[1].split(".", 1)[0])
+
+
+_journals: Dict[str, SessionJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(journal_dir: str, fsync_interval: float = 0.05, snapshot_every: int = 5000,
+                idle_ttl: Optional[float] = None) -> SessionJournal:
+    """Process-wide journal per directory. Recovers on first use."""
+    key = os.path.abspath(journal_dir)
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = SessionJournal(key, fsync_interval=fsync_interval, snapshot_every=snapshot_every, idle_ttl=idle_ttl)
+            _journals[key] = journal
+        return journal
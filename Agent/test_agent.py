@@ -28,6 +28,9 @@ sys.modules["ocr_manager"] = mock_ocr_module
 
 from agent_engine import TextOrderAgent
 from config import settings
+import rule_engine  # puts RULE_ENGINE_DIR (Agent_10000) on sys.path
+from order_dataset import iter_validation_cases
+from itertools import islice
 
 INPUT_DELAY = 2.0
 ERROR_DELAY = 2.0
@@ -245,7 +248,7 @@ class ImprovedTextOrderAgent(TextOrderAgent):
         self.use_price_verifier = use_price_verifier
         
         # Call super init to setup basic state and tools
-        super().__init__(project_id, location, model_name, guide_path)
+        super().__init__(project_id, location, model_name, guide_path, use_journal=False)
         
         # [Test Enhancements] Override Tool Definition to allow 'unit_price' extraction
         if not use_price_verifier:
@@ -435,22 +438,13 @@ def run_tests(limit=None, use_price_verifier=True):
             print(f"Error: {input_file} not found.")
             return
 
+    # Streamed row by row (encoding sniffed once: utf-8-sig / utf-8 / cp949); rows without 'no' are skipped
     print(f"Loading test data from {input_file}...")
-    try:
-        df = pd.read_csv(input_file, encoding='utf-8')
-    except UnicodeDecodeError:
-        print("UTF-8 decode failed, trying CP949...")
-        df = pd.read_csv(input_file, encoding='cp949')
-    except Exception as e:
-        print(f"Error reading CSV: {e}")
-        return
-
-    if 'no' in df.columns:
-        df = df.dropna(subset=['no'])
+    cases = iter_validation_cases(input_file)
     
     if limit:
         print(f"Limiting execution to first {limit} cases.")
-        df = df.head(limit)
+        cases = islice(cases, limit)
     
     results = []
     print("Starting Test Loop...")
@@ -468,21 +462,17 @@ def run_tests(limit=None, use_price_verifier=True):
     # Initialize Agent ONCE (Optimization)
     agent = ImprovedTextOrderAgent(use_price_verifier=use_price_verifier)
         
-    for index, row in df.iterrows():
+    for index, case in enumerate(cases):
         temp_guide_path = None
+        case_no = case.no
         try:
-            case_no = row.get('no', index)
             print(f"Processing Test Case #{case_no}...")
             
             # Rate Limit Protection
             time.sleep(20) 
             
             # 1. Setup Guide
-            guide_content = row.get('guide', '')
-            if pd.isna(guide_content): guide_content = ""
-            
-            # Fix unicode line endings if any
-            guide_content = str(guide_content).replace('\r\n', '\n')
+            guide_content = case.guide
             
             temp_guide_path = f"guides/temp_guide_{index}.txt"
             with open(temp_guide_path, "w", encoding="utf-8") as f:
@@ -493,7 +483,7 @@ def run_tests(limit=None, use_price_verifier=True):
             agent.reset_state()
             
             # 3. Simulate
-            raw_order = str(row['order'])
+            raw_order = case.order
             turns = raw_order.split('\n')
             transcript = ""
             turn_count = 0
@@ -590,7 +580,7 @@ def run_tests(limit=None, use_price_verifier=True):
             turn_count += 1
             # ----------------------------------
             final_state = agent.get_current_order()
-            label = row.get('label', '{}')
+            label = case.label or '{}'
             
             # Calculate item count from LABEL (as per user request)
             # Moved before calculate_correctness so it persists even if scoring crashes
@@ -644,17 +634,17 @@ def run_tests(limit=None, use_price_verifier=True):
             # Try to calculate item count even in error case if possible
             try:
                 # Basic Regex Fallback for error cases
-                item_count = len(re.findall(r'product_name', str(row.get('label', ''))))
+                item_count = len(re.findall(r'product_name', str(case.label or '')))
             except:
                 item_count = 0
                 
             results.append({
-                "no": row.get('no', index),
+                "no": case_no,
                 "order": "ERROR",
                 "turn": 0,
                 "item_count": item_count,
                 "predict": str(e),
-                "label": row.get('label', ''),
+                "label": case.label or '',
                 "correct_score": 0.0
             })
         finally:
@@ -1,19 +1,66 @@
 import os
+import csv
 import json
-import pandas as pd
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from ocr_manager import OCRManager
 from config import settings
 from datetime import datetime
 import argparse
 
-def run_ocr_tests(limit=None):
+CSV_FIELDS = ["image_path", "predict", "label", "elapsed_sec"]
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces out request starts to at most `rate` per second.
+    A rate of None or 0 disables limiting.
+    """
+    def __init__(self, rate: float = None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _analyze_one(ocr_manager, limiter, image_path, started):
+    """Worker task: waits for a rate-limit slot, then runs OCR on one image."""
+    limiter.acquire()
+    started["at"] = time.monotonic()
+    if not os.path.exists(image_path):
+        return {"error": "File not found"}
+    try:
+        return ocr_manager.analyze_payment_receipt(image_path)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def run_ocr_tests(limit=None, workers=4, rate=None, timeout=60.0):
     """
-    Runs OCR tests on a subset of images and exports results to CSV.
+    Runs OCR tests concurrently and streams results to CSV as they finish.
+
+    Args:
+        limit: Number of test cases to run (None = all).
+        workers: Maximum number of OCR calls in flight.
+        rate: Maximum OCR calls started per second (None = unlimited).
+        timeout: Per-image timeout in seconds, measured from when the call starts. Timed-out calls are
+            recorded as errors and abandoned; their threads count against the pool until the SDK returns.
     """
     json_path = "test_data/transfer_images_labels_accurate.json"
     image_dir = "test_data/test_image"
     output_dir = "test_result"
-    
+
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
@@ -26,55 +73,104 @@ def run_ocr_tests(limit=None):
         print(f"Limiting to first {limit} cases.")
         labels_data = labels_data[:limit]
 
-    ocr_manager = Agent ()
-    results = []
-
-    print(f"Starting OCR tests for {len(labels_data)} images...")
-    
-    for i, entry in enumerate(labels_data):
-        image_filename = entry.get("image_filename")
-        image_path = os.path.join(image_dir, image_filename)
-        label_payment_info = entry.get("payment_info")
-
-        print(f"[{i+1}/{len(labels_data)}] Analyzing: {image_filename}...")
-        
-        if not os.path.exists(image_path):
-            print(f"  [Warning] Image not found: {image_path}")
-            predict_result = {"error": "File not found"}
-        else:
-            try:
-                predict_result = ocr_manager.analyze_payment_receipt(image_path)
-            except Exception as e:
-                print(f"  [Error] OCR failed: {e}")
-                predict_result = {"error": str(e)}
-
-        results.append({
-            "image_path": image_path,
-            "predict": json.dumps(predict_result, ensure_ascii=False),
-            "label": json.dumps(label_payment_info, ensure_ascii=False)
-        })
-
-    # Save to CSV
+    ocr_manager = OCRManager(model_name=settings.OCR_MODEL_NAME)
+    limiter = RateLimiter(rate)
+
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     csv_filename = f"ocr_test_results_{timestamp}.csv"
     csv_path = os.path.join(output_dir, csv_filename)
-    
-    df = pd.DataFrame(results)
-    df.to_csv(csv_path, index=False, encoding="utf-8-sig")
-    
+
+    total = len(labels_data)
+    print(f"Starting OCR tests for {total} images (workers={workers}, rate={rate or 'unlimited'}/s, timeout={timeout}s)...")
+
+    start_time = time.monotonic()
+    completed = 0
+    timed_out = 0
+
+    # Abandoned (timed-out) calls keep their thread until the SDK returns, so the pool gets
+    # headroom beyond the in-flight bound and new images are only submitted to a free thread
+    # (a queued task would never start its timeout clock).
+    pool_size = workers * 2
+    pool = ThreadPoolExecutor(max_workers=pool_size)
+    try:
+        with open(csv_path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            f.flush()
+
+            def write_row(image_path, label_payment_info, predict_result, elapsed):
+                nonlocal completed
+                writer.writerow({
+                    "image_path": image_path,
+                    "predict": json.dumps(predict_result, ensure_ascii=False),
+                    "label": json.dumps(label_payment_info, ensure_ascii=False),
+                    "elapsed_sec": f"{elapsed:.3f}" if elapsed is not None else ""
+                })
+                f.flush()
+                completed += 1
+
+            pending = iter(labels_data)
+            exhausted = False
+            in_flight = {}     # future -> (image_path, label, started)
+            abandoned = set()  # timed-out futures still holding a pool thread
+
+            def fill():
+                nonlocal exhausted
+                while not exhausted and len(in_flight) < workers and len(in_flight) + len(abandoned) < pool_size:
+                    entry = next(pending, None)
+                    if entry is None:
+                        exhausted = True
+                        return
+                    image_path = os.path.join(image_dir, entry.get("image_filename"))
+                    started = {"at": None}
+                    future = pool.submit(_analyze_one, ocr_manager, limiter, image_path, started)
+                    in_flight[future] = (image_path, entry.get("payment_info"), started)
+
+            fill()
+            while in_flight or (abandoned and not exhausted):
+                done, _ = wait(list(in_flight) + list(abandoned), timeout=0.5, return_when=FIRST_COMPLETED)
+                abandoned -= done
+
+                for future in done:
+                    if future not in in_flight:
+                        continue
+                    image_path, label_payment_info, started = in_flight.pop(future)
+                    elapsed = time.monotonic() - started["at"] if started["at"] else None
+                    write_row(image_path, label_payment_info, future.result(), elapsed)
+                    print(f"[{completed}/{total}] Done: {os.path.basename(image_path)}")
+
+                now = time.monotonic()
+                for future, (image_path, label_payment_info, started) in list(in_flight.items()):
+                    if started["at"] is not None and now - started["at"] > timeout:
+                        del in_flight[future]
+                        abandoned.add(future)
+                        timed_out += 1
+                        write_row(image_path, label_payment_info, {"error": f"Timed out after {timeout}s"}, now - started["at"])
+                        print(f"[{completed}/{total}] [Timeout] {os.path.basename(image_path)}")
+                fill()
+    finally:
+        pool.shutdown(wait=False)
+
+    elapsed_total = time.monotonic() - start_time
     print("-" * 30)
     print(f"OCR Test Completed!")
+    print(f"Images: {completed} | Timeouts: {timed_out} | Wall time: {elapsed_total:.1f}s "
+          f"({completed / elapsed_total if elapsed_total else 0:.2f} images/s)")
+    print(f"OCR Metrics: {ocr_manager.get_metrics()}")
     print(f"Results saved to: {csv_path}")
     print("-" * 30)
-    
+
     return csv_path
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="OCR Evaluation Script")
-    parser.add_argument("--limit", type=int, default=5, help="Number of test cases to run (default: 5)")
+    parser.add_argument("--limit", type=int, default=5, help="Number of test cases to run (default: 5, 0 = all)")
+    parser.add_argument("--workers", type=int, default=4, help="Maximum concurrent OCR calls (default: 4)")
+    parser.add_argument("--rate", type=float, default=None, help="Maximum OCR calls started per second (default: unlimited)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-image timeout in seconds (default: 60)")
     args = parser.parse_args()
 
     # You can also change the default MAX_TEST_CASES here
-    MAX_TEST_CASES = args.limit
-    
-    run_ocr_tests(limit=MAX_TEST_CASES)
+    MAX_TEST_CASES = args.limit or None
+
+    run_ocr_tests(limit=MAX_TEST_CASES, workers=args.workers, rate=args.rate, timeout=args.timeout)
@@ -4,7 +4,7 @@ import json
 
 def test_reset():
     print("--- Initializing Agent ---")
-    agent = TextOrderAgent()
+    agent = TextOrderAgent(use_journal=False)
     
     # Simulate turn 1
     print("\n--- Simulating Order ---")
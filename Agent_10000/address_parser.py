@@ -0,0 +1,234 @@
+"""
+🏠 주소 파서 / 검증기
+- 시/도 → 시/군/구 (→ 일반구) → 읍/면/동 트라이 (korean_regions.tsv 오프라인 표)
+- "서울시", "경기", "제주도" 같은 약칭과 시/도 생략 ("제주시 노형동 ...") 처리
+- 도로명 주소(도로명 + 건물번호) 또는 지번 주소(읍/면/동 + 지번)가 갖춰졌는지 판정
+- 정규화된 주소 문자열 단위로 결과 캐시
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+REGION_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "korean_regions.tsv")
+
+# 시/도 약칭 (표에 있는 정식 명칭 → 고객이 쓰는 표기)
+SIDO_ALIASES = {
+    "서울특별시": ("서울", "서울시"),
+    "부산광역시": ("부산", "부산시"),
+    "대구광역시": ("대구", "대구시"),
+    "인천광역시": ("인천", "인천시"),
+    "광주광역시": ("광주", "광주시"),
+    "대전광역시": ("대전", "대전시"),
+    "울산광역시": ("울산", "울산시"),
+    "세종특별자치시": ("세종", "세종시"),
+    "경기도": ("경기",),
+    "강원특별자치도": ("강원", "강원도"),
+    "충청북도": ("충북",),
+    "충청남도": ("충남",),
+    "전북특별자치도": ("전북", "전라북도"),
+    "전라남도": ("전남",),
+    "경상북도": ("경북",),
+    "경상남도": ("경남",),
+    "제주특별자치도": ("제주", "제주도"),
+}
+
+# 누락 항목 (AddressParse.missing)
+MISSING_REGION = "시/군/구"
+MISSING_STREET = "도로명 또는 읍/면/동"
+MISSING_NUMBER = "건물번호 또는 지번"
+
+# "테헤란로 123", "압구정로12길 34", "판교역로235번길 10" (도로명 뒤 N길/N번길까지 도로명)
+_ROAD = re.compile(r"^([가-힣A-Za-z0-9·.]*[가-힣](?:로|길)(?:\d+번?길)?)(\d+(?:-\d+)?)?$")
+# 띄어 쓴 "압구정로 12길 34"의 "12길" 토큰
+_ROAD_BRANCH = re.compile(r"^(\d+번?길)(\d+(?:-\d+)?)?$")
+_DONG = re.compile(r"^[가-힣]+\d*[가-힣]*(?:동|읍|면|가)$")
+_RI = re.compile(r"^[가-힣]+\d*리$")
+_NUMBER = re.compile(r"^(?:산\s*)?\d+(?:-\d+)?(?:번지)?$")
+
+
+class RegionNode:
+    __slots__ = ("name", "level", "parent", "children")
+
+    def __init__(self, name: str, level: int, parent: Optional["RegionNode"]):
+        self.name = name
+        self.level = level                    # 0 루트, 1 시/도, 2 시/군/구, 3 일반구, 4 읍/면/동
+        self.parent = parent
+        self.children: Dict[str, "RegionNode"] = {}
+
+    def child(self, name: str, level: int) -> "RegionNode":
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = RegionNode(name, level, self)
+        return node
+
+    def is_under(self, ancestor: "RegionNode") -> bool:
+        node = self.parent
+        while node is not None:
+            if node is ancestor:
+                return True
+            node = node.parent
+        return False
+
+    def path(self) -> List[str]:
+        names, node = [], self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return names[::-1]
+
+
+class RegionTrie:
+    """행정구역 트라이. 표기(정식 명칭/약칭) → 노드 목록 색인으로 어느 단계에서든 바로 찾습니다."""
+
+    def __init__(self):
+        self.root = RegionNode("", 0, None)
+        self._lookup: Dict[str, List[RegionNode]] = {}
+
+    @classmethod
+    def from_table(cls, path: str = REGION_TABLE_PATH) -> "RegionTrie":
+        trie = cls()
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip() or line.startswith("#"):
+                    continue
+                cols = line.rstrip("\n").split("\t")
+                trie.add(cols[0], cols[1].split() if len(cols) > 1 else [], cols[2].split() if len(cols) > 2 else [])
+        return trie
+
+    def add(self, sido: str, sigungu: List[str], dongs: List[str]):
+        node = self.root.child(sido, 1)
+        self._index(sido, node)
+        for alias in SIDO_ALIASES.get(sido, ()):
+            self._index(alias, node)
+        for level, name in enumerate(sigungu, 2):
+            node = node.child(name, level)
+            self._index(name, node)
+            if name.endswith("시") and len(name) > 2:
+                self._index(name[:-1], node)     # "수원" → 수원시
+        for name in dongs:
+            self._index(name, node.child(name, 4))
+
+    def _index(self, key: str, node: RegionNode):
+        nodes = self._lookup.setdefault(key, [])
+        if node not in nodes:
+            nodes.append(node)
+
+    def lookup(self, token: str, under: RegionNode) -> List[RegionNode]:
+        return [n for n in self._lookup.get(token, ()) if n.is_under(under)]
+
+
+@dataclass(frozen=True)
+class AddressParse:
+    normalized: str
+    sido: Optional[str] = None
+    sigungu: Optional[str] = None             # "수원시 영통구"처럼 일반구 포함
+    eupmyeondong: Optional[str] = None
+    ri: Optional[str] = None
+    road: Optional[str] = None
+    building_no: Optional[str] = None
+    lot_no: Optional[str] = None
+    detail: Optional[str] = None
+    ambiguous_region: bool = False
+    missing: Tuple[str, ...] = field(default_factory=tuple)
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.missing
+
+    @property
+    def is_road_address(self) -> bool:
+        return bool(self.road and self.building_no)
+
+
+@lru_cache(maxsize=1)
+def get_trie() -> RegionTrie:
+    return RegionTrie.from_table()
+
+
+def normalize_address(text: str) -> str:
+    """공백/쉼표 정리: 캐시 키이자 파싱 입력"""
+    text = re.sub(r"[,\s]+", " ", text or "").strip()
+    return text.strip(" .")
+
+
+def parse_address(text: str) -> AddressParse:
+    """주소를 구성 요소로 나누고 누락 항목을 판정합니다 (정규화 문자열 단위 캐시)."""
+    return _parse_normalized(normalize_address(text))
+
+
+@lru_cache(maxsize=4096)
+def _parse_normalized(normalized: str) -> AddressParse:
+    trie = get_trie()
+    tokens = normalized.split()
+
+    # 1. 행정구역: 현재 노드 아래에서 찾을 수 있는 만큼 내려감
+    node, ambiguous, i = trie.root, False, 0
+    while i < len(tokens):
+        candidates = [n for n in trie.lookup(tokens[i], node) if n.level < 4]
+        if not candidates:
+            break
+        if len(candidates) > 1 and i + 1 < len(tokens):
+            # "광주시 서구" → 광주광역시, "광주시 오포읍" → 경기도 광주시: 다음 토큰이 하위에 있는 후보
+            following = [c for c in candidates if trie.lookup(tokens[i + 1], c)]
+            candidates = following or candidates
+        if len(candidates) > 1:
+            # 시/도 약칭이 겹치면 시/도 우선, 같은 단계에서 겹치면 ("중구") 모호
+            top = min(c.level for c in candidates)
+            candidates = [c for c in candidates if c.level == top]
+            ambiguous = len(candidates) > 1
+        node = candidates[0]
+        i += 1
+
+    path = node.path()
+    if ambiguous:
+        sido, sigungu = None, node.name
+    else:
+        sido, sigungu = (path[0] if path else None), (" ".join(path[1:]) or None)
+
+    # 2. 읍/면/동, 리, 도로명, 번호, 나머지는 상세주소
+    parts: Dict[str, Optional[str]] = {"eupmyeondong": None, "ri": None, "road": None,
+                                      "building_no": None, "lot_no": None}
+    detail: List[str] = []
+    for token in tokens[i:]:
+        if detail:
+            detail.append(token)
+            continue
+        road = _ROAD.match(token)
+        if road and not parts["road"] and not parts["building_no"] and not parts["lot_no"]:
+            parts["road"] = road.group(1)
+            parts["building_no"] = road.group(2)
+        elif parts["road"] and parts["road"].endswith("로") and not parts["building_no"] and _ROAD_BRANCH.match(token):
+            branch = _ROAD_BRANCH.match(token)
+            parts["road"] += branch.group(1)
+            parts["building_no"] = branch.group(2)
+        elif not parts["road"] and not parts["eupmyeondong"] and (
+                trie.lookup(token, node) or _DONG.match(token)):
+            parts["eupmyeondong"] = token
+        elif parts["eupmyeondong"] and not parts["ri"] and _RI.match(token):
+            parts["ri"] = token
+        elif _NUMBER.match(token) and not (parts["building_no"] or parts["lot_no"]):
+            parts["building_no" if parts["road"] else "lot_no"] = token.replace("번지", "")
+        else:
+            detail.append(token)
+
+    missing = []
+    if ambiguous or (node.level < 2 and (node is trie.root or node.children)):
+        missing.append(MISSING_REGION)
+    if not parts["road"] and not parts["eupmyeondong"]:
+        missing.append(MISSING_STREET)
+    if not parts["building_no"] and not parts["lot_no"]:
+        missing.append(MISSING_NUMBER)
+
+    return AddressParse(
+        normalized=" ".join(filter(None, [sido, sigungu] + tokens[i:])),
+        sido=sido,
+        sigungu=sigungu,
+        detail=" ".join(detail) or None,
+        ambiguous_region=ambiguous,
+        missing=tuple(missing),
+        **parts
+    )
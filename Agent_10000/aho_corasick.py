@@ -0,0 +1,91 @@
+"""
+🔤 Aho-Corasick 다중 문자열 매칭
+- 상품명/별칭 전체를 하나의 오토마톤으로 만들어 메시지를 한 번만 훑음
+- 탐색 비용은 메시지 길이 + 매칭 수에 비례 (상품 수와 무관)
+- leftmost_longest(): 가장 앞에서 시작하는 가장 긴 매칭부터, 겹치지 않게 선택
+  ("아기샴푸" 안의 "샴푸", "클렌징폼" 안의 "클렌징"은 따로 잡지 않음)
+"""
+
+from collections import deque
+from typing import Dict, Generic, Iterable, Iterator, List, Tuple, TypeVar
+
+
+V = TypeVar("V")
+
+
+class AhoCorasick(Generic[V]):
+    """(패턴, 값) 목록으로 만드는 오토마톤. 같은 패턴에 여러 값이 붙을 수 있습니다."""
+
+    __slots__ = ("_goto", "_fail", "_out", "_values")
+
+    def __init__(self, patterns: Iterable[Tuple[str, V]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]              # 상태 -> 끝나는 패턴 길이 목록 (실패 링크 포함)
+        self._values: Dict[Tuple[int, int], List[V]] = {}   # (끝 상태, 길이) -> 값들
+
+        for pattern, value in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            key = (state, len(pattern))
+            if key not in self._values:
+                self._values[key] = []
+                self._out[state].append(len(pattern))
+            if value not in self._values[key]:
+                self._values[key].append(value)
+        self._build()
+
+    def _build(self):
+        """BFS로 실패 링크를 잇고, 실패 상태의 출력(더 짧은 접미 패턴)을 합칩니다."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, List[V]]]:
+        """모든 매칭 (시작, 끝, 값들)을 끝 위치 순서로 반환합니다 (겹침 포함)."""
+        goto, fail, out, values = self._goto, self._fail, self._out, self._values
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                s = state
+                # 출력 목록은 긴 패턴부터: 자기 상태의 패턴, 이어서 실패 링크 쪽 접미 패턴
+                for length in out[state]:
+                    while (s, length) not in values:
+                        s = fail[s]
+                    yield end - length, end, values[(s, length)]
+
+    def leftmost_longest(self, text: str) -> List[Tuple[int, int, List[V]]]:
+        """겹치지 않는 매칭: 먼저 시작하는 것, 같은 시작이면 긴 것을 고릅니다."""
+        matches = sorted(self.iter_matches(text), key=lambda m: (m[0], -m[1]))
+        chosen = []
+        end = 0
+        for m in matches:
+            if m[0] >= end:
+                chosen.append(m)
+                end = m[1]
+        return chosen
@@ -0,0 +1,133 @@
+"""
+⏱️ parse_order 지연 시간 벤치마크
+- general_orders_10000.xlsx의 원본메시지를 카테고리별 판매자 가이드(seller_guides_general.md)로 파싱
+- 메시지당 지연 시간 (평균/p50/p95/p99)과 초당 처리량 출력
+- --save로 결과를 JSON에 저장하고, --baseline으로 이전 결과(변경 전)와 비교
+- --workers로 parse_orders(프로세스 풀) 처리량을 워커 수별로 측정
+
+사용법:
+    python benchmark_parse_order.py --save before.json      # 변경 전
+    python benchmark_parse_order.py --baseline before.json  # 변경 후, 비교 출력
+    python benchmark_parse_order.py --workers 1 2 4 8       # 코어 수에 따른 처리량
+"""
+
+import argparse
+import json
+import re
+import statistics
+import time
+from itertools import islice
+from typing import Dict, List, Tuple
+
+from order_dataset import iter_xlsx_orders
+from sms_order_agent import SMSOrderAgent
+
+
+ORDERS_PATH = "general_orders_10000.xlsx"
+GUIDES_PATH = "seller_guides_general.md"
+
+
+def load_guides(path: str = GUIDES_PATH) -> Dict[str, str]:
+    """"## 카테고리" 아래 코드 블록 → {카테고리: 가이드 원문}"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return {m.group(1).strip(): m.group(2)
+            for m in re.finditer(r"^## (.+?)\n+```\n(.*?)```", text, re.S | re.M)}
+
+
+def load_messages(path: str = ORDERS_PATH, limit: int = None) -> List[Tuple[str, str]]:
+    """주문별 (카테고리, 원본메시지). 반복 측정을 위해 목록으로 모읍니다 (limit건까지만 읽음)."""
+    return [(order.category, order.message) for order in islice(iter_xlsx_orders(path), limit)]
+
+
+def run(messages: List[Tuple[str, str]], guides: Dict[str, str], repeat: int = 3) -> Dict[str, float]:
+    agents = {}
+    for category, guide in guides.items():
+        agents[category] = SMSOrderAgent()
+        agents[category].load_seller_guide(guide)
+    messages = [(agents[c], m) for c, m in messages if c in agents]
+
+    # 워밍업 (패턴/캐시 로드)
+    for agent, message in messages[:100]:
+        agent.parse_order(message)
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for agent, message in messages:
+            t = time.perf_counter()
+            agent.parse_order(message)
+            latencies.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - started
+
+    return {"messages": len(messages), **summarize(latencies), "messages_per_sec": len(latencies) / elapsed}
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """초 단위 지연 시간 목록 → 평균/p50/p95/p99 (마이크로초)"""
+    latencies = sorted(latencies)
+    pick = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1e6
+    return {
+        "mean_us": statistics.mean(latencies) * 1e6,
+        "p50_us": pick(0.50),
+        "p95_us": pick(0.95),
+        "p99_us": pick(0.99),
+    }
+
+
+def run_batch(messages: List[Tuple[str, str]], guides: Dict[str, str], workers: int,
+              chunksize: int = 64) -> float:
+    """모든 카테고리(판매자) 가이드를 한 에이전트에 등록하고 섞인 주문을 한 번에 parse_orders (건/초, 풀 생성 포함)"""
+    started = time.perf_counter()
+    agent = SMSOrderAgent()
+    for category, guide in guides.items():
+        agent.load_seller_guide(guide, seller_id=category)
+    count = 0
+    jobs = ((category, message) for category, message in messages if category in guides)
+    for _ in agent.parse_orders(jobs, workers=workers, chunksize=chunksize, ordered=False):
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def report(result: Dict[str, float], baseline: Dict[str, float] = None):
+    print(f"메시지 {result['messages']:,}건")
+    for key in ("mean_us", "p50_us", "p95_us", "p99_us", "messages_per_sec"):
+        line = f"  {key:<17}{result[key]:>12,.1f}"
+        if baseline:
+            line += f"   (이전 {baseline[key]:,.1f}, x{result[key] / baseline[key]:.2f})"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="parse_order 지연 시간 벤치마크")
+    parser.add_argument("--orders", default=ORDERS_PATH, help="주문 엑셀 파일")
+    parser.add_argument("--guides", default=GUIDES_PATH, help="판매자 가이드 모음 (마크다운)")
+    parser.add_argument("--limit", type=int, default=None, help="사용할 메시지 수 (기본: 전체)")
+    parser.add_argument("--repeat", type=int, default=3, help="전체 메시지 반복 횟수")
+    parser.add_argument("--workers", type=int, nargs="*", help="parse_orders 워커 수 목록 (처리량 측정)")
+    parser.add_argument("--chunksize", type=int, default=64, help="parse_orders chunksize")
+    parser.add_argument("--save", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args()
+
+    messages = load_messages(args.orders, args.limit)
+    guides = load_guides(args.guides)
+
+    if args.workers:
+        single = None
+        for workers in args.workers:
+            rate = run_batch(messages, guides, workers, args.chunksize)
+            single = single or rate
+            print(f"워커 {workers:>3}개: {rate:>10,.0f}건/초  (x{rate / single:.2f})")
+    else:
+        result = run(messages, guides, args.repeat)
+
+        baseline = None
+        if args.baseline:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        report(result, baseline)
+
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
@@ -0,0 +1,243 @@
+"""
+📈 SMSOrderAgent 벤치마크 모음 (회귀 기준 포함)
+- 데이터: general_orders_10000.xlsx (카테고리별 가이드) + validation_synthetic_100.csv (행마다 가이드)
+- 단계별 지연 시간: 가이드 로드, 스캔, 각 _extract_* 메서드, parse_order, validate_order,
+  generate_confirmation, to_label_json (평균/p50/p95/p99, 마이크로초)
+- 전체 처리량: parse_orders 워커 1..N개 (건/초, 건/분)
+- 최대 RSS: 본 프로세스 / 워커 프로세스
+- --save로 JSON 기준값 저장, --baseline과 비교해 기준(--threshold)보다 느려지면 종료 코드 1
+
+사용법:
+    python benchmark_suite.py --save benchmark_baseline.json        # 기준값 저장
+    python benchmark_suite.py --baseline benchmark_baseline.json    # 변경 후 비교 (회귀 시 실패)
+    python benchmark_suite.py --limit 2000 --workers 4 --baseline benchmark_baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+from benchmark_parse_order import GUIDES_PATH, ORDERS_PATH, load_guides, load_messages, run_batch, summarize
+from order_dataset import iter_validation_cases
+from order_scanner import OrderScan
+from sms_order_agent import SMSOrderAgent
+
+
+VALIDATION_PATH = "validation_synthetic_100.csv"
+
+# parse_order 안에서 스캔 결과를 받는 추출기 (_extract_delivery_date만 원문을 받음)
+EXTRACTORS = ("_extract_name", "_extract_phone", "_extract_address", "_extract_items_improved", "_extract_requests")
+STAGES = ("load_seller_guide", "scan", *EXTRACTORS, "_extract_delivery_date",
+          "parse_order", "validate_order", "generate_confirmation", "to_label_json")
+
+# 기본 회귀 기준: 20% 이상 느려지거나 처리량이 줄거나 RSS가 늘면 실패
+THRESHOLD = 0.20
+RSS_THRESHOLD = 0.20
+# 이보다 작은 지연 시간 차이(마이크로초)는 측정 잡음으로 보고 무시
+MIN_DELTA_US = 5.0
+
+
+def load_cases(orders_path: str, guides_path: str, validation_path: str,
+               limit: Optional[int] = None) -> Dict[str, List[Tuple[str, str]]]:
+    """데이터셋별 (가이드 원문, 주문 메시지) 목록"""
+    datasets = {}
+    if orders_path and os.path.exists(orders_path):
+        guides = load_guides(guides_path)
+        datasets["orders"] = [(guides[c], m) for c, m in load_messages(orders_path, limit) if c in guides]
+    if validation_path and os.path.exists(validation_path):
+        datasets["validation"] = [(case.guide, case.order)
+                                  for case in islice(iter_validation_cases(validation_path), limit)]
+    return datasets
+
+
+def measure_stages(cases: List[Tuple[str, str]], repeat: int = 1) -> Dict[str, Dict[str, float]]:
+    """단계별 지연 시간. 가이드는 서로 다른 원문마다 한 번씩 로드하고, 그 시간을 load_seller_guide로 기록합니다."""
+    timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    agents: Dict[str, SMSOrderAgent] = {}
+    for guide, _ in cases:
+        if guide not in agents:
+            agent = SMSOrderAgent()
+            t = time.perf_counter()
+            agent.load_seller_guide(guide)
+            timings["load_seller_guide"].append(time.perf_counter() - t)
+            agents[guide] = agent
+    cases = [(agents[guide], message) for guide, message in cases]
+
+    # 워밍업 (패턴/캐시 로드)
+    for agent, message in cases[:100]:
+        agent.parse_order(message)
+
+    clock = time.perf_counter
+    for _ in range(repeat):
+        for agent, message in cases:
+            t = clock()
+            scan = OrderScan(message)
+            timings["scan"].append(clock() - t)
+            for name in EXTRACTORS:
+                extract = getattr(agent, name)
+                t = clock()
+                extract(scan)
+                timings[name].append(clock() - t)
+            t = clock()
+            agent._extract_delivery_date(message)
+            timings["_extract_delivery_date"].append(clock() - t)
+
+            t = clock()
+            order = agent.parse_order(message)
+            timings["parse_order"].append(clock() - t)
+            t = clock()
+            validation = agent.validate_order(order)
+            timings["validate_order"].append(clock() - t)
+            t = clock()
+            agent.generate_confirmation(order, validation)
+            timings["generate_confirmation"].append(clock() - t)
+            t = clock()
+            agent.to_label_json(order)
+            timings["to_label_json"].append(clock() - t)
+
+    return {stage: summarize(values) for stage, values in timings.items() if values}
+
+
+def measure_throughput(cases: List[Tuple[str, str]], max_workers: int, chunksize: int = 64) -> Dict[str, Dict[str, float]]:
+    """parse_orders 전체 처리량 (워커 1..max_workers개, 가이드별 풀)"""
+    # run_batch는 (카테고리, 메시지) 목록과 {카테고리: 가이드}를 받으므로 가이드 원문을 키로 씀
+    guides = {guide: guide for guide, _ in cases}
+    results = {}
+    for workers in range(1, max_workers + 1):
+        rate = run_batch(cases, guides, workers, chunksize)
+        results[str(workers)] = {"messages_per_sec": rate, "messages_per_min": rate * 60}
+    return results
+
+
+def peak_rss_mb() -> Dict[str, Optional[float]]:
+    """최대 RSS (MB): 본 프로세스와 종료된 워커 프로세스 중 최댓값. resource가 없는 OS(Windows)는 None."""
+    try:
+        import resource
+    except ImportError:
+        return {"self": None, "workers": None}
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024      # macOS는 바이트, Linux는 KB
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale,
+        "workers": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale,
+    }
+
+
+def run_suite(datasets: Dict[str, List[Tuple[str, str]]], repeat: int = 1, max_workers: int = 0,
+              chunksize: int = 64) -> Dict:
+    result = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "datasets": {},
+    }
+    for name, cases in datasets.items():
+        result["datasets"][name] = {"messages": len(cases), "stages": measure_stages(cases, repeat)}
+    if max_workers and "orders" in datasets:
+        result["throughput"] = measure_throughput(datasets["orders"], max_workers, chunksize)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def gated_metrics(result: Dict) -> Dict[str, Tuple[float, bool]]:
+    """회귀 판정 대상: 이름 → (값, 클수록 좋은지). 단계별 평균/p95, 워커별 처리량, 최대 RSS."""
+    metrics = {}
+    for name, dataset in result.get("datasets", {}).items():
+        for stage, summary in dataset["stages"].items():
+            for key in ("mean_us", "p95_us"):
+                metrics[f"{name}.{stage}.{key}"] = (summary[key], False)
+    for workers, summary in result.get("throughput", {}).items():
+        metrics[f"throughput.{workers}.messages_per_sec"] = (summary["messages_per_sec"], True)
+    for key, value in result.get("peak_rss_mb", {}).items():
+        if value is not None:
+            metrics[f"peak_rss_mb.{key}"] = (value, False)
+    return metrics
+
+
+def compare(result: Dict, baseline: Dict, threshold: float = THRESHOLD,
+            rss_threshold: float = RSS_THRESHOLD, min_delta_us: float = MIN_DELTA_US) -> List[str]:
+    """기준값 대비 회귀 목록 (비어 있으면 통과). 양쪽에 모두 있는 지표만 비교합니다."""
+    current, previous = gated_metrics(result), gated_metrics(baseline)
+    regressions = []
+    for name, (value, higher_is_better) in current.items():
+        if name not in previous or not previous[name][0]:
+            continue
+        before = previous[name][0]
+        limit = rss_threshold if name.startswith("peak_rss_mb") else threshold
+        if higher_is_better:
+            change = (before - value) / before
+        else:
+            if name.endswith("_us") and value - before < min_delta_us:
+                continue
+            change = (value - before) / before
+        if change > limit:
+            regressions.append(f"{name}: {before:,.1f} → {value:,.1f} ({change:+.0%}, 기준 {limit:.0%})")
+    return regressions
+
+
+def report(result: Dict, baseline: Optional[Dict] = None):
+    previous = {name: value for name, (value, _) in gated_metrics(baseline).items()} if baseline else {}
+    for name, dataset in result["datasets"].items():
+        print(f"[{name}] 메시지 {dataset['messages']:,}건")
+        print(f"  {'단계':<26}{'mean_us':>10}{'p50_us':>10}{'p95_us':>10}{'p99_us':>10}")
+        for stage, s in dataset["stages"].items():
+            line = f"  {stage:<26}{s['mean_us']:>10,.1f}{s['p50_us']:>10,.1f}{s['p95_us']:>10,.1f}{s['p99_us']:>10,.1f}"
+            before = previous.get(f"{name}.{stage}.mean_us")
+            if before:
+                line += f"   (이전 평균 {before:,.1f}, x{s['mean_us'] / before:.2f})"
+            print(line)
+    if "throughput" in result:
+        print("[처리량] parse_orders")
+        single = None
+        for workers, s in result["throughput"].items():
+            single = single or s["messages_per_sec"]
+            print(f"  워커 {workers:>3}개: {s['messages_per_sec']:>10,.0f}건/초 {s['messages_per_min']:>12,.0f}건/분"
+                  f"  (x{s['messages_per_sec'] / single:.2f})")
+    rss = result["peak_rss_mb"]
+    if rss["self"] is not None:
+        print(f"[최대 RSS] 본 프로세스 {rss['self']:,.1f}MB / 워커 {rss['workers']:,.1f}MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SMSOrderAgent 벤치마크 모음 (회귀 기준 포함)")
+    parser.add_argument("--orders", default=ORDERS_PATH, help="주문 엑셀 파일 (빈 값이면 건너뜀)")
+    parser.add_argument("--guides", default=GUIDES_PATH, help="판매자 가이드 모음 (마크다운)")
+    parser.add_argument("--validation", default=VALIDATION_PATH, help="검증 CSV (빈 값이면 건너뜀)")
+    parser.add_argument("--limit", type=int, default=None, help="데이터셋별 사용할 메시지 수 (기본: 전체)")
+    parser.add_argument("--repeat", type=int, default=1, help="단계별 측정 반복 횟수")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="처리량 측정 최대 워커 수 (1..N, 0이면 건너뜀)")
+    parser.add_argument("--chunksize", type=int, default=64, help="parse_orders chunksize")
+    parser.add_argument("--save", help="결과를 저장할 JSON 경로 (기준값)")
+    parser.add_argument("--baseline", help="비교할 기준값 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="지연 시간/처리량 허용 악화 비율")
+    parser.add_argument("--rss-threshold", type=float, default=RSS_THRESHOLD, help="최대 RSS 허용 증가 비율")
+    args = parser.parse_args()
+
+    datasets = load_cases(args.orders, args.guides, args.validation, args.limit)
+    result = run_suite(datasets, args.repeat, args.workers, args.chunksize)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    report(result, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if baseline:
+        regressions = compare(result, baseline, args.threshold, args.rss_threshold)
+        if regressions:
+            print(f"\n❌ 회귀 {len(regressions)}건")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\n✅ 기준값 대비 회귀 없음")
@@ -0,0 +1,138 @@
+"""
+📅 상대 날짜 해석기
+- 오늘/내일/모레/글피, "3일 후", "2주 뒤"
+- 요일: "화요일", "이번 주 토요일", "다음주 화요일", "다다음주 월요일", "주말", "다음 주말"
+- 날짜: "2025년 12월 25일", "12월 25일(목)", "12/25", "25일"
+- 한정어: "까지"/"전까지" → by, "쯤"/"경"/"즈음" → around
+기준 시각은 주입 가능한 clock에서 읽습니다 (프롬프트에 박힌 날짜를 쓰지 않음).
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional
+
+
+WEEKDAYS = "월화수목금토일"
+
+# 한정어
+ON = "on"
+BY = "by"
+AROUND = "around"
+
+_RELATIVE_DAYS = {"오늘": 0, "금일": 0, "당일": 0, "내일": 1, "명일": 1, "내일모레": 2, "모레": 2, "글피": 3}
+_WEEK_OFFSETS = {"이번": 0, "금": 0, "다음": 1, "담": 1, "차": 1, "다다음": 2}
+
+_EXPRESSION = re.compile(
+    # 날짜 표현이 시작할 수 있는 글자에서만 분기를 시도 (숫자, 요일, 주/이번/다음, 오늘/내일/모레 ...)
+    r"(?=[\d오금당내명모글이다담차월화수목토일주])(?:"
+    r"(?P<ymd>(?P<y>\d{4})\s*년\s*(?P<y_m>\d{1,2})\s*월\s*(?P<y_d>\d{1,2})\s*일)"
+    r"|(?P<md>(?P<m>\d{1,2})\s*월\s*(?P<d>\d{1,2})\s*일)"
+    r"|(?P<slash>(?<![\d/-])(?P<s_m>\d{1,2})/(?P<s_d>\d{1,2})(?![\d/-]))"
+    r"|(?P<after>(?P<n>\d+)\s*(?P<n_unit>일|주)\s*(?:후|뒤))"
+    # "다음 주말"/"다음주말"은 "주"를 한 번만 먹도록 상대 주 뒤에는 "말"("주말"도 허용)을 붙임
+    r"|(?P<week>(?P<w_rel>다다음|이번|다음|담|차|금)\s*주\s*(?:(?P<wd>[" + WEEKDAYS + r"])요일|(?P<weekend>주?말(?!고)))"
+    r"|(?P<bare_wd>[" + WEEKDAYS + r"])요일|(?P<bare_weekend>주말))"
+    r"|(?P<day>(?<![\d/.-])(?P<only_d>\d{1,2})\s*일(?!\s*(?:후|뒤|동안|간|째|치)))"
+    r"|(?P<rel>" + "|".join(sorted(_RELATIVE_DAYS, key=len, reverse=True)) + r"))"
+)
+# "(목)" 같은 요일 표기와 "오후 6시" 같은 시각은 건너뛰고 한정어를 봅니다
+_QUALIFIER = re.compile(
+    r"\s*(?:\([" + WEEKDAYS + r"](?:요일)?\))?\s*(?:에|로)?"
+    r"\s*(?:(?:오전|오후|아침|점심|낮|저녁|밤)\s*)?(?:\d{1,2}\s*시(?:\s*\d{1,2}\s*분|\s*반)?\s*)?"
+    r"\s*(?P<q>전까지|까지|쯤|경|즈음)"
+)
+
+
+@dataclass(frozen=True)
+class ResolvedDate:
+    date: date
+    expression: str
+    qualifier: str = ON
+
+    def isoformat(self) -> str:
+        return self.date.isoformat()
+
+
+def resolve_dates(text: str, now: Optional[datetime] = None) -> List[ResolvedDate]:
+    """문장 안의 모든 날짜 표현을 기준 시각(now) 기준으로 해석합니다."""
+    today = (now or datetime.now()).date()
+    results = []
+    for m in _EXPRESSION.finditer(text or ""):
+        resolved = _resolve_match(m, today)
+        if resolved is None:
+            continue
+        q = _QUALIFIER.match(text, m.end())
+        qualifier = ON
+        if q:
+            qualifier = BY if "까지" in q.group("q") else AROUND
+        results.append(ResolvedDate(resolved, m.group(0), qualifier))
+    return results
+
+
+def resolve_date(text: str, now: Optional[datetime] = None) -> Optional[ResolvedDate]:
+    """첫 번째 날짜 표현 (없으면 None)."""
+    dates = resolve_dates(text, now)
+    return dates[0] if dates else None
+
+
+class DateResolver:
+    """clock을 주입받는 해석기: 테스트/재현 시 고정 시각, 서버에서는 datetime.now."""
+
+    def __init__(self, clock: Callable[[], datetime] = datetime.now):
+        self.clock = clock
+
+    def resolve(self, text: str) -> Optional[ResolvedDate]:
+        return resolve_date(text, self.clock())
+
+    def resolve_all(self, text: str) -> List[ResolvedDate]:
+        return resolve_dates(text, self.clock())
+
+
+def _resolve_match(m: re.Match, today: date) -> Optional[date]:
+    if m.group("ymd"):
+        return _safe_date(int(m.group("y")), int(m.group("y_m")), int(m.group("y_d")))
+    if m.group("md"):
+        return _upcoming_month_day(today, int(m.group("m")), int(m.group("d")))
+    if m.group("slash"):
+        return _upcoming_month_day(today, int(m.group("s_m")), int(m.group("s_d")))
+    if m.group("after"):
+        n = int(m.group("n"))
+        return today + timedelta(days=n if m.group("n_unit") == "일" else 7 * n)
+    if m.group("week"):
+        wd = m.group("wd") or m.group("bare_wd")
+        weekday = WEEKDAYS.index(wd) if wd else 5  # 주말 → 토요일
+        rel = m.group("w_rel")
+        if rel is None:
+            # 요일만 말하면 가장 가까운 그 요일 (오늘 포함)
+            return today + timedelta(days=(weekday - today.weekday()) % 7)
+        monday = today - timedelta(days=today.weekday())
+        return monday + timedelta(weeks=_WEEK_OFFSETS[rel], days=weekday)
+    if m.group("day"):
+        d = int(m.group("only_d"))
+        if not 1 <= d <= 31:
+            return None
+        # 이번 달에 이미 지났으면 다음 달
+        candidate = _safe_date(today.year, today.month, d)
+        if candidate is None or candidate < today:
+            year, month = (today.year + 1, 1) if today.month == 12 else (today.year, today.month + 1)
+            candidate = _safe_date(year, month, d)
+        return candidate
+    if m.group("rel"):
+        return today + timedelta(days=_RELATIVE_DAYS[m.group("rel")])
+    return None
+
+
+def _upcoming_month_day(today: date, month: int, day: int) -> Optional[date]:
+    """올해 날짜가 이미 지났으면 내년 (12월에 받은 "1월 3일" 주문)."""
+    candidate = _safe_date(today.year, month, day)
+    if candidate is not None and candidate < today:
+        candidate = _safe_date(today.year + 1, month, day)
+    return candidate
+
+
+def _safe_date(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
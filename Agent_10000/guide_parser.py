@@ -0,0 +1,389 @@
+"""
+📋 판매자 가이드 파서
+- 번호형 목록: "1번 수분크림 50ml - 32,000원", "1번 모듬세트 18000원"
+- 글머리표 목록: "• 기본 반팔티 - 19,000원 (S/M/L/XL) (화이트/블랙/그레이/네이비)"
+- 압축형 목록: "[강아지사료] 소형2kg-28,000/소형6kg-72,000"
+- 문장형 안내: "농산코너에서 콜라비(개당/국내산) 가격할인하여 판매 ... 개당 900원"
+옵션 그룹을 SKU 표로 전개하고 정규 상품명("기본 반팔티 (M) (블랙)")을 미리 계산합니다.
+"""
+
+import itertools
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+# 상품 목록이 아닌 섹션 (이 헤더 아래의 줄은 상품으로 보지 않음)
+SKIP_SECTION_KEYWORDS = ("주문 양식", "주문양식", "주문 방법", "요청", "배송 안내", "결제", "문의", "불가")
+PRODUCT_SECTION_KEYWORDS = ("상품 목록", "상품목록", "상품 안내")
+
+# 옵션이 아닌 규격/원산지 괄호: "(개당/국내산)", "(5kg/박스/국내산)"
+SPEC_TOKENS = ("국내산", "수입산", "국산", "개당", "박스", "팩", "봉지", "마리")
+
+UNIT_WORDS = ("박스", "봉지", "마리", "팩", "봉", "개", "통", "병", "세트", "장", "kg", "g")
+
+# 한 상품에서 전개할 SKU 최대 개수 (옵션 조합 폭증 방지)
+MAX_SKUS_PER_PRODUCT = 500
+
+_BULLET = re.compile(r"^[•·\-*▶►✔︎]+\s*")
+_NUMBERED = re.compile(r"^(\d+)\s*번[.)]?\s*(.+)$")
+_SECTION = re.compile(r"^[\[(]([^\])]+)[\])]\s*(.*)$")
+_RULE_LINE = re.compile(r"^[━─=\-_~]{3,}$")
+_NAME_PRICE = re.compile(
+    r"(?P<name>[^\n/\-–:：\]]+?)\s*[-–:：]\s*(?P<price>\d{1,3}(?:,\d{3})+|\d+)(?P<won>\s*원)?"
+)
+_LOOSE_PRICE = re.compile(r"(?P<price>\d{1,3}(?:,\d{3})+|\d{4,})\s*원")
+_PAREN_GROUP = re.compile(r"\s*\(([^()]*)\)")
+_VARIANT_BASE = re.compile(r"^(.*?)(?=[\d(]|$)")
+
+# 문장형 안내의 상품명 (우선순위 순):
+# "육회는 ...", "OO코너에서 콜라비(...) 가격할인", "손질 생물옥돔(3마리/국내산)", "생물참조기 판매합니다", "톱밥꽃게 입고"
+_HEADLINE_PATTERNS = [
+    re.compile(r"^(?P<name>[가-힣A-Za-z0-9]+)(?:은|는)\s"),
+    re.compile(r"코너에서\s*(?P<name>[가-힣A-Za-z ]+?)\s*(?:\([^)]*\))?\s*(?:을|를)?\s*(?:가격|할인|행사|입고|판매)"),
+    re.compile(r"^(?P<name>[가-힣A-Za-z ]+?)\s*\([^)]*(?:국내산|수입산|국산)[^)]*\)"),
+    re.compile(r"(?P<name>[가-힣A-Za-z]+)(?<![에서지여고])\s*(?:\([^)]*\))?\s*(?:을|를)?\s*(?:판매합니다|판매하고|판매중|입고)"),
+]
+_UNIT_PRICE_HINT = re.compile(r"(?:(?P<per>[가-힣A-Za-z]+)당|(?P<qty>\d+(?:\.\d+)?)\s*(?P<unit>" + "|".join(UNIT_WORDS) + r"))")
+
+
+@dataclass
+class GuideProduct:
+    name: str                                   # 옵션 그룹을 뺀 기본 상품명
+    price: int
+    code: Optional[str] = None                  # "N번" 상품의 번호
+    unit: str = "개"
+    section: Optional[str] = None
+    option_groups: List[List[str]] = field(default_factory=list)
+    raw_name: str = ""                          # 가이드에 적힌 그대로의 상품명
+
+    @property
+    def display_name(self) -> str:
+        return f"{self.code}번 {self.name}" if self.code else self.name
+
+    def canonical_name(self, options: Tuple[str, ...] = ()) -> str:
+        """옵션 그룹 순서대로 선택값을 붙인 정규 상품명: '기본 반팔티 (M) (블랙)'"""
+        return self.display_name + "".join(f" ({o})" for o in options)
+
+
+@dataclass
+class SKU:
+    sku_id: str
+    product: GuideProduct
+    options: Tuple[str, ...]
+    canonical_name: str
+    price: int
+
+
+@dataclass
+class OptionResolution:
+    product: Optional[GuideProduct]
+    selected: List[Optional[str]]               # 옵션 그룹별 선택값 (미선택은 None)
+    sku: Optional[SKU] = None
+
+    @property
+    def missing_groups(self) -> List[List[str]]:
+        if not self.product:
+            return []
+        return [g for g, s in zip(self.product.option_groups, self.selected) if s is None]
+
+    @property
+    def is_complete(self) -> bool:
+        return self.product is not None and not self.missing_groups
+
+
+@dataclass
+class ParsedGuide:
+    seller_name: str = ""
+    bank_account: str = ""
+    free_shipping_threshold: int = 50000
+    shipping_fee: int = 3000
+    shipping_stated: bool = False                          # 가이드에 배송비가 명시되어 있는지 (아니면 기본값)
+    products: List[GuideProduct] = field(default_factory=list)
+    skus: Dict[str, SKU] = field(default_factory=dict)     # 정규 상품명 -> SKU
+
+    def find_product(self, text: str) -> Optional[GuideProduct]:
+        """'6번', '6번 쿠션팩트', '쿠션팩트 (21호)' 등에서 상품을 찾습니다."""
+        text = text.strip()
+        m = re.match(r"^(\d+)\s*번", text)
+        if m:
+            for p in self.products:
+                if p.code == m.group(1):
+                    return p
+        base = _normalize(_PAREN_GROUP.sub("", re.sub(r"^\d+\s*번\s*", "", text)))
+        for p in self.products:
+            if _normalize(p.name) == base:
+                return p
+        return None
+
+    def resolve_options(self, product: GuideProduct, option_text: str) -> OptionResolution:
+        """자유 형식 옵션 문자열('블랙/M', '(M) (블랙)', 'M 블랙')을 옵션 그룹에 배정합니다."""
+        tokens = [t for t in re.split(r"[\s/(),]+", option_text) if t]
+        selected: List[Optional[str]] = []
+        for group in product.option_groups:
+            lowered = {v.lower(): v for v in group}
+            choice = next((lowered[t.lower()] for t in tokens if t.lower() in lowered), None)
+            selected.append(choice)
+        resolution = OptionResolution(product, selected)
+        if resolution.is_complete:
+            resolution.sku = self.skus.get(product.canonical_name(tuple(selected)))
+        return resolution
+
+    def resolve(self, product_text: str, option_text: str = "") -> OptionResolution:
+        """상품명(+옵션)을 정규 SKU로 해석합니다. 상품명 안의 괄호 옵션도 읽습니다."""
+        product = self.find_product(product_text)
+        if product is None:
+            return OptionResolution(None, [])
+        inline = " ".join(_PAREN_GROUP.findall(product_text))
+        return self.resolve_options(product, f"{inline} {option_text}")
+
+
+def parse_guide(text: str) -> ParsedGuide:
+    """판매자 가이드 전체를 파싱합니다."""
+    guide = ParsedGuide()
+    guide.seller_name = _extract_seller_name(text)
+    guide.bank_account = _extract_bank_account(text)
+    guide.free_shipping_threshold, guide.shipping_fee, guide.shipping_stated = _extract_shipping(text, guide)
+
+    section, skip = None, False
+    for raw in text.splitlines():
+        line = _BULLET.sub("", raw.strip()).strip()
+        if not line or _RULE_LINE.match(line):
+            continue
+
+        header = _section_header(line)
+        if header is not None:
+            section, rest = header
+            skip = _is_skip_section(section)
+            if not rest:
+                continue
+            line = rest  # 압축형: "[카테고리] 상품-가격/상품-가격"
+        elif _is_heading_line(line):
+            skip = _is_skip_section(line)
+            section = None if skip else section
+            continue
+
+        if skip:
+            continue
+        for product in parse_product_line(line, section):
+            guide.products.append(product)
+
+    if not guide.products:
+        guide.products = _parse_sentence_listing(text)
+
+    _dedupe_codes(guide.products)
+    guide.skus = expand_skus(guide.products)
+    return guide
+
+
+def parse_product_line(line: str, section: Optional[str] = None) -> List[GuideProduct]:
+    """상품 한 줄을 파싱합니다. 한 줄에 여러 상품(용량 변형, 압축형)이 있을 수 있습니다."""
+    line = _BULLET.sub("", line.strip())
+    m = _NUMBERED.match(line)
+    if m:
+        return [_numbered_product(m.group(1), m.group(2), section)]
+
+    products: List[GuideProduct] = []
+    # 괄호 안의 '-'나 '/'("(4-8kg)", "(가정식/매콤)")는 구분자가 아니므로 가린 뒤 매칭합니다.
+    matches = list(_NAME_PRICE.finditer(_mask_parens(line)))
+    previous = None
+    for i, m in enumerate(matches):
+        price = m.group("price")
+        # '원'이 없으면 천 단위 쉼표가 있는 숫자만 가격으로 봅니다 ('1-2일 소요' 제외).
+        if not m.group("won") and "," not in price:
+            continue
+        head = line[m.start("name"):m.end("name")].strip()
+        if not head or head.startswith(("+", "(+")) or _is_spec_word(head):
+            continue
+        if previous and (head[0].isdigit() or head[0] == "("):
+            head = _VARIANT_BASE.match(previous).group(1) + head
+        else:
+            previous = head
+        tail_end = matches[i + 1].start() if i + 1 < len(matches) else len(line)
+        tail = line[m.end():tail_end]
+        products.append(_build_product(head, tail, _to_int(price), None, section))
+    return products
+
+
+def expand_skus(products: List[GuideProduct]) -> Dict[str, SKU]:
+    """옵션 그룹의 모든 조합을 SKU로 전개합니다 (옵션이 없는 상품은 SKU 1개)."""
+    skus: Dict[str, SKU] = {}
+    for index, product in enumerate(products, 1):
+        combos = itertools.islice(itertools.product(*product.option_groups), MAX_SKUS_PER_PRODUCT)
+        for n, options in enumerate(combos, 1):
+            name = product.canonical_name(options)
+            skus[name] = SKU(f"P{index:03d}-{n:03d}", product, options, name, product.price)
+    return skus
+
+
+# ===== 내부 함수 =====
+
+def _numbered_product(code: str, body: str, section: Optional[str]) -> GuideProduct:
+    m = _NAME_PRICE.search(_mask_parens(body))
+    if m and (m.group("won") or "," in m.group("price")):
+        head, tail, price = body[m.start("name"):m.end("name")], body[m.end():], _to_int(m.group("price"))
+    else:
+        m = _LOOSE_PRICE.search(body)  # "1번 모듬세트 18000원"
+        if m:
+            head, tail, price = body[:m.start()], body[m.end():], _to_int(m.group("price"))
+        else:
+            head, tail, price = body, "", 0  # 가격 없는 목록 ("1번 제주몸국")
+    return _build_product(head, tail, price, code, section)
+
+
+def _build_product(head: str, tail: str, price: int, code: Optional[str], section: Optional[str]) -> GuideProduct:
+    head = head.strip(" -–:")
+    groups: List[List[str]] = []
+    for group_text in _PAREN_GROUP.findall(head) + _PAREN_GROUP.findall(tail):
+        group = _option_group(group_text)
+        if group and group not in groups:
+            groups.append(group)
+
+    # 옵션 그룹 괄호만 이름에서 제거 ("(소스포함)", "(250개 한정)"은 이름에 남김)
+    name = _PAREN_GROUP.sub(lambda m: "" if _option_group(m.group(1)) else m.group(0), head)
+    name = re.sub(r"\s+", " ", name).strip()
+    return GuideProduct(name=name, price=price, code=code, section=section,
+                        option_groups=groups, raw_name=head.strip())
+
+
+def _option_group(group_text: str) -> Optional[List[str]]:
+    if "/" not in group_text:
+        return None
+    values = [v.strip() for v in group_text.split("/") if v.strip()]
+    if len(values) < 2 or any(t in v for v in values for t in SPEC_TOKENS):
+        return None
+    return values
+
+
+def _parse_sentence_listing(text: str) -> List[GuideProduct]:
+    """목록이 없는 문장형 안내에서 상품명/가격/단위를 추출합니다."""
+    headline = None
+    for pattern in _HEADLINE_PATTERNS:
+        m = next(filter(None, (pattern.search(line.strip()) for line in text.splitlines())), None)
+        if m:
+            headline = m.group("name").strip()
+            break
+
+    products, seen = [], set()
+    for line in text.splitlines():
+        for m in _LOOSE_PRICE.finditer(line) if "원" in line else []:
+            # 헤드라인 상품명을 우선 사용하고, 없으면 가격 앞의 단어 ("1마리" 같은 수량 표현 제외)
+            before = re.sub(r"[^가-힣A-Za-z0-9 ]", " ", line[:m.start()]).strip()
+            words = [w for w in before.split() if not _is_quantity_word(w)]
+            name = headline or (words[-1] if words else "")
+            if not name:
+                continue
+            price = _to_int(m.group("price"))
+            if (name, price) in seen:
+                continue
+            seen.add((name, price))
+            products.append(GuideProduct(name=name, price=price, unit=_infer_unit(line), raw_name=name))
+    return products
+
+
+def _mask_parens(text: str) -> str:
+    """괄호 안의 글자를 '_'로 바꿉니다 (길이 유지: 매칭 위치를 원문에 그대로 사용)."""
+    out, depth = [], 0
+    for ch in text:
+        if ch == "(":
+            depth += 1
+        elif ch == ")" and depth:
+            depth -= 1
+        elif depth:
+            ch = "_"
+        out.append(ch)
+    return "".join(out)
+
+
+def _is_spec_word(word: str) -> bool:
+    """'국내산', '5kg' 처럼 상품명이 아닌 규격 표기"""
+    return word in SPEC_TOKENS or _is_quantity_word(word)
+
+
+def _is_quantity_word(word: str) -> bool:
+    return bool(re.match(r"^(?:\d+(?:\.\d+)?\s*(?:" + "|".join(UNIT_WORDS) + r")?|[가-힣]*당|한[가-힣]+)$", word))
+
+
+def _infer_unit(line: str) -> str:
+    m = _UNIT_PRICE_HINT.search(line)
+    if m:
+        if m.group("per"):
+            return m.group("per") if m.group("per") in UNIT_WORDS else "개"
+        if m.group("unit") not in ("kg", "g"):
+            return m.group("unit")
+    for unit in ("박스", "봉지", "팩", "마리"):
+        if f"/{unit}" in line:
+            return unit
+    return "개"
+
+
+def _section_header(line: str) -> Optional[Tuple[str, str]]:
+    m = _SECTION.match(line)
+    if not m:
+        return None
+    # "(21호/23호)"처럼 괄호 안에 옵션만 있는 줄이나 "(이번 회차는 ...)" 같은 안내 문장은 섹션이 아님
+    # ("[원피스/스커트]"처럼 대괄호 머리글의 "/"는 카테고리 구분이므로 섹션으로 둠)
+    if line.startswith("(") and "/" in m.group(1) and not m.group(2) or len(m.group(1)) > 20:
+        return None
+    return m.group(1).strip(), m.group(2).strip()
+
+
+def _is_heading_line(line: str) -> bool:
+    """'📝 주문 방법', '✅ 요청 가능 사항' 같은 이모지 헤더 줄"""
+    if any(ch.isdigit() for ch in line) or len(line) > 20:
+        return False
+    return any(k in line for k in SKIP_SECTION_KEYWORDS + PRODUCT_SECTION_KEYWORDS)
+
+
+def _is_skip_section(title: str) -> bool:
+    if any(k in title for k in PRODUCT_SECTION_KEYWORDS):
+        return False
+    return any(k in title for k in SKIP_SECTION_KEYWORDS)
+
+
+def _dedupe_codes(products: List[GuideProduct]):
+    """같은 번호가 반복되면 첫 번째 상품만 번호를 유지합니다."""
+    seen = set()
+    for p in products:
+        if p.code in seen:
+            p.code = None
+        elif p.code:
+            seen.add(p.code)
+
+
+def _extract_seller_name(text: str) -> str:
+    m = re.search(r'([가-힣]+(?:마켓|샵|몰|스토어|공구|팜|마트|하우스|프렌즈|웨어|데코|맘))(?:에서)?', text)
+    if m:
+        return m.group(1)
+    m = re.search(r"\[([^\]]+)\]", text.strip().split("\n", 1)[0])
+    return m.group(1).strip() if m else ""
+
+
+def _extract_bank_account(text: str) -> str:
+    m = re.search(r'(?:입금계좌|계좌)[:\s]*([가-힣]+)\s*([\d-]+)', text)
+    if m:
+        return f"{m.group(1)} {m.group(2)}"
+    # "• 국민은행 123-456-789012 (주)뷰티하우스"
+    m = re.search(r'([가-힣]{2,6}?)(?:은행)?\s+(\d{2,6}-\d{2,6}-\d{2,8}(?:-\d{1,3})?)', text)
+    if m:
+        return f"{m.group(1)} {m.group(2)}"
+    return ""
+
+
+def _extract_shipping(text: str, guide: ParsedGuide) -> Tuple[int, int, bool]:
+    threshold, fee = guide.free_shipping_threshold, guide.shipping_fee
+    m = re.search(r'(\d[\d,]*)\s*(만)?\s*원?\s*(?:이상|↑)\s*무료배송', text)
+    if m:
+        threshold = _to_int(m.group(1)) * (10000 if m.group(2) else 1)
+    m = re.search(r'(?:배송비|미만(?:\s*시)?)\s*(?:배송비\s*)?([\d,]+)원', text)
+    if m:
+        fee = _to_int(m.group(1))
+    return threshold, fee, m is not None
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"\s+", "", name).lower()
+
+
+def _to_int(value: str) -> int:
+    return int(value.replace(",", ""))
@@ -0,0 +1,184 @@
+"""
+🧱 ParsedOrder 묶음의 열 지향(columnar) 저장
+- 문자열 열은 열마다 값 사전 + int32 코드 배열 (같은 상품명/날짜는 한 번만 저장, None은 -1)
+- 금액/수량은 int64 배열, 주문별 상품은 offsets로 나눈 가변 길이 배열 (items[offsets[i]:offsets[i+1]])
+- 누락 필드는 비트마스크 한 바이트, 해석하지 못한 상품 줄은 줄바꿈으로 이은 문자열 하나 (없으면 None)
+- to_arrow()/to_pandas()는 배열 버퍼를 그대로 넘겨 행 단위 객체를 만들지 않음 (pyarrow/pandas는 필요할 때만 import)
+- settle()은 상품 배열을 그대로 pricing_kernel에 넘겨 주문별 배송비/결제금액을 한 번에 계산 (numpy)
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sms_order_agent import OrderItem, ParsedOrder
+
+
+MISSING_FIELDS = ("customer_name", "contact_number", "delivery_address", "items")
+
+ORDER_STRING_FIELDS = ("customer_name", "contact_number", "delivery_address", "special_requests",
+                       "payment_info", "desired_delivery_date", "order_date")
+ITEM_STRING_FIELDS = ("product_code", "product_name", "option", "unit")
+ITEM_INT_FIELDS = ("unit_price", "quantity", "subtotal")
+
+
+class StringColumn:
+    """사전 인코딩 문자열 열: values(고유값 목록) + codes(int32, None은 -1)"""
+
+    __slots__ = ("values", "codes", "_index")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes = array("i")
+        self._index: Dict[str, int] = {}
+
+    def append(self, value: Optional[str]):
+        if value is None:
+            self.codes.append(-1)
+            return
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        code = self.codes[i]
+        return None if code < 0 else self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class ParsedOrderBatch:
+    """
+    ParsedOrder 여러 건을 열 배열로 보관합니다.
+    주문 열: 문자열(ORDER_STRING_FIELDS), expected_amount, confidence, missing(비트마스크), unmatched
+    상품 열: 문자열(ITEM_STRING_FIELDS), 정수(ITEM_INT_FIELDS), 주문 i의 상품은 item_offsets[i]:item_offsets[i+1]
+    """
+
+    def __init__(self):
+        self.strings = {name: StringColumn() for name in ORDER_STRING_FIELDS}
+        self.expected_amount = array("q")
+        self.confidence = array("d")
+        self.missing = array("B")
+        self.unmatched = StringColumn()
+        self.item_offsets = array("q", [0])
+        self.item_strings = {name: StringColumn() for name in ITEM_STRING_FIELDS}
+        self.item_ints = {name: array("q") for name in ITEM_INT_FIELDS}
+
+    @classmethod
+    def from_orders(cls, orders: Iterable[ParsedOrder]) -> "ParsedOrderBatch":
+        batch = cls()
+        batch.extend(orders)
+        return batch
+
+    def append(self, order: ParsedOrder):
+        for name, column in self.strings.items():
+            column.append(getattr(order, name))
+        self.expected_amount.append(order.expected_amount)
+        self.confidence.append(order.confidence)
+        self.missing.append(sum(1 << i for i, name in enumerate(MISSING_FIELDS) if name in order.missing_fields))
+        self.unmatched.append("\n".join(order.unmatched_items) or None)
+        for item in order.items:
+            for name, column in self.item_strings.items():
+                column.append(getattr(item, name))
+            for name, values in self.item_ints.items():
+                values.append(getattr(item, name))
+        self.item_offsets.append(self.item_offsets[-1] + len(order.items))
+
+    def extend(self, orders: Iterable[ParsedOrder]):
+        for order in orders:
+            self.append(order)
+
+    def __len__(self) -> int:
+        return len(self.expected_amount)
+
+    @property
+    def item_count(self) -> int:
+        return self.item_offsets[-1]
+
+    def __getitem__(self, i: int) -> ParsedOrder:
+        """i번째 주문을 ParsedOrder로 되돌립니다 (필요한 행만)."""
+        if i < 0:
+            i += len(self)
+        start, end = self.item_offsets[i], self.item_offsets[i + 1]
+        items = [
+            OrderItem(**{name: column[j] for name, column in self.item_strings.items()},
+                      **{name: values[j] for name, values in self.item_ints.items()})
+            for j in range(start, end)
+        ]
+        mask = self.missing[i]
+        unmatched = self.unmatched[i]
+        return ParsedOrder(
+            **{name: column[i] for name, column in self.strings.items()},
+            items=items,
+            expected_amount=self.expected_amount[i],
+            confidence=self.confidence[i],
+            missing_fields=[name for bit, name in enumerate(MISSING_FIELDS) if mask >> bit & 1],
+            unmatched_items=unmatched.split("\n") if unmatched else []
+        )
+
+    def __iter__(self) -> Iterator[ParsedOrder]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def settle(self, free_shipping_threshold=50000, shipping_fee=3000, seller_index=None):
+        """
+        주문별 상품금액/배송비/결제금액을 한 번에 계산합니다 (pricing_kernel.settle, numpy 필요).
+        판매자가 섞인 묶음은 규칙 배열(pricing_kernel.shipping_rules)과 주문별 seller_index를 넘깁니다.
+        """
+        import numpy as np
+        from pricing_kernel import settle
+
+        offsets = np.frombuffer(self.item_offsets, dtype=np.int64)
+        return settle(np.repeat(np.arange(len(self)), np.diff(offsets)),
+                      np.frombuffer(self.item_ints["unit_price"], dtype=np.int64),
+                      np.frombuffer(self.item_ints["quantity"], dtype=np.int64),
+                      len(self), free_shipping_threshold, shipping_fee, seller_index)
+
+    def to_arrow(self):
+        """주문 한 행 = 한 레코드, items는 list<struct> 열 (offsets 그대로 사용)"""
+        import numpy as np
+        import pyarrow as pa
+
+        def strings(column: StringColumn):
+            codes = np.frombuffer(column.codes, dtype=np.int32)
+            return pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0),
+                                                  pa.array(column.values, type=pa.string()))
+
+        items = pa.StructArray.from_arrays(
+            [strings(c) for c in self.item_strings.values()]
+            + [pa.array(np.frombuffer(v, dtype=np.int64)) for v in self.item_ints.values()],
+            names=list(self.item_strings) + list(self.item_ints)
+        )
+        columns = {name: strings(column) for name, column in self.strings.items()}
+        columns["items"] = pa.LargeListArray.from_arrays(
+            pa.array(np.frombuffer(self.item_offsets, dtype=np.int64)), items)
+        columns["expected_amount"] = pa.array(np.frombuffer(self.expected_amount, dtype=np.int64))
+        columns["confidence"] = pa.array(np.frombuffer(self.confidence, dtype=np.float64))
+        columns["missing"] = pa.array(np.frombuffer(self.missing, dtype=np.uint8))
+        columns["unmatched"] = strings(self.unmatched)
+        return pa.table(columns)
+
+    def to_pandas(self):
+        """(주문 DataFrame, 상품 DataFrame). 상품의 order 열이 주문 행 번호입니다. 문자열 열은 category."""
+        import numpy as np
+        import pandas as pd
+
+        def strings(column: StringColumn):
+            return pd.Categorical.from_codes(np.frombuffer(column.codes, dtype=np.int32),
+                                             categories=pd.Index(column.values, dtype=object))
+
+        orders = pd.DataFrame({name: strings(column) for name, column in self.strings.items()})
+        orders["expected_amount"] = np.frombuffer(self.expected_amount, dtype=np.int64)
+        orders["confidence"] = np.frombuffer(self.confidence, dtype=np.float64)
+        orders["missing"] = np.frombuffer(self.missing, dtype=np.uint8)
+        orders["unmatched"] = strings(self.unmatched)
+
+        offsets = np.frombuffer(self.item_offsets, dtype=np.int64)
+        items = pd.DataFrame({"order": np.repeat(np.arange(len(self)), np.diff(offsets))})
+        for name, column in self.item_strings.items():
+            items[name] = strings(column)
+        for name, values in self.item_ints.items():
+            items[name] = np.frombuffer(values, dtype=np.int64)
+        return orders, items
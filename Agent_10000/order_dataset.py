@@ -0,0 +1,177 @@
+"""
+📂 주문 데이터셋 스트리밍 리더
+- xlsx: openpyxl read-only 모드로 한 행씩 읽어 주문 단위(원본메시지 + 상품 행들)로 묶어 반환
+- CSV: 앞부분 바이트로 인코딩을 한 번만 판별 (utf-8-sig → utf-8 → cp949) 후 csv 모듈로 한 행씩 반환
+- 모두 제너레이터: 1만 건이든 1천만 건이든 메모리는 주문 한 건 분량만 사용
+"""
+
+import ast
+import codecs
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+
+ENCODINGS = ("utf-8-sig", "utf-8", "cp949")
+SNIFF_BYTES = 64 * 1024
+
+
+@dataclass
+class DatasetItem:
+    product_code: str
+    product_name: str
+    option: str
+    unit: str
+    quantity: int
+    unit_price: int
+    subtotal: int
+
+
+@dataclass
+class DatasetOrder:
+    """general_orders_10000.xlsx의 주문 한 건 (상품이 여러 개면 원본메시지가 빈 후속 행들을 묶음)"""
+    order_id: str
+    customer_id: str
+    category: str
+    message: str
+    customer_name: str = ""
+    contact_number: str = ""
+    delivery_address: str = ""
+    special_requests: str = ""
+    total_amount: int = 0
+    reorder: bool = False
+    items: List[DatasetItem] = field(default_factory=list)
+
+
+@dataclass
+class ValidationCase:
+    """검증 CSV 한 행 (no, guide, order, source, label)"""
+    no: int
+    guide: str
+    order: str
+    source: str = ""
+    label: Optional[str] = None
+
+    @property
+    def label_data(self) -> Optional[Dict[str, Any]]:
+        """label 문자열 → dict (JSON, 실패 시 파이썬 dict 표기). 없거나 해석 불가면 None."""
+        if not self.label:
+            return None
+        try:
+            return json.loads(self.label)
+        except ValueError:
+            try:
+                return ast.literal_eval(self.label)
+            except (ValueError, SyntaxError):
+                return None
+
+
+def sniff_encoding(path: str, candidates=ENCODINGS, sample_bytes: int = SNIFF_BYTES) -> str:
+    """파일 앞부분만 읽어 디코딩되는 첫 인코딩을 반환합니다 (샘플 끝에서 잘린 글자는 무시)."""
+    with open(path, "rb") as f:
+        sample = f.read(sample_bytes)
+    for encoding in candidates:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return candidates[-1]
+
+
+def iter_csv_rows(path: str, encoding: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """CSV를 한 행씩 dict로 반환합니다 (인코딩은 지정하지 않으면 한 번 판별)."""
+    encoding = encoding or sniff_encoding(path)
+    with open(path, "r", encoding=encoding, newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def iter_validation_cases(path: str, encoding: Optional[str] = None) -> Iterator[ValidationCase]:
+    """검증 CSV → ValidationCase (no가 빈 행은 건너뜀)"""
+    for row in iter_csv_rows(path, encoding):
+        no = _to_int(row.get("no"))
+        if no is None:
+            continue
+        yield ValidationCase(
+            no=no,
+            guide=(row.get("guide") or "").replace("\r\n", "\n"),
+            order=row.get("order") or "",
+            source=row.get("source") or "",
+            label=row.get("label") or None
+        )
+
+
+def iter_xlsx_orders(path: str) -> Iterator[DatasetOrder]:
+    """
+    주문 엑셀(주문번호/고객ID/카테고리/원본메시지/.../상품명/옵션/단위/수량/단가/소계/...)을 주문 단위로 반환합니다.
+    원본메시지가 있는 행이 새 주문을 시작하고, 원본메시지가 빈 행은 직전 주문의 상품으로 붙습니다.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        col = {name: i for i, name in enumerate(header) if name}
+
+        def cell(row, name):
+            i = col.get(name)
+            value = row[i] if i is not None and i < len(row) else None
+            return "" if value is None else str(value)
+
+        current: Optional[DatasetOrder] = None
+        for row in rows:
+            message = cell(row, "원본메시지")
+            if message:
+                if current is not None:
+                    yield current
+                current = DatasetOrder(
+                    order_id=cell(row, "주문번호"),
+                    customer_id=cell(row, "고객ID"),
+                    category=cell(row, "카테고리"),
+                    message=message,
+                    customer_name=cell(row, "고객명"),
+                    contact_number=cell(row, "전화번호"),
+                    delivery_address=cell(row, "주소"),
+                    special_requests=cell(row, "요청사항"),
+                    total_amount=_to_int(cell(row, "총주문금액")) or 0,
+                    reorder=cell(row, "재주문여부").upper() == "Y"
+                )
+            elif current is None:
+                continue
+            current.items.append(DatasetItem(
+                product_code=cell(row, "상품코드"),
+                product_name=cell(row, "상품명"),
+                option=cell(row, "옵션"),
+                unit=cell(row, "단위"),
+                quantity=_to_int(cell(row, "수량")) or 0,
+                unit_price=_to_int(cell(row, "단가")) or 0,
+                subtotal=_to_int(cell(row, "소계")) or 0
+            ))
+        if current is not None:
+            yield current
+    finally:
+        wb.close()
+
+
+def iter_dataset(path: str):
+    """확장자로 판별: .xlsx → DatasetOrder, .csv → ValidationCase"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xlsm"):
+        return iter_xlsx_orders(path)
+    if ext == ".csv":
+        return iter_validation_cases(path)
+    raise ValueError(f"지원하지 않는 데이터셋 형식입니다: {path}")
+
+
+def _to_int(value) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(float(str(value).replace(",", "")))
+    except ValueError:
+        return None
@@ -0,0 +1,169 @@
+"""
+🪞 중복 주문 문자 탐지 (MinHash + LSH)
+- 포워딩/재전송된 같은 주문을 parse_order·LLM 호출 전에 걸러냄
+- 정규화(NFKC, 소문자, 한글·영문·숫자만) → 글자 n-gram 집합 → MinHash 서명
+  (순열 하나로 해시를 num_perm개 칸에 나눠 칸별 최솟값, 빈 칸은 오른쪽 첫 값으로 채움 → n-gram 수에 비례하는 한 번의 순회)
+- LSH: 서명을 bands개 묶음으로 나눠 (발신자, 묶음 번호, 묶음 값)을 버킷 키로 사용
+  → 같은 발신자의 같은 버킷에 들어간 메시지만 후보, 전체 기록과 비교하지 않음 (메시지 수와 무관)
+- 후보는 n-gram 집합의 실제 Jaccard 유사도로 확인 (threshold 이상이면 중복)
+- 수량/상품 번호가 다른 재주문은 합치지 않음: 세 자리 이하 숫자 목록이 같아야 중복 ("1번 2개" ≠ "1번 3개")
+- window보다 오래된 기록은 들어온 순서대로 버킷에서 제거
+- n-gram 해시는 파이썬 hash(프로세스마다 다른 시드)를 쓰므로 서명은 같은 프로세스 안에서만 비교
+"""
+
+import re
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+
+NUM_PERM = 32
+BANDS = 8
+SHINGLE = 3
+THRESHOLD = 0.8
+WINDOW = timedelta(minutes=10)
+
+MASK64 = (1 << 64) - 1
+EMPTY = 1 << 64
+
+_NOT_WORD = re.compile(r'[^0-9a-z가-힣]+')
+_SMALL_NUMBER = re.compile(r'(?<!\d)\d{1,3}(?!\d)')
+
+
+def normalize(text: str) -> str:
+    """비교용 정규화: 전각/반각 통일, 소문자, 공백·기호 제거 ("010-1234-5678"과 "01012345678"은 같음)"""
+    return _NOT_WORD.sub("", unicodedata.normalize("NFKC", text).lower())
+
+
+def shingles(text: str, k: int = SHINGLE) -> FrozenSet[int]:
+    """정규화된 문자열의 글자 k-gram 해시 집합 (k보다 짧으면 문자열 전체 하나)"""
+    if len(text) <= k:
+        return frozenset((hash(text) & MASK64,)) if text else frozenset()
+    return frozenset(hash(text[i:i + k]) & MASK64 for i in range(len(text) - k + 1))
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass(slots=True, eq=False)
+class SeenMessage:
+    """창(window) 안에 기록된 메시지. value에는 호출자가 처리 결과를 붙여 둘 수 있음 (중복이면 재사용)"""
+    sender: str
+    received_at: datetime
+    shingles: FrozenSet[int]
+    numbers: Tuple[str, ...]
+    bucket_keys: Tuple[Tuple[str, int, Tuple[int, ...]], ...]
+    value: Any = None
+
+
+@dataclass(slots=True)
+class DedupeResult:
+    entry: Optional[SeenMessage]                # 새로 기록된 메시지 (중복이면 None)
+    duplicate_of: Optional[SeenMessage] = None  # 먼저 온 원본
+    similarity: float = 0.0
+
+    @property
+    def is_duplicate(self) -> bool:
+        return self.duplicate_of is not None
+
+
+class OrderDeduper:
+    """
+    발신자별 최근 메시지의 MinHash/LSH 색인.
+    check()는 같은 발신자의 window 안 메시지 중 유사도가 threshold 이상인 원본을 찾고,
+    없으면 새 메시지를 기록합니다 (중복은 기록하지 않으므로 창은 원본 시각 기준).
+    bands × rows = num_perm, 후보가 되는 유사도 기준은 대략 (1/bands)^(1/rows)
+    """
+
+    def __init__(self, window: timedelta = WINDOW, threshold: float = THRESHOLD, num_perm: int = NUM_PERM,
+                 bands: int = BANDS, shingle: int = SHINGLE,
+                 clock: Callable[[], datetime] = datetime.now):
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})의 배수여야 합니다")
+        self.window = window
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle = shingle
+        self.clock = clock
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], List[SeenMessage]] = {}
+        self._entries: "deque[SeenMessage]" = deque()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def signature(self, grams: FrozenSet[int]) -> List[int]:
+        """칸 = 해시 % num_perm, 값 = 해시 // num_perm의 칸별 최솟값. 빈 칸은 오른쪽(순환) 첫 칸 값 + 거리 × EMPTY."""
+        n = self.num_perm
+        if not grams:
+            return [0] * n
+        bins = [EMPTY] * n
+        for h in grams:
+            b = h % n
+            v = h // n
+            if v < bins[b]:
+                bins[b] = v
+        signature = list(bins)
+        for b in range(n):
+            if bins[b] == EMPTY:
+                distance = 1
+                while bins[(b + distance) % n] == EMPTY:
+                    distance += 1
+                signature[b] = bins[(b + distance) % n] + distance * EMPTY
+        return signature
+
+    def check(self, sender: str, text: str, received_at: Optional[datetime] = None) -> DedupeResult:
+        received_at = received_at or self.clock()
+        self.expire(received_at)
+
+        normalized = normalize(text)
+        grams = shingles(normalized, self.shingle)
+        numbers = tuple(sorted(_SMALL_NUMBER.findall(normalized)))
+        signature = self.signature(grams)
+        rows = self.rows
+        keys = tuple((sender, band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands))
+
+        best, best_similarity = None, 0.0
+        checked = set()
+        for key in keys:
+            for seen in self._buckets.get(key, ()):
+                if seen in checked:
+                    continue
+                checked.add(seen)
+                if seen.numbers != numbers:
+                    continue
+                similarity = jaccard(grams, seen.shingles)
+                if similarity >= self.threshold and similarity > best_similarity:
+                    best, best_similarity = seen, similarity
+        if best is not None:
+            return DedupeResult(None, best, best_similarity)
+
+        entry = SeenMessage(sender, received_at, grams, numbers, keys)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(entry)
+        self._entries.append(entry)
+        return DedupeResult(entry)
+
+    def expire(self, now: Optional[datetime] = None):
+        """window보다 오래된 기록을 버킷에서 제거 (들어온 순서대로이므로 앞쪽만 확인)"""
+        now = now or self.clock()
+        entries = self._entries
+        while entries and now - entries[0].received_at > self.window:
+            entry = entries.popleft()
+            for key in entry.bucket_keys:
+                bucket = self._buckets[key]
+                bucket.remove(entry)
+                if not bucket:
+                    del self._buckets[key]
+
+    def filter(self, messages: Iterable[Tuple[str, str, Optional[datetime]]]) -> Iterator[Tuple[str, str, Optional[datetime]]]:
+        """(발신자, 메시지, 수신 시각) 흐름에서 중복을 빼고 원본만 반환합니다 (수신 시각 순서로 들어와야 함)."""
+        for sender, text, received_at in messages:
+            if not self.check(sender, text, received_at).is_duplicate:
+                yield sender, text, received_at
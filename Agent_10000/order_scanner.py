@@ -0,0 +1,218 @@
+"""
+⚡ 주문 메시지 스캐너
+- 모든 필드 패턴을 모듈 로드 시 한 번만 컴파일
+- 메시지를 한 번 훑어 키워드 위치(토큰)를 모음: "이름", "010", "서울", "3번", "(", 줄바꿈 ...
+- 필드 추출기는 자기 키워드가 있는 위치에서만 패턴을 맞춰 봄 (re.search와 같은 결과, 전체 재탐색 없음)
+- 줄/쉼표 분리도 한 번만 하고 이름 줄·상품명 줄 판별에 공유
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+
+
+SIDO_PREFIXES = ("서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종",
+                 "경기", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주")
+
+# 토큰 키: 키워드는 그 문자열, 상품 번호("3번")는 CODE, 그 외 "("와 줄바꿈
+CODE = "#"
+
+
+@dataclass(frozen=True)
+class Rule:
+    keys: Tuple[str, ...]                 # 이 키로 시작하는 토큰 위치에서만 pattern.match
+    pattern: Pattern
+
+
+def _rule(keys: Tuple[str, ...], pattern: str) -> Rule:
+    return Rule(keys, re.compile(pattern))
+
+
+# 고객명
+NAME_LABEL = _rule(("이름", "성함", "주문자"), r'(?:이름|성함|주문자)\s*[:\s]\s*([가-힣]{2,4})')
+NAME_BEFORE_PHONE = _rule(("\n",), r'\n([가-힣]{2,4})\s*/?\s*(?:010|공일공)')
+# "홍길동입니다"는 키워드가 이름 뒤에 오므로 컴파일된 패턴으로 직접 찾음
+NAME_SELF_INTRO = re.compile(r'([가-힣]{2,4})(?:입니다|이에요|예요|이요)[\.\s\n]')
+NAME_LINE = re.compile(r'^[가-힣]{2,4}$')
+NOT_NAMES = frozenset(['안녕하세', '주문합니', '주문이요', '감사합니', '부탁드려'])
+# 이름 바로 뒤에 연락처가 오는 조각 ("최유나 0192809004", "한지원/010-...")와 연락처로 시작하는 줄
+CONTACT = r'(?:010|공일공|\d{9,}|\d{2,3}[-\s]\d{3,4}[-\s]\d{4})'
+NAME_CONTACT = re.compile(r'^\s*[가-힣]{2,4}\s*/?\s*' + CONTACT)
+CONTACT_LINE = re.compile(r'\s*' + CONTACT)
+
+# 연락처
+PHONE_RULES = (
+    _rule(("연락처", "전화", "휴대폰"), r'(?:연락처|전화|휴대폰)\s*[:\s]\s*(0\d{1,2}[-\s]?\d{3,4}[-\s]?\d{4})'),
+    _rule(("010",), r'(010[-\s]?\d{4}[-\s]?\d{4})'),
+    _rule(("공일공",), r'(공일공[-\s]?\d{4}[-\s]?\d{4})'),
+)
+
+# 주소
+ADDRESS_LABEL = _rule(("주소", "배송지"), r'(?:주소|배송지)\s*[:\s]\s*(.+?)(?:\n|$)')
+ADDRESS_SIDO = _rule(SIDO_PREFIXES,
+                     r'((?:' + "|".join(SIDO_PREFIXES) + r')[시도]?\s*.+?(?:동|호|층|번지|로|길)\s*[\d가-힣\s-]*)')
+ADDRESS_TAIL = re.compile(r'(?:연락처|전화|상품|주문|입금)')
+
+# 상품 (구체적인 것부터)
+ITEM_RULES = (
+    (_rule((CODE,), r'(\d+)번\s*\(([^)]+)\)\s*(\d+)\s*개'), 3),  # N번(옵션) M개
+    (_rule((CODE,), r'(\d+)번\s*(\d+)\s*개'), 2),                # N번 M개
+    (_rule((CODE,), r'(\d+)번\s*\(([^)]+)\)'), 2),               # N번(옵션)
+)
+OPTION_PARENS = re.compile(r'\s*\([^)]+\)\s*')
+SEGMENT_PREFIX = re.compile(r'^\s*(?:상품|주문)\s*[:：]?')
+# 상품 줄이 아닌 부분의 시작 (연락처/주소/라벨/주문 머리말/인사·요청 문구): 조각은 여기서 잘라 앞부분만 상품 후보로 봄
+NON_ITEM_SEGMENT = re.compile(
+    r'010|공일공|\d{3,4}[-\s]?\d{4}|\d{9,}'
+    r'|(?:^|\s)(?:' + "|".join(SIDO_PREFIXES) + r')[시도]?\s'
+    r'|(?:이름|성함|주문자|받는\s*분|연락처|전화|휴대폰|핸드폰|번호|주소|배송지|요청사항|요청|입금자명?|메모)\s*[:：]'
+    r'|(?:^|\s)[가-힣]{2,4}(?:입니다|이에요|예요)'
+    r'|^\s*[가-힣]{2,4}주문\s*$|[가-힣]*(?:어요|아요|니다|네요)(?![가-힣])'
+    r'|감사|재주문|주소\s*동일|동일\s*주소|문앞|경비실|택배함|부재시|포장|배송|부탁|요청|샘플|선물\s*포장|쇼핑백|봉투|교환|반품|유통기한'
+)
+# 상품 줄 앞뒤의 인사/주문 문구 ("안녕하세요! 세럼 2개 주문할게요" → "세럼 2개")
+ITEM_PHRASES = re.compile(
+    r'^(?:안녕하세[요여]|선물용으로)\s*'
+    r'|\s*(?:을|를)?\s*(?:주문\s*(?:합니다|할게요|할께요|이에요|이요|해요|드려요|요)?|보내\s*주세요|주세요|할게요)\s*$'
+)
+ITEM_LETTERS = re.compile(r'[가-힣]{2,}|[A-Za-z]{3,}|\b[A-Za-z]\s*\d{3,}')
+# 한 줄에 여러 상품을 나누는 구분자 ("틴또 핑크 / 세안폼 2", "토너 + 세럼 3", "한지원/010-...")
+ITEM_SEPARATOR = re.compile(r'[\n,/+]')
+SEGMENT_SYMBOLS = re.compile(r'[^\w\s()+/.:：-]+')
+
+
+def item_text(segment: str) -> Optional[str]:
+    """
+    조각에서 상품 줄로 볼 부분 ("안녕하세요! 세럼 2개 주문할게요" → "세럼 2개",
+    "설거지세제 1L 재주문이요 문재영 010..." → "설거지세제 1L"). 주소/연락처/라벨/요청 줄,
+    주문 머리말("💄주문💄")처럼 상품 글자가 남지 않으면 None.
+    """
+    segment = SEGMENT_SYMBOLS.sub(' ', segment)
+    m = NON_ITEM_SEGMENT.search(segment)
+    if m:
+        segment = segment[:m.start()]
+    segment = SEGMENT_PREFIX.sub('', ITEM_PHRASES.sub('', segment.strip())).strip()
+    if not segment or not ITEM_LETTERS.search(segment):
+        return None
+    return segment
+
+
+# 요청사항
+REQUEST_RULES = (
+    _rule(("(",), r'\(([^)]*(?:부탁|주세요|요청)[^)]*)\)'),
+    _rule(("문앞", "경비실", "택배함", "부재시"), r'(?:문앞|경비실|택배함|부재시)[^\n]+'),
+    _rule(("배송", "포장"), r'(?:배송|포장)[^\n]*(?:주세요|부탁)'),
+)
+
+# 입금자명
+PAYER = _rule(("입금자",), r'입금자[명]?\s*[:\s]\s*([가-힣]{2,4})')
+
+_ALL_RULES = [NAME_LABEL, NAME_BEFORE_PHONE, ADDRESS_LABEL, ADDRESS_SIDO, PAYER,
+              *PHONE_RULES, *REQUEST_RULES, *(rule for rule, _ in ITEM_RULES)]
+_KEYS = {k for rule in _ALL_RULES for k in rule.keys}
+_KEYWORDS = sorted(_KEYS - {CODE, "(", "\n"}, key=len, reverse=True)
+# 토큰 → 해당 위치를 봐야 하는 규칙 키들 ("배송지" → 주소 규칙의 "배송지" + 요청사항 규칙의 "배송")
+_KEY_ALIASES = {token: tuple(k for k in _KEYS if token.startswith(k)) for token in _KEYS}
+# 위치마다 검사하는 전방 탐색이라 토큰끼리 겹쳐도 ("1010번" 안의 "010") 빠지지 않음
+_TRIGGER = re.compile(
+    r"(?=(?P<code>(?<!\d)\d+번)|(?P<kw>" + "|".join(map(re.escape, _KEYWORDS)) + r"|\(|\n))"
+)
+
+
+class OrderScan:
+    """메시지 한 건의 토큰 목록. 필드 추출기는 같은 스캔 결과를 공유합니다."""
+
+    __slots__ = ("text", "positions", "_lines", "_item_segments")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.positions: Dict[str, List[int]] = {}          # 규칙 키 -> 토큰 위치 (오름차순)
+        for m in _TRIGGER.finditer(text):
+            for key in _KEY_ALIASES[CODE if m.group("code") else m.group("kw")]:
+                self.positions.setdefault(key, []).append(m.start())
+        self._lines: Optional[List[str]] = None
+        self._item_segments: Optional[List[Tuple[int, int, str]]] = None
+
+    def search(self, rule: Rule) -> Optional[re.Match]:
+        """rule.pattern.search(text)와 같은 결과 (키워드 위치에서만 시도, 가장 앞선 매칭)"""
+        best = None
+        for key in rule.keys:
+            for pos in self.positions.get(key, ()):
+                if best is not None and pos >= best.start():
+                    break
+                m = rule.pattern.match(self.text, pos)
+                if m:
+                    best = m
+                    break
+        return best
+
+    def finditer(self, rule: Rule) -> Iterator[re.Match]:
+        """rule.pattern.finditer(text)와 같은 결과 (겹치지 않는 매칭)"""
+        if len(rule.keys) == 1:
+            positions = self.positions.get(rule.keys[0], ())
+        else:
+            positions = sorted(p for key in rule.keys for p in self.positions.get(key, ()))
+        end = 0
+        for pos in positions:
+            if pos < end:
+                continue
+            m = rule.pattern.match(self.text, pos)
+            if m:
+                end = m.end()
+                yield m
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = [line.strip() for line in self.text.strip().split('\n')]
+        return self._lines
+
+    @property
+    def item_segments(self) -> List[Tuple[int, int, str]]:
+        """줄/쉼표/"/"/"+" 단위 조각 중 상품 줄로 보이는 것 (시작, 끝, item_text 결과)"""
+        if self._item_segments is None:
+            self._item_segments = []
+            for start, end in self._separated():
+                segment = self._item_segment(start, end)
+                if segment is not None:
+                    self._item_segments.append((start, end, segment))
+        return self._item_segments
+
+    def unmatched_items(self, spans: List[Tuple[int, int]]) -> List[str]:
+        """상품 줄로 보이는데 찾은 상품(spans: 원문 위치) 어느 것과도 겹치지 않는 조각 ("틴또 핑크")"""
+        unmatched = []
+        for start, end in self._separated():
+            if any(s < end and start < e for s, e in spans):
+                continue
+            segment = self._item_segment(start, end)
+            if segment is not None:
+                unmatched.append(segment)
+        return unmatched
+
+    def _separated(self) -> Iterator[Tuple[int, int]]:
+        start = 0
+        for m in ITEM_SEPARATOR.finditer(self.text):
+            yield start, m.start()
+            start = m.end()
+        yield start, len(self.text)
+
+    def _item_segment(self, start: int, end: int) -> Optional[str]:
+        """
+        item_text(조각). 이름 모양 조각은 연락처가 바로 뒤따르거나("최유나 0192809004", "송태민\n010-...")
+        같은 줄에 연락처/주소가 있으면("장미란 / 인천시 ... / 010-...") None
+        """
+        raw = self.text[start:end]
+        segment = item_text(raw)
+        if segment is None or NAME_CONTACT.match(raw):
+            return None
+        if not NAME_LINE.match(raw.strip()):
+            return segment
+        text = self.text
+        line_end = text.find("\n", end)
+        if line_end < 0:
+            line_end = len(text)
+        elif end == line_end and CONTACT_LINE.match(text, line_end + 1):
+            return None
+        if NON_ITEM_SEGMENT.search(text, text.rfind("\n", 0, start) + 1, line_end):
+            return None
+        return segment
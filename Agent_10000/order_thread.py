@@ -0,0 +1,206 @@
+"""
+🧵 여러 문자로 나눠 온 주문을 발신자별로 이어 붙이는 파서
+- "상품 → 이름/연락처 → 주소"처럼 나눠 보낸 문자를 발신자마다 ParsedOrder 하나로 합침
+- 새 문자만 parse_order로 파싱해 기존 주문에 병합 → 스레드가 길어져도 문자당 비용 일정
+- 병합 규칙
+  · 고객명/연락처/주소/입금자명/배송일: 비어 있으면 채움. 다른 값이 오면 "변경/정정/수정" 문자일 때만 바꾸고
+    아니면 처음 값을 유지 (인사말 줄이 이름으로 잡히는 등 오탐 방지). 어느 쪽이든 conflicts에 기록
+    정정 문자는 "변경해주세요", "로 변경", "변경:" 같은 문구와 필드 라벨을 지우고 파싱하며 ("이름 박철수로 변경해주세요" → "박철수"),
+    새 값이 필드 검사(이름 2-4글자, 연락처 형식, 주소 완전성)를 통과할 때만 바꿈
+  · 요청사항, 해석하지 못한 상품 줄: 새 내용만 덧붙임
+  · 상품: 같은 상품(번호+상품명+옵션)은 새 수량으로 바꿈, 새 상품은 추가
+    "추가/하나 더" 문자면 수량을 더하고, "취소/빼 주세요" 문자면 언급한 상품을 뺌 ("주문 취소"는 상품 전체)
+- idle_timeout 동안 문자가 없거나 판매자가 바뀌면 새 주문으로 시작, 끝난 스레드는 on_close로 전달
+"""
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from address_parser import parse_address
+from order_scanner import NAME_LINE, NOT_NAMES
+from sms_order_agent import OrderItem, ParsedOrder, SMSOrderAgent
+
+
+# 값 하나짜리 필드 (비어 있으면 채우고, 정정 문자일 때만 바꿈)
+SCALAR_FIELDS = ("customer_name", "contact_number", "delivery_address", "payment_info", "desired_delivery_date")
+
+IDLE_TIMEOUT = timedelta(minutes=30)
+MAX_THREADS = 10000
+
+CORRECTION = re.compile(r'변경|정정|수정|바꿔|바뀌었|잘못')
+# 정정 문구 (앞의 조사, 뒤의 어미/콜론 포함): 지운 뒤 파싱해야 "박철수로", "변경:" 같은 값이 들어가지 않음
+CORRECTION_PHRASE = re.compile(
+    r'(?:(?<=[가-힣\d])(?:으로|로))?\s*(?:변경|정정|수정|바꿔|바뀌었|잘못)[가-힣]*[.!~]*\s*[:：]?'
+)
+# 정정 문자에서 함께 지우는 필드 라벨 ("이름 박철수" → "박철수", "연락처 010-..." → "010-...").
+# 입금자명은 라벨이 있어야 고객명과 구분되므로 남김
+CORRECTION_LABEL = re.compile(
+    r'(?:이름|성함|주문자|받는\s*분|연락처|전화번호|전화|휴대폰|핸드폰|번호|주소|배송지)\s*(?:은|는|을|를|이|가|도)?\s*[:：]?'
+)
+PHONE_FORMAT = re.compile(r'^01\d-\d{3,4}-\d{4}$')
+# 이름 줄로 잡힌 서술어 ("적었어요", "맞습니다")
+SENTENCE_ENDING = re.compile(r'(?:요|다|죠|네|까)$')
+ADD_ITEMS = re.compile(r'추가|하나\s*더|한\s*개\s*더|더\s*(?:주세요|보내|넣어|부탁)')
+CANCEL_ITEMS = re.compile(r'취소|빼\s*(?:주세요|줘|고|서)|제외')
+CANCEL_ORDER = re.compile(r'주문\s*(?:을|은|건)?\s*(?:전부\s*|전체\s*|다\s*)?취소')
+
+
+@dataclass(slots=True)
+class OrderThread:
+    """발신자 한 명의 진행 중인 주문"""
+    sender: str
+    seller_id: Optional[str]
+    order: ParsedOrder
+    started_at: datetime
+    updated_at: datetime
+    messages: int = 0
+    conflicts: List[Tuple[str, Any, Any]] = field(default_factory=list)   # (필드, 이전 값, 새 값)
+
+
+def _item_key(item: OrderItem) -> Tuple[str, str, str]:
+    return item.product_code, item.product_name, item.option
+
+
+def _is_name(value: str) -> bool:
+    return (NAME_LINE.match(value) is not None and value not in NOT_NAMES
+            and not CORRECTION.search(value) and not CORRECTION_LABEL.fullmatch(value)
+            and not SENTENCE_ENDING.search(value))
+
+
+def _correction_text(message: str) -> str:
+    """정정 문자에서 정정 문구와 필드 라벨을 지운 본문 ("주소 변경: 서울시 ..." → "서울시 ...")"""
+    lines = (CORRECTION_LABEL.sub(' ', CORRECTION_PHRASE.sub(' ', line)).strip() for line in message.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+# 정정으로 기존 값을 바꿀 때 새 값이 통과해야 하는 필드 검사 (배송일은 날짜 해석기 결과라 검사 없음)
+FIELD_CHECKS: Dict[str, Callable[[str], bool]] = {
+    "customer_name": _is_name,
+    "payment_info": _is_name,
+    "contact_number": lambda value: PHONE_FORMAT.match(value) is not None,
+    "delivery_address": lambda value: not CORRECTION.search(value) and parse_address(value).is_complete,
+}
+
+
+class ThreadParser:
+    """
+    발신자별 주문 스레드를 유지하며 문자를 하나씩 받아 병합합니다.
+    agent: 판매자 가이드를 불러 둔 SMSOrderAgent (seller_id를 주면 메시지마다 그 판매자 가이드로 파싱)
+    on_close: 스레드가 끝날 때(유휴 시간 초과, 판매자 변경, close(), 최대 개수 초과) 호출
+    """
+
+    def __init__(self, agent: SMSOrderAgent, idle_timeout: timedelta = IDLE_TIMEOUT,
+                 max_threads: int = MAX_THREADS, on_close: Optional[Callable[[OrderThread], None]] = None):
+        self.agent = agent
+        self.idle_timeout = idle_timeout
+        self.max_threads = max_threads
+        self.on_close = on_close
+        self.threads: "OrderedDict[str, OrderThread]" = OrderedDict()   # 오래 조용한 스레드가 앞쪽
+
+    def feed(self, sender: str, message: str, seller_id: Optional[str] = None,
+             received_at: Optional[datetime] = None) -> OrderThread:
+        """새 문자 한 건을 파싱해 발신자의 주문에 병합하고, 갱신된 스레드를 반환합니다."""
+        received_at = received_at or self.agent.clock()
+        # 스레드의 문자는 앞 문자에 이어지는 줄이므로 줄바꿈을 붙여 파싱 ("홍길동 / 010-..." 한 줄 문자도 이름 인식)
+        text = _correction_text(message) if CORRECTION.search(message) else message
+        parsed = self.agent.parse_order("\n" + text, seller_id)
+
+        thread = self.threads.get(sender)
+        if thread is not None and (received_at - thread.updated_at > self.idle_timeout
+                                   or thread.seller_id != seller_id):
+            self.close(sender)
+            thread = None
+
+        if thread is None:
+            thread = OrderThread(sender, seller_id, parsed, received_at, received_at, messages=1)
+            self.threads[sender] = thread
+            while len(self.threads) > self.max_threads:
+                self.close(next(iter(self.threads)))
+            return thread
+
+        self._merge(thread, parsed, message)
+        thread.updated_at = received_at
+        thread.messages += 1
+        self.threads.move_to_end(sender)
+        return thread
+
+    def get(self, sender: str) -> Optional[OrderThread]:
+        return self.threads.get(sender)
+
+    def close(self, sender: str) -> Optional[OrderThread]:
+        """발신자의 스레드를 끝내고 반환합니다 (on_close 호출)."""
+        thread = self.threads.pop(sender, None)
+        if thread is not None and self.on_close is not None:
+            self.on_close(thread)
+        return thread
+
+    def expire(self, now: Optional[datetime] = None) -> List[OrderThread]:
+        """idle_timeout보다 오래 조용한 스레드를 모두 끝냅니다 (앞쪽부터 보므로 끝난 것만 확인)."""
+        now = now or self.agent.clock()
+        expired = []
+        while self.threads:
+            sender, thread = next(iter(self.threads.items()))
+            if now - thread.updated_at <= self.idle_timeout:
+                break
+            expired.append(self.close(sender))
+        return expired
+
+    def _merge(self, thread: OrderThread, new: ParsedOrder, message: str):
+        order = thread.order
+        correction = CORRECTION.search(message) is not None
+        for name in SCALAR_FIELDS:
+            value = getattr(new, name)
+            old = getattr(order, name)
+            if not value or value == old:
+                continue
+            if old:
+                thread.conflicts.append((name, old, value))
+                check = FIELD_CHECKS.get(name)
+                if not correction or (check is not None and not check(value)):
+                    continue
+            setattr(order, name, value)
+
+        if new.special_requests and (not order.special_requests
+                                     or new.special_requests not in order.special_requests):
+            order.special_requests = (f"{order.special_requests} / {new.special_requests}"
+                                      if order.special_requests else new.special_requests)
+
+        # 이름만 보낸 문자("박철수")의 이름 줄은 상품 줄이 아님
+        names = {order.customer_name, order.payment_info, new.customer_name, new.payment_info}
+        order.unmatched_items.extend(u for u in new.unmatched_items
+                                     if u not in order.unmatched_items and u not in names)
+
+        if CANCEL_ORDER.search(message) and not new.items:
+            if order.items:
+                thread.conflicts.append(("items", order.items, []))
+            order.items = []
+        elif new.items:
+            order.items = self._merge_items(order.items, new.items, message)
+
+        self.agent._finalize(order)
+
+    @staticmethod
+    def _merge_items(items: List[OrderItem], new_items: List[OrderItem], message: str) -> List[OrderItem]:
+        if CANCEL_ITEMS.search(message):
+            cancelled = {_item_key(item) for item in new_items}
+            return [item for item in items if _item_key(item) not in cancelled]
+
+        add = ADD_ITEMS.search(message) is not None
+        merged = list(items)
+        position: Dict[Tuple[str, str, str], int] = {}
+        for i, item in enumerate(merged):
+            position.setdefault(_item_key(item), i)
+        for item in new_items:
+            key = _item_key(item)
+            i = position.get(key)
+            if i is None:
+                position[key] = len(merged)
+                merged.append(item)
+                continue
+            current = merged[i]
+            current.quantity = current.quantity + item.quantity if add else item.quantity
+            current.subtotal = current.unit_price * current.quantity
+        return merged
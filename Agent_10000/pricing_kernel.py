@@ -0,0 +1,98 @@
+"""
+🧮 주문 묶음 정산 커널 (NumPy)
+- 열 지향 상품 배열 (주문 번호, 단가, 수량) + 판매자별 배송 규칙 → 상품 소계, 주문별 상품금액/배송비/결제금액을 한 번에 계산
+- 주문별 합계는 누적합 차이로 구함 (정렬된 주문 번호는 그대로, 섞여 있으면 안정 정렬 한 번)
+- 모두 int64 정수 연산 (float 누적 없음). int64를 넘을 수 있는 입력은 파이썬 정수(object 배열)로 계산
+- 배송비 규칙은 validate_order와 같음: 상품금액 >= 무료배송 기준이면 0, 아니면 배송비 (상품이 없는 주문 포함)
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+
+INT64_MAX = np.iinfo(np.int64).max
+
+IntArray = Union[np.ndarray, Iterable[int]]
+
+
+@dataclass
+class Settlement:
+    """정산 결과. subtotals는 상품 순서, 나머지는 주문 순서 (길이 n_orders)"""
+    subtotals: np.ndarray       # 상품별 단가 × 수량
+    item_totals: np.ndarray     # 주문별 상품금액
+    shipping: np.ndarray        # 주문별 배송비
+    totals: np.ndarray          # 주문별 결제금액 (상품금액 + 배송비)
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    @property
+    def grand_total(self) -> int:
+        return int(self.totals.sum())
+
+
+def shipping_rules(guides) -> Tuple[np.ndarray, np.ndarray]:
+    """판매자 목록(CompiledGuide/ParsedGuide 등 free_shipping_threshold, shipping_fee 속성) → (무료배송 기준, 배송비) 배열"""
+    guides = list(guides)
+    return (np.array([g.free_shipping_threshold for g in guides], dtype=np.int64),
+            np.array([g.shipping_fee for g in guides], dtype=np.int64))
+
+
+def settle(order_index: IntArray, unit_price: IntArray, quantity: IntArray, n_orders: Optional[int] = None,
+           free_shipping_threshold: Union[int, IntArray] = 50000, shipping_fee: Union[int, IntArray] = 3000,
+           seller_index: Optional[IntArray] = None) -> Settlement:
+    """
+    상품 배열(같은 길이)로 주문 n_orders건을 정산합니다.
+    order_index: 상품이 속한 주문 번호 (0..n_orders-1), n_orders를 생략하면 최대 번호 + 1
+    free_shipping_threshold/shipping_fee: 하나의 값이면 모든 주문에 적용, 배열이면 판매자별 규칙이고
+    seller_index(주문별 판매자 번호)로 고릅니다.
+    """
+    order_index = np.asarray(order_index, dtype=np.int64)
+    unit_price = np.asarray(unit_price, dtype=np.int64)
+    quantity = np.asarray(quantity, dtype=np.int64)
+    if not (order_index.shape == unit_price.shape == quantity.shape) or order_index.ndim != 1:
+        raise ValueError("order_index, unit_price, quantity는 길이가 같은 1차원 배열이어야 합니다")
+    n_items = len(order_index)
+    if n_orders is None:
+        n_orders = int(order_index.max()) + 1 if n_items else 0
+    if n_items and (order_index.min() < 0 or order_index.max() >= n_orders):
+        raise ValueError(f"주문 번호는 0 이상 {n_orders} 미만이어야 합니다")
+
+    # 단가 × 수량 × 상품 수가 int64 안에 들면 누적합까지 넘치지 않음. 아니면 파이썬 정수로 계산
+    dtype = np.int64
+    if n_items:
+        bound = int(np.abs(unit_price).max()) * int(np.abs(quantity).max()) * n_items
+        if bound > INT64_MAX:
+            dtype = object
+    subtotals = unit_price.astype(dtype) * quantity.astype(dtype)
+
+    # 주문별 합계: 주문 번호 순으로 놓인 소계의 누적합에서 주문 경계 차이
+    if n_items > 1 and np.any(order_index[1:] < order_index[:-1]):
+        order = np.argsort(order_index, kind="stable")
+        sorted_index, sorted_subtotals = order_index[order], subtotals[order]
+    else:
+        sorted_index, sorted_subtotals = order_index, subtotals
+    cumulative = np.zeros(n_items + 1, dtype=dtype)
+    np.cumsum(sorted_subtotals, out=cumulative[1:])
+    bounds = np.searchsorted(sorted_index, np.arange(n_orders + 1))
+    item_totals = cumulative[bounds[1:]] - cumulative[bounds[:-1]]
+
+    threshold = _per_order(free_shipping_threshold, seller_index, n_orders)
+    fee = _per_order(shipping_fee, seller_index, n_orders)
+    shipping = np.where(item_totals >= threshold, 0, fee).astype(dtype)
+    return Settlement(subtotals, item_totals, shipping, item_totals + shipping)
+
+
+def _per_order(rule: Union[int, IntArray], seller_index: Optional[IntArray], n_orders: int) -> np.ndarray:
+    """판매자별 규칙 배열 → 주문별 값 (하나의 값이면 그대로 브로드캐스트)"""
+    rule = np.asarray(rule, dtype=np.int64)
+    if rule.ndim == 0:
+        return rule
+    if seller_index is None:
+        raise ValueError("판매자별 배송 규칙에는 seller_index가 필요합니다")
+    seller_index = np.asarray(seller_index, dtype=np.int64)
+    if seller_index.shape != (n_orders,):
+        raise ValueError(f"seller_index는 주문 수({n_orders})만큼 있어야 합니다")
+    return rule[seller_index]
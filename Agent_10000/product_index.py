@@ -0,0 +1,365 @@
+"""
+🔎 상품명 퍼지 인덱스
+- 음절 2-gram + 자모 분해 3-gram 역색인 ("맨투멘" → 오버핏 맨투맨)
+- 번호 별칭: "1번", "No. 1", "#1"
+- 옵션 동의어: "검정" → 블랙, "라지" → L
+- "반팔 검정 M 두 장" → (기본 반팔티, [M, 블랙], 2) 를 LLM 호출 없이 해석
+- 상품명/별칭 Aho-Corasick 오토마톤: "수분크림 2개, 세럼 하나" 같은 여러 상품을 한 번에 찾아
+  뒤따르는 수량/옵션/용량 표현과 짝지음 (mentions)
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from aho_corasick import AhoCorasick
+from guide_parser import SKU, GuideProduct, ParsedGuide
+
+
+# 한글 음절 분해 (U+AC00 ~ U+D7A3)
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+# 고객이 쓰는 옵션 표현 → 가이드 표기
+OPTION_SYNONYMS = {
+    "검정": "블랙", "검은": "블랙", "까만": "블랙", "검정색": "블랙",
+    "흰": "화이트", "흰색": "화이트", "하얀": "화이트", "하얀색": "화이트",
+    "회색": "그레이", "남색": "네이비", "빨강": "레드", "빨간": "레드", "빨간색": "레드",
+    "분홍": "핑크", "분홍색": "핑크", "갈색": "브라운", "베이지색": "베이지",
+    "스몰": "S", "미디움": "M", "미디엄": "M", "라지": "L", "엑스라지": "XL",
+}
+
+# "두 장", "세개", "2팩", "x2"
+KOREAN_NUMBERS = {"한": 1, "하나": 1, "두": 2, "둘": 2, "세": 3, "셋": 3, "네": 4, "넷": 4,
+                  "다섯": 5, "여섯": 6, "일곱": 7, "여덟": 8, "아홉": 9, "열": 10}
+_COUNTERS = "개|장|벌|팩|통|병|세트|박스|봉지|봉|마리|켤레|권|족"
+_QUANTITY = re.compile(
+    r"(?:(?P<num>\d+)\s*(?P<unit>" + _COUNTERS + r")(?![가-힣])"
+    r"|(?P<kor>" + "|".join(sorted(KOREAN_NUMBERS, key=len, reverse=True)) + r")\s*(?:" + _COUNTERS + r")(?![가-힣])"
+    r"|[xX×]\s*(?P<times>\d+))"
+)
+_CODE_ALIAS = re.compile(r"(?:^|[^\d])(?:(?P<a>\d+)\s*번|no\.?\s*(?P<b>\d+)|#\s*(?P<c>\d+))", re.I)
+_TOKEN_SPLIT = re.compile(r"[\s/(),·+]+")
+
+# 상품명 별칭: 괄호 구성품 "(토너+세럼+크림)"과 용량/규격 "50ml", "28cm", "1단계", "100매x10팩"은 뺀 이름
+_NAME_PARENS = re.compile(r"\([^()]*\)")
+_SPEC_WORD = re.compile(r"^\d")
+_SPEC_SUFFIX = re.compile(r"(?<=[가-힣A-Za-z])\d[\d.,]*[A-Za-z가-힣]*$")
+_NAME_TOKEN = re.compile(r"[a-z]+|\d+(?:\.\d+)?|[가-힣]+")
+# 상품명 뒤 구간은 다음 상품명, 줄/쉼표/" / "·" + " 구분자, 연락처, 필드 라벨에서 끝남
+_MENTION_STOP = re.compile(r"[\n,]|\s[/+]|010|공일공|(?:이름|성함|연락처|주소|배송지|입금자)")
+_FIELD_LABEL = re.compile(r"(?:이름|성함|연락처|주소|배송지|입금자명?)\s*[:：]")
+# "수분크림50 2" 처럼 단위 없이 쓴 수량
+_BARE_QUANTITY = re.compile(r"(?<![\w.])(\d{1,2})(?![\w.])")
+# "세럼 하나": 단위 없이 단독으로 쓰는 수사 ("한", "두"처럼 다른 말 앞에 붙는 것은 제외)
+_BARE_KOREAN_NUMBERS = {"하나": 1, "둘": 2, "셋": 3, "넷": 4, "다섯": 5, "여섯": 6, "일곱": 7, "여덟": 8, "아홉": 9}
+# 같은 상품의 용량 구분 ("토너 큰거" → 큰 용량)
+_LARGER = ("큰거", "큰것", "큰걸", "큰", "대용량")
+_SMALLER = ("작은거", "작은것", "작은걸", "작은", "소용량")
+
+# best(): 이름 점수가 MIN_NAME_SCORE 이상이고 2위와 이름 점수 차이가 MIN_MARGIN 이상이며,
+# 옵션 보너스를 더한 점수가 MIN_SCORE 이상일 때만 확정
+MIN_SCORE = 0.5
+MIN_NAME_SCORE = 0.35
+MIN_MARGIN = 0.1
+
+
+@dataclass
+class Candidate:
+    product: GuideProduct
+    score: float
+    options: Tuple[Optional[str], ...]           # 옵션 그룹별 선택값 (미선택/모호하면 None)
+    sku: Optional[SKU] = None
+    name_score: float = 0.0                      # 옵션 보너스를 뺀 상품명 점수
+
+    @property
+    def missing_groups(self) -> List[List[str]]:
+        return [g for g, o in zip(self.product.option_groups, self.options) if o is None]
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.missing_groups
+
+    @property
+    def canonical_name(self) -> str:
+        return self.sku.canonical_name if self.sku else self.product.canonical_name(
+            tuple(o for o in self.options if o))
+
+
+@dataclass
+class Mention:
+    """메시지에서 찾은 상품명 한 건과 그 뒤에서 읽은 수량 (start/end는 원문 위치)"""
+    candidate: Candidate
+    quantity: int
+    start: int
+    end: int
+
+
+def decompose(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 풀어 씁니다: '반팔' → 'ㅂㅏㄴㅍㅏㄹ'"""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHO[code // 588])
+            out.append(_JUNG[(code % 588) // 28])
+            if code % 28:
+                out.append(_JONG[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def extract_quantity(text: str, default: int = 1) -> int:
+    """'두 장' → 2, '3개' → 3, 'x2' → 2. 수량 표현이 없으면 default."""
+    m = _QUANTITY.search(text)
+    if not m:
+        return default
+    if m.group("num"):
+        return int(m.group("num"))
+    if m.group("kor"):
+        return KOREAN_NUMBERS[m.group("kor")]
+    return int(m.group("times"))
+
+
+def _normalize_name(text: str) -> str:
+    """별칭 비교용: 공백 제거 + 소문자"""
+    return re.sub(r"\s+", "", text).lower()
+
+
+def _grams(text: str) -> Set[str]:
+    """음절 2-gram + 자모 3-gram (공백 제거, 소문자)"""
+    text = re.sub(r"\s+", "", text).lower()
+    grams = {"s:" + text[i:i + 2] for i in range(len(text) - 1)}
+    jamo = decompose(text)
+    grams.update("j:" + jamo[i:i + 3] for i in range(len(jamo) - 2))
+    if len(text) == 1:
+        grams.add("s:" + text)
+    return grams
+
+
+class ProductIndex:
+    """
+    판매자 한 명의 상품 목록에 대한 역색인.
+    상품명 전체와 상품명의 각 단어를 따로 색인하고, n-gram 중 질의에 포함된 비율로 점수를 냅니다.
+    이름 점수 = 0.6 × (가장 잘 맞는 단어) + 0.4 × (상품명 전체), 점수 = 이름 점수 + 0.1 × (선택된 옵션 수).
+    "니트"만 말해도 "니트 가디건"이 잡히도록 단어 점수를 크게 둡니다.
+    옵션 표현("블랙", "검정", "L")은 이름 점수에서 빼고 순위도 이름 점수로 매깁니다
+    ("후드티 블랙 L"의 "블랙"이 "슬랙스"의 n-gram에 걸려 옵션 보너스로 1위가 되지 않도록).
+    번호 별칭("1번", "No. 1")이 있으면 해당 상품을 바로 후보로 올립니다.
+    """
+
+    def __init__(self, guide: ParsedGuide, aliases: Optional[Dict[str, str]] = None):
+        """aliases: 판매자가 따로 정한 별칭 → 상품명 ({"스킨": "토너", "MTM": "오버핏 맨투맨"})"""
+        self.guide = guide
+        self.products = guide.products
+        self._postings: Dict[str, List[int]] = defaultdict(list)      # gram -> field ids
+        self._fields: List[Tuple[int, bool, int]] = []                 # (상품, 전체 이름 여부, gram 수)
+        self._by_code: Dict[str, int] = {}
+        self._option_values: List[List[Dict[str, str]]] = []
+
+        for i, product in enumerate(self.products):
+            words = [w for w in product.name.split() if len(w) >= 2]
+            for text, whole in [(product.name, True)] + [(w, False) for w in words]:
+                grams = _grams(text)
+                for g in grams:
+                    self._postings[g].append(len(self._fields))
+                self._fields.append((i, whole, len(grams) or 1))
+            if product.code:
+                self._by_code[product.code] = i
+            self._option_values.append([{v.lower(): v for v in group} for group in product.option_groups])
+
+        self._tokens = [set(_NAME_TOKEN.findall(p.name.lower())) for p in self.products]
+        # 이름 점수에서 뺄 옵션 표현 (상품명에 들어 있는 단어는 남김: "블랙 슬랙스")
+        name_words = {w for p in self.products for w in _TOKEN_SPLIT.split(p.name.lower()) if w}
+        option_words = {v for values in self._option_values for group in values for v in group}
+        option_words.update(k.lower() for k in OPTION_SYNONYMS)
+        option_words.update(v.lower() for v in OPTION_SYNONYMS.values())
+        self._option_words = option_words - name_words
+        names = [self._aliases(p) for p in self.products]
+        for alias, target in (aliases or {}).items():
+            target = _normalize_name(target)
+            for product_names in names:
+                if target in product_names:
+                    product_names.add(_normalize_name(alias))
+        self._names: AhoCorasick[int] = AhoCorasick(
+            (alias, i) for i, product_names in enumerate(names) for alias in product_names)
+
+    def search(self, text: str, limit: int = 5) -> List[Candidate]:
+        """질의 문자열에 맞는 상품 후보를 점수순으로 반환합니다."""
+        hits: Dict[int, int] = defaultdict(int)
+        for g in _grams(self._name_query(text)):
+            for f in self._postings.get(g, ()):
+                hits[f] += 1
+        whole_scores: Dict[int, float] = defaultdict(float)
+        word_scores: Dict[int, float] = defaultdict(float)
+        for f, n in hits.items():
+            i, whole, count = self._fields[f]
+            coverage = n / count
+            if whole:
+                whole_scores[i] = coverage
+            word_scores[i] = max(word_scores[i], coverage)
+        scores = {i: 0.6 * word_scores[i] + 0.4 * whole_scores[i] for i in word_scores}
+
+        for m in _CODE_ALIAS.finditer(text):
+            i = self._by_code.get(m.group("a") or m.group("b") or m.group("c"))
+            if i is not None:
+                scores[i] = max(scores.get(i, 0.0), 1.0)
+
+        tokens = self._option_tokens(text)
+        candidates = []
+        for i, score in scores.items():
+            options = self._select_options(i, tokens)
+            chosen = sum(1 for o in options if o)
+            candidates.append((score, score + 0.1 * chosen, i, options))
+        candidates.sort(key=lambda c: (-c[0], -c[1], c[2]))
+
+        results = []
+        for name_score, score, i, options in candidates[:limit]:
+            product = self.products[i]
+            sku = None
+            if all(options):
+                sku = self.guide.skus.get(product.canonical_name(options))
+            results.append(Candidate(product, round(score, 4), options, sku, round(name_score, 4)))
+        return results
+
+    def mentions(self, text: str) -> List[Mention]:
+        """
+        메시지 한 번 훑기로 상품명을 모두 찾습니다 (공백 무시, 가장 앞·가장 긴 별칭 우선).
+        별칭이 여러 상품에 걸리면 ("수분크림" → 50ml/100ml) 뒤따르는 용량/구성 표현으로 고르고,
+        수량과 옵션은 다음 상품명이나 구분자 전까지의 구간에서 읽습니다.
+        괄호 안("(토너+세럼+크림)")과 이름/주소 같은 필드 줄 안의 매칭은 건너뜁니다.
+        """
+        chars, where = [], []
+        for pos, ch in enumerate(text):
+            if not ch.isspace():
+                chars.append(ch)
+                where.append(pos)
+        matches = self._names.leftmost_longest("".join(chars).lower())
+
+        mentions = []
+        for k, (s, e, products) in enumerate(matches):
+            start, end = where[s], where[e - 1] + 1
+            line_start = text.rfind("\n", 0, start) + 1
+            if text.rfind("(", line_start, start) > text.rfind(")", line_start, start):
+                continue
+            if _FIELD_LABEL.search(text, line_start, start):
+                continue
+            limit = where[matches[k + 1][0]] if k + 1 < len(matches) else len(text)
+            stop = _MENTION_STOP.search(text, end, limit)
+            tail = text[end:stop.start() if stop else limit]
+
+            i = self._resolve_variant(products, tail)
+            options = self._select_options(i, self._option_tokens(text[start:end] + " " + tail))
+            product = self.products[i]
+            sku = self.guide.skus.get(product.canonical_name(options)) if all(options) else None
+            quantity = self._tail_quantity(tail, self._tokens[i])
+            mentions.append(Mention(Candidate(product, 1.0, options, sku, 1.0), quantity, start, end))
+        return mentions
+
+    def code_mentions(self, text: str) -> List[GuideProduct]:
+        """번호 별칭("1번", "No. 1", "#1")으로 언급한 상품 (가이드에 없는 번호는 무시)"""
+        products = []
+        for m in _CODE_ALIAS.finditer(text):
+            i = self._by_code.get(m.group("a") or m.group("b") or m.group("c"))
+            if i is not None:
+                products.append(self.products[i])
+        return products
+
+    def best(self, text: str, min_score: float = MIN_SCORE, min_margin: float = MIN_MARGIN,
+             min_name_score: float = MIN_NAME_SCORE) -> Optional[Candidate]:
+        """
+        1위 후보가 충분히 확실할 때만 반환합니다 (아니면 None → LLM/판매자 확인).
+        이름 점수 기준과 2위와의 차이를 먼저 보고, 옵션 보너스는 그다음 min_score 비교에만 씁니다.
+        """
+        candidates = self.search(text, limit=2)
+        if not candidates or candidates[0].name_score < min_name_score:
+            return None
+        if len(candidates) > 1 and candidates[0].name_score - candidates[1].name_score < min_margin:
+            return None
+        if candidates[0].score < min_score:
+            return None
+        return candidates[0]
+
+    @staticmethod
+    def _aliases(product: GuideProduct) -> Set[str]:
+        """
+        상품명 별칭 (소문자, 공백 제거): 전체 이름, 괄호를 뺀 이름, 용량/규격을 뺀 이름,
+        그리고 그 이름의 마지막 단어와 세 글자 이상 단어 ("오버핏 맨투맨" → 맨투맨, 오버핏).
+        """
+        names = {product.name, product.raw_name or product.name}
+        plain = _NAME_PARENS.sub(" ", product.name)
+        words = [_SPEC_SUFFIX.sub("", w) for w in plain.split() if not _SPEC_WORD.match(w)]
+        words = [w for w in words if w]
+        names.update((plain, " ".join(words)))
+        if len(words) > 1:
+            counters = set(_COUNTERS.split("|"))
+            names.update(w for j, w in enumerate(words)
+                         if (len(w) >= 3 or (j == len(words) - 1 and len(w) >= 2)) and w not in counters)
+        return {_normalize_name(n) for n in names if n.strip()}
+
+    def _resolve_variant(self, products: List[int], tail: str) -> int:
+        """
+        같은 별칭의 상품들 중 뒤 구간의 토큰("100ml", "2단계", "대")과 가장 많이 겹치는 상품.
+        동점이면 "큰거"/"작은거"로 가격이 높은/낮은 쪽, 그래도 같으면 가이드에 먼저 나온 상품.
+        """
+        if len(products) == 1:
+            return products[0]
+        tokens = set(_NAME_TOKEN.findall(tail.lower()))
+        scores = {i: len(self._tokens[i] & tokens) for i in products}
+        top = max(scores.values())
+        tied = [i for i in products if scores[i] == top]
+        if len(tied) > 1:
+            if tokens.intersection(_LARGER):
+                return max(tied, key=lambda i: self.products[i].price)
+            if tokens.intersection(_SMALLER):
+                return min(tied, key=lambda i: self.products[i].price)
+        return tied[0]
+
+    @staticmethod
+    def _tail_quantity(tail: str, name_tokens: Set[str]) -> int:
+        """'2개'/'두 장'/'x2' → 그 수, 없으면 단독 수사('하나')나 단위 없는 숫자(상품 용량 제외), 기본 1"""
+        quantity = extract_quantity(tail, default=0)
+        if quantity:
+            return quantity
+        for word in tail.split():
+            if word in _BARE_KOREAN_NUMBERS:
+                return _BARE_KOREAN_NUMBERS[word]
+        for m in _BARE_QUANTITY.finditer(tail):
+            if m.group(1) not in name_tokens and int(m.group(1)) > 0:
+                return int(m.group(1))
+        return 1
+
+    def _name_query(self, text: str) -> str:
+        """이름 점수용 질의: 수량 표현과 옵션/옵션 동의어 단어("블랙", "검정색", "L")를 뺀 문자열"""
+        words = []
+        for t in _TOKEN_SPLIT.split(_QUANTITY.sub(" ", text)):
+            word = t.lower()
+            if not word or word in self._option_words:
+                continue
+            if word.endswith("색") and len(word) > 1 and word[:-1] in self._option_words:
+                continue
+            words.append(t)
+        return " ".join(words)
+
+    @staticmethod
+    def _option_tokens(text: str) -> List[str]:
+        tokens = []
+        for t in _TOKEN_SPLIT.split(text):
+            if not t:
+                continue
+            t = t.lower()
+            tokens.append(OPTION_SYNONYMS.get(t, t).lower())
+            if t.endswith("색") and len(t) > 1:
+                tokens.append(OPTION_SYNONYMS.get(t[:-1], t[:-1]).lower())
+        return tokens
+
+    def _select_options(self, i: int, tokens: List[str]) -> Tuple[Optional[str], ...]:
+        """옵션 그룹마다 정확히 하나가 언급되면 선택, 없거나 여러 개면 None."""
+        selected = []
+        for values in self._option_values[i]:
+            found = {values[t] for t in tokens if t in values}
+            selected.append(found.pop() if len(found) == 1 else None)
+        return tuple(selected)
@@ -5,14 +5,28 @@
 - LLM 기반 파싱 옵션 포함
 """
 
+import hashlib
 import json
-import re
-from typing import Dict, List, Optional, Any
+import os
+import queue
+import sys
+import threading
+from collections import OrderedDict, deque
+from itertools import islice
+from multiprocessing import Pool
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 
+from address_parser import parse_address
+from date_resolver import DateResolver
+from guide_parser import ParsedGuide, parse_guide
+import order_scanner as sc
+from order_scanner import OrderScan
+from product_index import ProductIndex, extract_quantity
 
-@dataclass
+
+@dataclass(slots=True)
 class OrderItem:
     product_code: str
     product_name: str
@@ -22,7 +36,7 @@ class OrderItem:
     quantity: int
     subtotal: int
 
-@dataclass
+@dataclass(slots=True)
 class ParsedOrder:
     customer_name: Optional[str] = None
     contact_number: Optional[str] = None
@@ -35,8 +49,9 @@ class ParsedOrder:
     expected_amount: int = 0
     confidence: float = 0.0
     missing_fields: List[str] = field(default_factory=list)
+    unmatched_items: List[str] = field(default_factory=list)   # 상품 줄로 보이지만 어떤 상품으로도 해석하지 못한 조각
 
-@dataclass
+@dataclass(slots=True)
 class ProductInfo:
     code: str
     name: str
@@ -45,91 +60,177 @@ class ProductInfo:
     options: List[str] = field(default_factory=list)
 
 
+# 컴파일된 가이드 캐시 크기 (프로세스 전체, 가장 오래 안 쓴 것부터 제거)
+GUIDE_CACHE_SIZE = 256
+
+
+@dataclass(slots=True)
+class CompiledGuide:
+    """가이드 한 건의 파싱/색인 결과. 내용(지문)이 같으면 판매자·에이전트가 달라도 같은 객체를 공유합니다."""
+    fingerprint: str
+    text: str
+    aliases: Optional[Dict[str, str]]
+    guide: ParsedGuide
+    index: ProductIndex
+    products: Dict[str, ProductInfo]          # 번호가 있으면 번호, 없으면 상품명 → 상품
+    seller_name: str
+    bank_account: str
+    free_shipping_threshold: int
+    shipping_fee: int
+
+
+_guide_cache: "OrderedDict[str, CompiledGuide]" = OrderedDict()
+_guide_cache_lock = threading.Lock()
+
+
+def guide_fingerprint(guide_text: str, aliases: Optional[Dict[str, str]] = None) -> str:
+    """가이드 원문(+별칭)의 sha256"""
+    digest = hashlib.sha256(guide_text.encode("utf-8"))
+    if aliases:
+        digest.update(json.dumps(aliases, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def compile_guide(guide_text: str, aliases: Optional[Dict[str, str]] = None) -> CompiledGuide:
+    """가이드를 파싱해 상품 표/색인/배송 규칙/계좌를 만듭니다 (같은 내용은 캐시에서 재사용)."""
+    fingerprint = guide_fingerprint(guide_text, aliases)
+    with _guide_cache_lock:
+        compiled = _guide_cache.get(fingerprint)
+        if compiled is not None:
+            _guide_cache.move_to_end(fingerprint)
+            return compiled
+    
+    guide = parse_guide(guide_text)
+    products = {}
+    for p in guide.products:
+        key = p.code or p.name
+        options = [o for group in p.option_groups for o in group]
+        products[key] = ProductInfo(key, p.raw_name or p.name, p.price, p.unit, options)
+    compiled = CompiledGuide(
+        fingerprint=fingerprint,
+        text=guide_text,
+        aliases=aliases,
+        guide=guide,
+        index=ProductIndex(guide, aliases),
+        products=products,
+        seller_name=guide.seller_name or "",
+        bank_account=guide.bank_account or "",
+        free_shipping_threshold=guide.free_shipping_threshold,
+        shipping_fee=guide.shipping_fee
+    )
+    with _guide_cache_lock:
+        _guide_cache[fingerprint] = compiled
+        while len(_guide_cache) > GUIDE_CACHE_SIZE:
+            _guide_cache.popitem(last=False)
+    return compiled
+
+
 class SMSOrderAgent:
     """SMS 문자 주문 자동화 에이전트 (Final)"""
     
-    def __init__(self):
+    def __init__(self, clock: Callable[[], datetime] = datetime.now):
+        self.clock = clock                     # 배송일/주문일 기준 시각 (테스트에서는 고정 시각 주입)
+        self.dates = DateResolver(clock)
         self.products: Dict[str, ProductInfo] = {}
         self.seller_name = ""
         self.bank_account = ""
         self.free_shipping_threshold = 50000
         self.shipping_fee = 3000
+        self.guide: Optional[ParsedGuide] = None
+        self.index: Optional[ProductIndex] = None
+        self.guide_text: Optional[str] = None      # 일괄 파싱 시 워커 프로세스에 한 번 전달
+        self.aliases: Optional[Dict[str, str]] = None
+        self.active_guide: Optional[CompiledGuide] = None
+        self.guides: Dict[str, CompiledGuide] = {}  # 판매자 ID → 가이드 (여러 판매자 주문을 한 에이전트로 처리)
     
-    def load_seller_guide(self, guide_text: str) -> Dict[str, Any]:
-        """판매자 가이드 파싱"""
-        
-        # 판매자명
-        m = re.search(r'([가-힣]+(?:마켓|샵|몰|스토어|공구|팜|마트|하우스|프렌즈|웨어|데코))(?:에서)?', guide_text)
-        if m:
-            self.seller_name = m.group(1)
-        
-        # 상품 파싱
-        self.products = {}
-        for m in re.finditer(r'(\d+)번\s+(.+?)\s*[-–]\s*([\d,]+)원', guide_text):
-            code = m.group(1)
-            name = m.group(2).strip()
-            price = int(m.group(3).replace(",", ""))
-            options = []
-            opt_m = re.search(r'\(([^)]+/[^)]+)\)', name)
-            if opt_m:
-                options = [o.strip() for o in opt_m.group(1).split("/")]
-            self.products[code] = ProductInfo(code, name, price, "개", options)
-        
-        # 계좌
-        m = re.search(r'(?:입금계좌|계좌)[:\s]*([가-힣]+)\s*([\d-]+)', guide_text)
-        if m:
-            self.bank_account = f"{m.group(1)} {m.group(2)}"
-        
-        # 무료배송
-        m = re.search(r'([\d,]+)원?\s*(?:이상|↑)\s*무료배송', guide_text)
-        if m:
-            self.free_shipping_threshold = int(m.group(1).replace(",", ""))
-        
-        # 배송비
-        m = re.search(r'배송비\s*([\d,]+)원', guide_text)
-        if m:
-            self.shipping_fee = int(m.group(1).replace(",", ""))
+    def load_seller_guide(self, guide_text: str, aliases: Optional[Dict[str, str]] = None,
+                          seller_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        판매자 가이드 파싱 (번호형/글머리표/압축형/문장형 목록 → 상품 + SKU 표)
+        aliases: 판매자 별칭 → 상품명 ({"스킨": "토너"}), 상품명 오토마톤에 함께 들어감
+        seller_id: 주면 이 판매자로 등록 → parse_order(text, seller_id=...)로 메시지마다 선택
+        같은 내용의 가이드는 다시 파싱하지 않고 캐시(compile_guide)에서 가져옵니다.
+        """
+        
+        compiled = compile_guide(guide_text, aliases)
+        if seller_id is not None:
+            self.guides[seller_id] = compiled
+        self._activate(compiled)
         
         return {
             "seller_name": self.seller_name,
             "products_count": len(self.products),
             "bank_account": self.bank_account,
             "free_shipping": self.free_shipping_threshold,
-            "shipping_fee": self.shipping_fee
+            "shipping_fee": self.shipping_fee,
+            "sku_count": len(self.guide.skus)
         }
     
-    def parse_order(self, order_text: str) -> ParsedOrder:
-        """주문 메시지 파싱"""
+    def use_seller(self, seller_id: str):
+        """등록된 판매자의 가이드로 전환 (다시 파싱하지 않음)"""
+        compiled = self.guides.get(seller_id)
+        if compiled is None:
+            raise KeyError(f"등록되지 않은 판매자입니다: {seller_id}")
+        if compiled is not self.active_guide:
+            self._activate(compiled)
+    
+    def _activate(self, compiled: CompiledGuide):
+        self.active_guide = compiled
+        self.guide_text = compiled.text
+        self.aliases = compiled.aliases
+        self.guide = compiled.guide
+        self.index = compiled.index
+        self.products = compiled.products
+        self.seller_name = compiled.seller_name
+        self.bank_account = compiled.bank_account
+        self.free_shipping_threshold = compiled.free_shipping_threshold
+        self.shipping_fee = compiled.shipping_fee
+    
+    def parse_order(self, order_text: str, seller_id: Optional[str] = None) -> ParsedOrder:
+        """주문 메시지 파싱 (seller_id를 주면 그 판매자의 가이드로, 없으면 현재 가이드로)"""
+        
+        if seller_id is not None:
+            self.use_seller(seller_id)
         
-        result = ParsedOrder()
+        # 같은 날짜 문자열은 모든 주문이 공유 (수백만 건 파싱 시 메모리 절약)
+        result = ParsedOrder(order_date=sys.intern(self.clock().strftime("%Y-%m-%d")))
+        
+        # 메시지를 한 번만 훑고 모든 필드 추출기가 같은 토큰을 사용
+        scan = OrderScan(order_text)
         
         # 1. 고객명 - 더 정확한 패턴 매칭
-        result.customer_name = self._extract_name(order_text)
+        result.customer_name = self._extract_name(scan)
         
         # 2. 연락처
-        result.contact_number = self._extract_phone(order_text)
+        result.contact_number = self._extract_phone(scan)
         
         # 3. 주소
-        result.delivery_address = self._extract_address(order_text)
+        result.delivery_address = self._extract_address(scan)
         
         # 4. 상품
-        result.items = self._extract_items_improved(order_text)
+        result.items = self._extract_items_improved(scan, result.unmatched_items)
         
         # 5. 요청사항
-        result.special_requests = self._extract_requests(order_text)
+        result.special_requests = self._extract_requests(scan)
         
         # 6. 입금자명
-        m = re.search(r'입금자[명]?\s*[:\s]\s*([가-힣]{2,4})', order_text)
+        m = scan.search(sc.PAYER)
         if m:
             result.payment_info = m.group(1)
         
         # 7. 배송일
-        result.desired_delivery_date = self._extract_delivery_date(order_text)
+        result.desired_delivery_date = self._extract_delivery_date(scan.text)
+        
+        # 8. 금액/누락 필드/신뢰도
+        self._finalize(result)
         
-        # 8. 계산
+        return result
+    
+    def _finalize(self, result: ParsedOrder):
+        """금액 합계, 누락 필드, 신뢰도를 다시 계산합니다 (메시지 여러 건을 합친 주문에도 사용)."""
         result.expected_amount = sum(item.subtotal for item in result.items)
         
-        # 9. 누락 필드
+        result.missing_fields = []
         if not result.customer_name:
             result.missing_fields.append("customer_name")
         if not result.contact_number:
@@ -139,95 +240,125 @@ class SMSOrderAgent:
         if not result.items:
             result.missing_fields.append("items")
         
-        result.confidence = (4 - len(result.missing_fields)) / 4
-        
-        return result
+        # 해석하지 못한 상품 줄이 남았으면 상품은 절반만 인정 (일부 상품만 찾은 주문을 그대로 받지 않도록)
+        partial = 0.5 if result.items and result.unmatched_items else 0.0
+        result.confidence = (4 - len(result.missing_fields) - partial) / 4
+    
+    def parse_orders(self, messages: Iterable[Any], workers: Optional[int] = None,
+                     chunksize: int = 64, ordered: bool = True) -> Iterator[Any]:
+        """
+        주문 메시지 여러 건을 프로세스 풀로 파싱합니다 (제너레이터).
+        messages의 각 항목은 메시지 문자열(현재 가이드) 또는 (판매자 ID, 메시지) → 여러 판매자가 섞여도 됨.
+        가이드는 워커 시작 시 한 번만 전달하고(initializer), 메시지는 chunksize 단위로 나눠 보냅니다.
+        ordered=True면 입력 순서대로 ParsedOrder, False면 끝나는 대로 (입력 번호, ParsedOrder).
+        workers=1이면 풀 없이 현재 프로세스에서 처리합니다. (기본: CPU 코어 수)
+        입력은 필요한 만큼만 읽습니다 (처리 중인 묶음은 워커당 최대 2개) → 제너레이터 입력이면 메모리 일정.
+        spawn 방식 플랫폼에서는 clock이 pickle 가능해야 합니다 (datetime.now 등 모듈 수준 함수).
+        """
+        workers = workers or os.cpu_count() or 1
+        jobs = enumerate(messages)
+        if workers == 1:
+            active = self.active_guide
+            for i, message in jobs:
+                order = _parse_message(self, message, active)
+                yield order if ordered else (i, order)
+            return
+        
+        chunks = iter(lambda: list(islice(jobs, chunksize)), [])
+        max_pending = workers * 2
+        sellers = {seller_id: (g.text, g.aliases) for seller_id, g in self.guides.items()}
+        active = (self.active_guide.text, self.active_guide.aliases) if self.active_guide else None
+        with Pool(workers, initializer=_init_worker, initargs=(sellers, active, self.clock)) as pool:
+            if ordered:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.apply_async(_parse_chunk, (chunk,)))
+                    if len(pending) >= max_pending:
+                        for _, order in pending.popleft().get():
+                            yield order
+                while pending:
+                    for _, order in pending.popleft().get():
+                        yield order
+            else:
+                done: "queue.Queue" = queue.Queue()
+                in_flight = 0
+                for chunk in chunks:
+                    pool.apply_async(_parse_chunk, (chunk,), callback=done.put, error_callback=done.put)
+                    in_flight += 1
+                    if in_flight >= max_pending:
+                        in_flight -= 1
+                        yield from _chunk_result(done.get())
+                while in_flight:
+                    in_flight -= 1
+                    yield from _chunk_result(done.get())
     
-    def _extract_name(self, text: str) -> Optional[str]:
+    def _extract_name(self, scan: OrderScan) -> Optional[str]:
         """고객명 추출 (개선)"""
         
         # 패턴 1: "이름: 홍길동"
-        m = re.search(r'(?:이름|성함|주문자)\s*[:\s]\s*([가-힣]{2,4})', text)
+        m = scan.search(sc.NAME_LABEL)
         if m:
             return m.group(1)
         
         # 패턴 2: "홍길동입니다" 또는 "홍길동이에요"
-        m = re.search(r'([가-힣]{2,4})(?:입니다|이에요|예요|이요)[\.\s\n]', text)
+        m = sc.NAME_SELF_INTRO.search(scan.text)
         if m:
             return m.group(1)
         
         # 패턴 3: 줄바꿈 후 이름 + 전화번호 패턴
-        m = re.search(r'\n([가-힣]{2,4})\s*/?\s*(?:010|공일공)', text)
+        m = scan.search(sc.NAME_BEFORE_PHONE)
         if m:
             return m.group(1)
         
         # 패턴 4: 이름만 한 줄에 있는 경우
-        lines = text.strip().split('\n')
-        for line in lines:
-            line = line.strip()
-            # 2-4글자 한글만 있는 줄
-            if re.match(r'^[가-힣]{2,4}$', line):
-                # 인사말/동사 제외
-                if line not in ['안녕하세', '주문합니', '주문이요', '감사합니', '부탁드려']:
-                    return line
+        for line in scan.lines:
+            # 2-4글자 한글만 있는 줄 (인사말/동사 제외)
+            if sc.NAME_LINE.match(line) and line not in sc.NOT_NAMES:
+                return line
         
         return None
     
-    def _extract_phone(self, text: str) -> Optional[str]:
+    def _extract_phone(self, scan: OrderScan) -> Optional[str]:
         """연락처 추출"""
-        patterns = [
-            r'(?:연락처|전화|휴대폰)\s*[:\s]\s*(0\d{1,2}[-\s]?\d{3,4}[-\s]?\d{4})',
-            r'(010[-\s]?\d{4}[-\s]?\d{4})',
-            r'(공일공[-\s]?\d{4}[-\s]?\d{4})',
-        ]
-        for p in patterns:
-            m = re.search(p, text)
+        for rule in sc.PHONE_RULES:
+            m = scan.search(rule)
             if m:
                 phone = m.group(1).replace("공", "0").replace(" ", "").replace("-", "")
                 if len(phone) >= 10:
                     return f"{phone[:3]}-{phone[3:7]}-{phone[7:]}"
         return None
     
-    def _extract_address(self, text: str) -> Optional[str]:
+    def _extract_address(self, scan: OrderScan) -> Optional[str]:
         """주소 추출"""
         # 명시적 주소
-        m = re.search(r'(?:주소|배송지)\s*[:\s]\s*(.+?)(?:\n|$)', text)
+        m = scan.search(sc.ADDRESS_LABEL)
         if m:
             addr = m.group(1).strip()
             if len(addr) > 10:
                 return addr
         
         # 시/도로 시작하는 주소
-        m = re.search(
-            r'((?:서울|부산|대구|인천|광주|대전|울산|세종|경기|강원|충북|충남|전북|전남|경북|경남|제주)'
-            r'[시도]?\s*.+?(?:동|호|층|번지|로|길)\s*[\d가-힣\s-]*)',
-            text
-        )
+        m = scan.search(sc.ADDRESS_SIDO)
         if m:
             addr = m.group(1).strip()
             # 불필요한 후행 텍스트 제거
-            addr = re.split(r'(?:연락처|전화|상품|주문|입금)', addr)[0].strip()
+            addr = sc.ADDRESS_TAIL.split(addr)[0].strip()
             if len(addr) > 10:
                 return addr
         
         return None
     
-    def _extract_items_improved(self, text: str) -> List[OrderItem]:
-        """상품 추출 (개선된 중복 처리)"""
+    def _extract_items_improved(self, scan: OrderScan, unmatched: Optional[List[str]] = None) -> List[OrderItem]:
+        """상품 추출 (개선된 중복 처리). unmatched를 주면 상품 줄로 보이는데 어떤 상품에도 쓰이지 않은 조각을 채워 넣음"""
         
         # 이미 처리된 매칭 위치 추적
         processed_positions = set()
         items_dict = {}
+        spans = []
         
-        # 패턴 목록 (구체적인 것부터)
-        patterns = [
-            (r'(\d+)번\s*\(([^)]+)\)\s*(\d+)\s*개', 3),  # N번(옵션) M개
-            (r'(\d+)번\s*(\d+)\s*개', 2),                 # N번 M개
-            (r'(\d+)번\s*\(([^)]+)\)', 2),               # N번(옵션)
-        ]
-        
-        for pattern, group_count in patterns:
-            for m in re.finditer(pattern, text):
+        # 패턴 목록 (구체적인 것부터, order_scanner.ITEM_RULES)
+        for rule, group_count in sc.ITEM_RULES:
+            for m in scan.finditer(rule):
                 # 이미 처리된 위치면 스킵
                 if m.start() in processed_positions:
                     continue
@@ -260,12 +391,12 @@ class SMSOrderAgent:
                 else:
                     name = f"{code}번 {prod.name}"
                     if option:
-                        base_name = re.sub(r'\s*\([^)]+\)\s*', '', prod.name).strip()
+                        base_name = sc.OPTION_PARENS.sub('', prod.name).strip()
                         name = f"{code}번 {base_name} ({option})"
                     
                     items_dict[key] = OrderItem(
                         product_code=code,
-                        product_name=name,
+                        product_name=sys.intern(name),
                         option=option,
                         unit=prod.unit,
                         unit_price=prod.price,
@@ -275,33 +406,67 @@ class SMSOrderAgent:
                 
                 # 처리된 위치 기록
                 processed_positions.add(m.start())
+                spans.append(m.span())
         
+        # 번호 없이 상품명으로 주문한 경우 ("수분크림 2개, 세럼 하나", "반팔 검정 M 두 장")
+        if not items_dict and self.index:
+            for item in self._extract_items_by_name(scan, spans):
+                key = (item.product_code or item.product_name, item.option)
+                if key in items_dict:
+                    items_dict[key].quantity += item.quantity
+                    items_dict[key].subtotal = items_dict[key].unit_price * items_dict[key].quantity
+                else:
+                    items_dict[key] = item
+        
+        if unmatched is not None:
+            unmatched.extend(scan.unmatched_items(spans))
         return list(items_dict.values())
     
-    def _extract_requests(self, text: str) -> Optional[str]:
+    def _extract_items_by_name(self, scan: OrderScan, spans: Optional[List[Tuple[int, int]]] = None) -> List[OrderItem]:
+        """
+        상품명 오토마톤으로 메시지를 한 번 훑어 "수분크림 2개, 세럼 하나"의 각 상품을 찾습니다.
+        하나도 못 찾으면 ("맨투멘" 같은 오타) 상품 줄처럼 보이는 조각(item_text)만 퍼지 검색해 확실한 후보를 씁니다.
+        spans를 주면 상품으로 쓴 원문 구간을 덧붙입니다 (해석하지 못한 상품 줄 판별용).
+        """
+        spans = [] if spans is None else spans
+        mentions = []
+        for m in self.index.mentions(scan.text):
+            mentions.append((m.candidate, m.quantity))
+            spans.append((m.start, m.end))
+        if not mentions:
+            # 상품 줄로 볼 부분만 퍼지 검색 (연락처/주소/인사·요청 문구는 잘라내고, 남는 글자가 없으면 건너뜀)
+            for start, end, text in scan.item_segments:
+                candidate = self.index.best(text)
+                if candidate is not None:
+                    mentions.append((candidate, extract_quantity(text)))
+                    spans.append((start, end))
+        
+        items = []
+        for candidate, quantity in mentions:
+            product = candidate.product
+            items.append(OrderItem(
+                product_code=product.code or "",
+                product_name=sys.intern(candidate.canonical_name),
+                option="/".join(o for o in candidate.options if o),
+                unit=product.unit,
+                unit_price=product.price,
+                quantity=quantity,
+                subtotal=product.price * quantity
+            ))
+        return items
+    
+    def _extract_requests(self, scan: OrderScan) -> Optional[str]:
         """요청사항 추출"""
-        patterns = [
-            r'\(([^)]*(?:부탁|주세요|요청)[^)]*)\)',
-            r'(?:문앞|경비실|택배함|부재시)[^\n]+',
-            r'(?:배송|포장)[^\n]*(?:주세요|부탁)',
-        ]
-        for p in patterns:
-            m = re.search(p, text)
+        for rule in sc.REQUEST_RULES:
+            m = scan.search(rule)
             if m:
                 return m.group(0).strip('()')
         return None
     
     def _extract_delivery_date(self, text: str) -> Optional[str]:
-        """배송일 추출"""
-        today = datetime.now()
-        
-        if re.search(r'오늘|금일', text):
-            return today.strftime("%Y-%m-%d")
-        if re.search(r'내일', text):
-            return (today + timedelta(days=1)).strftime("%Y-%m-%d")
-        if re.search(r'모레', text):
-            return (today + timedelta(days=2)).strftime("%Y-%m-%d")
-        return None
+        """배송일 추출 (오늘/내일/요일/다음주/11월 23일/11/13 → YYYY-MM-DD, clock 기준)"""
+        resolved = self.dates.resolve(text)
+        return resolved.isoformat() if resolved else None
     
     def validate_order(self, order: ParsedOrder) -> Dict[str, Any]:
         """주문 검증"""
@@ -313,8 +478,21 @@ class SMSOrderAgent:
             issues.append("연락처가 누락되었습니다.")
         if not order.delivery_address:
             issues.append("배송지가 누락되었습니다.")
+        else:
+            address = parse_address(order.delivery_address)
+            if not address.is_complete:
+                issues.append(f"배송지 정보가 부족합니다 ({', '.join(address.missing)}).")
         if not order.items:
             issues.append("주문 상품이 없습니다.")
+        if order.unmatched_items:
+            issues.append(f"확인하지 못한 상품이 있습니다 ({', '.join(order.unmatched_items)}).")
+        
+        # 옵션 그룹이 있는 상품은 그룹마다 하나씩 선택되어야 함 ("블랙/M" → 기본 반팔티 (M) (블랙))
+        if self.guide:
+            for item in order.items:
+                resolution = self.guide.resolve(item.product_name, item.option)
+                for group in resolution.missing_groups:
+                    issues.append(f"{item.product_name}: 옵션 선택이 필요합니다 ({'/'.join(group)})")
         
         shipping = 0 if order.expected_amount >= self.free_shipping_threshold else self.shipping_fee
         
@@ -360,7 +538,11 @@ class SMSOrderAgent:
     
     def to_label_json(self, order: ParsedOrder) -> str:
         """JSON 라벨 생성"""
-        label = {
+        return json.dumps(self.to_label(order), ensure_ascii=False, indent=2)
+    
+    def to_label(self, order: ParsedOrder) -> Dict[str, Any]:
+        """라벨 dict (검증 CSV label / TextOrderAgent 주문 상태와 같은 키)"""
+        return {
             "items": [
                 {
                     "product_name": item.product_name,
@@ -380,7 +562,46 @@ class SMSOrderAgent:
             "order_date": order.order_date,
             "expected_amount": order.expected_amount
         }
-        return json.dumps(label, ensure_ascii=False, indent=2)
+
+
+# ===== 일괄 파싱 워커 =====
+
+_worker_agent: Optional[SMSOrderAgent] = None
+_worker_default: Optional[CompiledGuide] = None
+
+
+def _init_worker(sellers: Dict[str, Tuple[str, Optional[Dict[str, str]]]],
+                 active: Optional[Tuple[str, Optional[Dict[str, str]]]],
+                 clock: Callable[[], datetime]):
+    """워커 프로세스마다 한 번: 모든 판매자 가이드를 파싱해 둔 에이전트 생성"""
+    global _worker_agent, _worker_default
+    _worker_agent = SMSOrderAgent(clock)
+    for seller_id, (guide_text, aliases) in sellers.items():
+        _worker_agent.load_seller_guide(guide_text, aliases, seller_id)
+    if active is not None:
+        _worker_agent.load_seller_guide(*active)
+    _worker_default = _worker_agent.active_guide
+
+
+def _parse_chunk(chunk: List[Tuple[int, Any]]) -> List[Tuple[int, ParsedOrder]]:
+    return [(i, _parse_message(_worker_agent, message, _worker_default)) for i, message in chunk]
+
+
+def _parse_message(agent: SMSOrderAgent, message: Any, default: Optional[CompiledGuide]) -> ParsedOrder:
+    """(판매자 ID, 메시지)는 그 판매자 가이드로, 문자열은 일괄 파싱을 시작할 때의 가이드로 파싱"""
+    if isinstance(message, tuple):
+        seller_id, text = message
+        return agent.parse_order(text, seller_id)
+    if default is not None and agent.active_guide is not default:
+        agent._activate(default)
+    return agent.parse_order(message)
+
+
+def _chunk_result(result):
+    """error_callback으로 들어온 워커 예외는 호출한 쪽에서 다시 발생"""
+    if isinstance(result, BaseException):
+        raise result
+    return result
 
 
 # ===== 테스트 및 데모 =====
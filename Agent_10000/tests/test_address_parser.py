@@ -0,0 +1,18 @@
+from address_parser import MISSING_NUMBER, parse_address
+
+
+def test_road_with_branch_number_split_across_tokens():
+    parsed = parse_address("서울시 강남구 압구정로 12길 34")
+    assert parsed.is_complete
+    assert (parsed.road, parsed.building_no) == ("압구정로12길", "34")
+
+
+def test_road_with_branch_number_in_one_token():
+    assert parse_address("서울시 강남구 압구정로12길 34").building_no == "34"
+    parsed = parse_address("경기도 성남시 분당구 판교역로 235번길 10")
+    assert (parsed.road, parsed.building_no) == ("판교역로235번길", "10")
+
+
+def test_branch_road_without_building_number_is_incomplete():
+    assert MISSING_NUMBER in parse_address("서울시 강남구 압구정로 12길").missing
+    assert parse_address("서울시 강남구 테헤란로 123").is_complete
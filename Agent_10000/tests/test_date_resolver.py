@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from date_resolver import BY, resolve_date, resolve_dates
+
+# 2025-12-24 (수): 이번 주 토요일 12/27, 다음 주 토요일 2026-01-03
+NOW = datetime(2025, 12, 24, 10, 0)
+
+
+def test_next_weekend_with_and_without_space():
+    assert resolve_date("다음 주말", NOW).isoformat() == "2026-01-03"
+    assert resolve_date("다음주말", NOW).isoformat() == "2026-01-03"
+    assert resolve_date("다음 주 주말", NOW).isoformat() == "2026-01-03"
+
+
+def test_this_weekend_and_bare_weekend():
+    assert resolve_date("이번 주말", NOW).isoformat() == "2025-12-27"
+    assert resolve_date("주말", NOW).isoformat() == "2025-12-27"
+
+
+def test_weekend_keeps_qualifier_and_weekdays():
+    resolved = resolve_date("다음 주말까지 보내주세요", NOW)
+    assert (resolved.isoformat(), resolved.qualifier) == ("2026-01-03", BY)
+    assert [r.isoformat() for r in resolve_dates("이번주 말고 다음주 토요일", NOW)] == ["2026-01-03"]
+    assert resolve_date("다음주 화요일", NOW).isoformat() == "2025-12-30"
@@ -0,0 +1,39 @@
+from guide_parser import parse_guide
+from product_index import ProductIndex
+
+# 티셔츠/슬랙스/후드집업이 블랙 옵션을 함께 씀 ("블랙"의 n-gram이 "슬랙스"와 겹침)
+GUIDE = """[패션스토어]
+• 티셔츠 - 19,000원 (S/M/L) (블랙/화이트)
+• 슬랙스 - 38,000원 (S/M/L) (블랙/베이지)
+• 후드집업 - 49,000원 (S/M/L) (블랙/그레이)
+"""
+
+
+def _index():
+    return ProductIndex(parse_guide(GUIDE))
+
+
+def test_option_words_do_not_score_product_names():
+    candidate = _index().best("티셔츠 블랙 L")
+    assert candidate is not None
+    assert candidate.product.name == "티셔츠"
+    assert candidate.options == ("L", "블랙")
+
+
+def test_unknown_product_with_shared_option_is_not_resolved():
+    index = _index()
+    assert index.best("후드티 블랙 L") is None
+    assert all(c.product.name != "슬랙스" for c in index.search("후드티 블랙 L"))
+    assert index.best("블랙 L") is None
+
+
+def test_ranking_uses_name_score_before_option_bonus():
+    candidates = _index().search("슬랙스 검정 M")
+    assert candidates[0].product.name == "슬랙스"
+    assert candidates[0].name_score == 1.0
+    assert candidates[0].score == 1.2
+
+
+def test_code_mentions_ignore_unknown_numbers():
+    index = ProductIndex(parse_guide("1번. 수분크림 - 32,000원\n2번. 세럼 - 45,000원\n"))
+    assert [p.name for p in index.code_mentions("1번 2개, No. 2 하나, 9번 1개")] == ["수분크림", "세럼"]